@@ -0,0 +1,247 @@
+import argparse
+import http.client
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import BASE_URL
+
+# --- LOAD TEST ---
+# Replays the A*/B* flows (register -> login -> refresh -> list -> update) with
+# many concurrent virtual users over pooled keep-alive connections, then reports
+# throughput and p50/p95/p99 latency per endpoint (text table + JSON file).
+#
+#   python api_tests/L1.load_test.py --users 20 --iterations 10
+#   python api_tests/L1.load_test.py --users 50 --duration 60 --base-url http://localhost:5005/v1
+#
+# Works against `runserver` or gunicorn on SQLite; no outside services needed.
+# Nothing is written to secrets.json: every virtual user registers its own account.
+
+parser = argparse.ArgumentParser(description="Concurrent load test over the api_tests scenarios")
+parser.add_argument("--base-url", default=BASE_URL)
+parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+parser.add_argument("--iterations", type=int, default=5, help="scenario runs per virtual user")
+parser.add_argument("--duration", type=float, default=0, help="run for N seconds instead of --iterations")
+parser.add_argument("--pool-size", type=int, default=0, help="keep-alive connections (default: one per virtual user)")
+parser.add_argument("--admin-email", default="admin@example.com", help="used for the list step (admin only)")
+parser.add_argument("--admin-password", default="password123")
+parser.add_argument("--timeout", type=float, default=30)
+parser.add_argument("--forgot-password", action="store_true", help="add the A4 forgot-password step (one email send)")
+parser.add_argument("--output-file", default=f"{os.path.splitext(os.path.basename(__file__))[0]}.json")
+args = parser.parse_args()
+
+parsed = urlparse(args.base_url)
+HOST = parsed.hostname
+PORT = parsed.port or (443 if parsed.scheme == "https" else 80)
+PREFIX = parsed.path.rstrip("/")
+
+# --- HELPER: Connection pool ---
+
+class ConnectionPool:
+    """Fixed set of keep-alive connections shared by all virtual users."""
+    def __init__(self, size):
+        self.connections = queue.Queue()
+        for _ in range(size):
+            self.connections.put(self._connect())
+
+    def _connect(self):
+        if parsed.scheme == "https":
+            return http.client.HTTPSConnection(HOST, PORT, timeout=args.timeout)
+        return http.client.HTTPConnection(HOST, PORT, timeout=args.timeout)
+
+    def request(self, method, path, body=None, token=None):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        payload = json.dumps(body) if body is not None else None
+
+        conn = self.connections.get()
+        try:
+            for attempt in range(2):
+                try:
+                    start = time.perf_counter()
+                    conn.request(method, PREFIX + path, body=payload, headers=headers)
+                    response = conn.getresponse()
+                    raw = response.read()
+                    elapsed = time.perf_counter() - start
+                    if response.getheader("Connection", "").lower() == "close":
+                        conn.close()
+                    break
+                except (http.client.HTTPException, ConnectionError, OSError):
+                    # Server dropped the keep-alive connection: reconnect once
+                    conn.close()
+                    conn = self._connect()
+                    if attempt:
+                        raise
+        finally:
+            self.connections.put(conn)
+
+        try:
+            data = json.loads(raw) if raw else None
+        except ValueError:
+            data = None
+        return response.status, data, elapsed
+
+# --- HELPER: Metrics ---
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}  # endpoint -> [(status, seconds)]
+        self.errors = {}   # endpoint -> count of transport errors
+
+    def record(self, endpoint, status, seconds):
+        with self.lock:
+            self.samples.setdefault(endpoint, []).append((status, seconds))
+
+    def record_error(self, endpoint):
+        with self.lock:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    @staticmethod
+    def percentile(sorted_values, pct):
+        if not sorted_values:
+            return 0.0
+        index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+        return sorted_values[index]
+
+    def summary(self, wall_seconds):
+        endpoints = {}
+        all_latencies = []
+        for endpoint, samples in self.samples.items():
+            latencies = sorted(s for _, s in samples)
+            all_latencies.extend(latencies)
+            statuses = {}
+            for status, _ in samples:
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+            endpoints[endpoint] = self._stats(latencies, wall_seconds)
+            endpoints[endpoint]["statuses"] = statuses
+            endpoints[endpoint]["transport_errors"] = self.errors.get(endpoint, 0)
+        total = self._stats(sorted(all_latencies), wall_seconds)
+        total["transport_errors"] = sum(self.errors.values())
+        return {"endpoints": endpoints, "total": total}
+
+    def _stats(self, latencies, wall_seconds):
+        return {
+            "requests": len(latencies),
+            "throughput_rps": round(len(latencies) / wall_seconds, 2) if wall_seconds else 0,
+            "p50_ms": round(self.percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(self.percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(self.percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0,
+        }
+
+# --- SCENARIO ---
+
+pool = ConnectionPool(args.pool_size or args.users)
+metrics = Metrics()
+
+def call(endpoint, method, path, body=None, token=None, expect=(200,)):
+    try:
+        status, data, elapsed = pool.request(method, path, body, token)
+    except Exception:
+        metrics.record_error(endpoint)
+        return None
+    metrics.record(endpoint, status, elapsed)
+    return data if status in expect else None
+
+def run_scenario(vu, iteration, admin_token):
+    email = f"load_{vu}_{iteration}_{uuid.uuid4().hex[:8]}@example.com"
+    password = "Pwd_1234"
+
+    # A1. Register
+    data = call("POST /auth/register", "POST", "/auth/register",
+                {"name": f"Load User {vu}", "email": email, "password": password}, expect=(201,))
+    if not data:
+        return
+    user_id = data["user"]["id"]
+
+    # A2. Login
+    data = call("POST /auth/login", "POST", "/auth/login", {"email": email, "password": password})
+    if not data:
+        return
+    access = data["tokens"]["access"]["token"]
+
+    # A3. Refresh
+    data = call("POST /auth/refresh-tokens", "POST", "/auth/refresh-tokens",
+                {"refresh_token": data["tokens"]["refresh"]["token"]})
+    if data:
+        access = data["access"]["token"]
+
+    # B2. List users (admin only)
+    if admin_token:
+        call("GET /users", "GET", "/users?page=1&limit=10&sortBy=created_at:desc", token=admin_token)
+
+    # B4. Update own profile
+    call("PATCH /users/:id", "PATCH", f"/users/{user_id}", {"name": f"Load User {vu} #{iteration}"}, token=access)
+
+    # A4. Forgot password (optional: exercises the email path)
+    if args.forgot_password:
+        call("POST /auth/forgot-password", "POST", "/auth/forgot-password", {"email": email}, expect=(204,))
+
+def virtual_user(vu, admin_token, deadline):
+    iteration = 0
+    while True:
+        if deadline:
+            if time.time() >= deadline:
+                break
+        elif iteration >= args.iterations:
+            break
+        run_scenario(vu, iteration, admin_token)
+        iteration += 1
+
+# --- MAIN ---
+
+print(f"--- LOAD TEST: {args.users} virtual users against {args.base_url} ---")
+
+status, data, _ = pool.request("POST", "/auth/login", {"email": args.admin_email, "password": args.admin_password})
+admin_token = data["tokens"]["access"]["token"] if status == 200 else None
+if not admin_token:
+    print(">>> Admin login failed: the 'GET /users' step will be skipped.")
+
+deadline = time.time() + args.duration if args.duration else None
+threads = [threading.Thread(target=virtual_user, args=(vu, admin_token, deadline)) for vu in range(args.users)]
+started = time.perf_counter()
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+wall = time.perf_counter() - started
+
+summary = metrics.summary(wall)
+summary["config"] = {
+    "base_url": args.base_url,
+    "virtual_users": args.users,
+    "iterations": None if args.duration else args.iterations,
+    "duration_seconds": args.duration or None,
+    "pool_size": args.pool_size or args.users,
+    "wall_seconds": round(wall, 3),
+}
+
+# Text table
+columns = ["endpoint", "requests", "rps", "p50 ms", "p95 ms", "p99 ms", "max ms", "statuses"]
+rows = [
+    [name, s["requests"], s["throughput_rps"], s["p50_ms"], s["p95_ms"], s["p99_ms"], s["max_ms"],
+     " ".join(f"{k}:{v}" for k, v in sorted(s["statuses"].items())) + (f" err:{s['transport_errors']}" if s["transport_errors"] else "")]
+    for name, s in summary["endpoints"].items()
+]
+t = summary["total"]
+rows.append(["TOTAL", t["requests"], t["throughput_rps"], t["p50_ms"], t["p95_ms"], t["p99_ms"], t["max_ms"],
+             f"err:{t['transport_errors']}" if t["transport_errors"] else ""])
+widths = [max(len(str(c)), *(len(str(r[i])) for r in rows)) for i, c in enumerate(columns)]
+print()
+print("  ".join(str(c).ljust(w) for c, w in zip(columns, widths)))
+print("  ".join("-" * w for w in widths))
+for r in rows:
+    print("  ".join(str(c).ljust(w) for c, w in zip(r, widths)))
+print(f"\nWall time: {wall:.2f}s")
+
+output_file = os.path.join(os.path.dirname(__file__), args.output_file)
+with open(output_file, "w", encoding="utf-8") as f:
+    json.dump(summary, f, indent=4)
+print(f"Results saved to {os.path.abspath(output_file)}")
@@ -0,0 +1,85 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+# A well-formed signed token (payload:timestamp:signature) whose signature does not match
+FORGED_TOKEN = "eyJ1IjoiMDAwMCIsInQiOiJyZXNldFBhc3N3b3JkIiwiZSI6NDEwMjQ0NDgwMH0:1tA0bc:Zm9yZ2VkLXNpZ25hdHVyZQ"
+
+def run_test():
+    print_header("TEST: RESET / VERIFY TOKENS REJECT FORGERIES")
+    timestamp = int(time.time())
+
+    # --- STEP 1: REGISTER A USER ---
+    print_header("1. REGISTER USER")
+    email = f"tokens.{timestamp}@check.com"
+    payload = {"name": "Token Test", "email": email, "password": "Pwd_1234"}
+    resp = send_and_print(f"{BASE_URL}/auth/register", method="POST", body=payload, output_file="test_tokens_1_register.json")
+    if resp.status_code != 201:
+        print_fail(f"Register failed with status {resp.status_code}")
+        sys.exit(1)
+    user_headers = {"Authorization": f"Bearer {resp.json()['tokens']['access']['token']}"}
+
+    # --- STEP 2: ISSUE TOKENS ---
+    print_header("2. FORGOT PASSWORD / SEND VERIFICATION (204)")
+    resp = send_and_print(f"{BASE_URL}/auth/forgot-password", method="POST", body={"email": email}, output_file="test_tokens_2_forgot.json")
+    if resp.status_code == 204:
+        print_pass("Reset token issued (204).")
+    else:
+        print_fail(f"Expected 204 but got {resp.status_code}")
+    resp = send_and_print(f"{BASE_URL}/auth/send-verification-email", user_headers, method="POST", output_file="test_tokens_2_verify.json")
+    if resp.status_code == 204:
+        print_pass("Verification token issued (204).")
+    else:
+        print_fail(f"Expected 204 but got {resp.status_code}")
+
+    # --- STEP 3: FORGED / UNKNOWN TOKENS ---
+    print_header("3. FORGED AND UNKNOWN TOKENS (401)")
+    for kind, token in [("a forged signed", FORGED_TOKEN), ("an unknown opaque", "not-a-real-token")]:
+        resp = send_and_print(f"{BASE_URL}/auth/reset-password?token={token}", method="POST", body={"password": "newPwd_1234"}, output_file="test_tokens_3_reset.json")
+        if resp.status_code == 401:
+            print_pass(f"Reset with {kind} token rejected with 401.")
+        else:
+            print_fail(f"Reset with {kind} token: expected 401 but got {resp.status_code}")
+        resp = send_and_print(f"{BASE_URL}/auth/verify-email?token={token}", method="POST", output_file="test_tokens_3_verify.json")
+        if resp.status_code == 401:
+            print_pass(f"Verify with {kind} token rejected with 401.")
+        else:
+            print_fail(f"Verify with {kind} token: expected 401 but got {resp.status_code}")
+
+    # --- STEP 4: PASSWORD UNCHANGED ---
+    print_header("4. ORIGINAL PASSWORD STILL WORKS")
+    resp = send_and_print(f"{BASE_URL}/auth/login", method="POST", body={"email": email, "password": "Pwd_1234"}, output_file="test_tokens_4_login.json")
+    if resp.status_code == 200:
+        print_pass("Login with the original password succeeded.")
+    else:
+        print_fail(f"Expected 200 but got {resp.status_code}")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,67 @@
+import sys
+import os
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def get_header(resp, name):
+    headers = resp.result_dict.get("response", {}).get("headers", {})
+    return next((value for key, value in headers.items() if key.lower() == name.lower()), None)
+
+def run_test():
+    print_header("TEST: SERVER-TIMING HEADER (REQUEST_TIMING_ENABLED=True)")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # --- STEP 1: LIST USERS ---
+    print_header("1. GET /users")
+    resp = send_and_print(f"{BASE_URL}/users?limit=5", headers, method="GET", output_file="test_timing_1_list.json")
+    timing = get_header(resp, "Server-Timing")
+    if timing is None:
+        print_fail("No Server-Timing header. Is the server running with REQUEST_TIMING_ENABLED=True?")
+        sys.exit(1)
+
+    metrics = {part.strip().split(';')[0] for part in timing.split(',')}
+    if {"db", "view"} <= metrics:
+        print_pass(f"Server-Timing carries db and view: {timing}")
+    else:
+        print_fail(f"Missing db/view metrics: {timing}")
+
+    # --- STEP 2: NO SQL IN THE HEADER ---
+    print_header("2. NO SQL EXPOSED")
+    if any(word in timing.upper() for word in ("SELECT", "FROM", "USERS_USER")):
+        print_fail(f"Server-Timing leaks SQL: {timing}")
+    else:
+        print_pass("Server-Timing carries durations only.")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,70 @@
+import sys
+import os
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+# /metrics is mounted at the site root, next to /v1
+METRICS_URL = f"{BASE_URL.rsplit('/v1', 1)[0]}/metrics"
+
+def run_test():
+    print_header("TEST: METRICS ENDPOINT (GET /metrics)")
+
+    # Same value as the server's METRICS_AUTH_TOKEN
+    metrics_token = os.environ.get("METRICS_AUTH_TOKEN")
+    if not metrics_token:
+        print_fail("Set METRICS_AUTH_TOKEN to the server's value.")
+        sys.exit(1)
+
+    # --- STEP 1: GENERATE TRAFFIC ---
+    print_header("1. ONE API REQUEST")
+    token = load_config("accessToken")
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    send_and_print(f"{BASE_URL}/users?limit=1", headers, method="GET", output_file="test_metrics_1_traffic.json")
+
+    # --- STEP 2: NO / WRONG TOKEN ---
+    print_header("2. WITHOUT / WITH A WRONG TOKEN (401)")
+    for name, scrape_headers in [("no token", {}), ("wrong token", {"Authorization": "Bearer wrong"})]:
+        resp = send_and_print(METRICS_URL, scrape_headers, method="GET", output_file="test_metrics_2_unauthorized.json")
+        if resp.status_code == 401:
+            print_pass(f"Scrape with {name} rejected with 401.")
+        else:
+            print_fail(f"Scrape with {name}: expected 401 but got {resp.status_code}")
+
+    # --- STEP 3: SCRAPE ---
+    print_header("3. SCRAPE WITH THE TOKEN (200)")
+    resp = send_and_print(METRICS_URL, {"Authorization": f"Bearer {metrics_token}"}, method="GET", output_file="test_metrics_3_scrape.json")
+    body = resp.json() if resp.status_code == 200 else ""
+    if resp.status_code != 200:
+        print_fail(f"Expected 200 but got {resp.status_code}")
+    elif "# TYPE http_requests counter" in body and "http_request_duration_seconds_bucket" in body:
+        print_pass("Exposition format with request counters and latency histogram.")
+    else:
+        print_fail("Scrape is missing http_requests / http_request_duration_seconds.")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,85 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def run_test():
+    print_header("TEST: SPARSE FIELDSETS (?fields=)")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+
+    # --- STEP 1: CREATE USER ---
+    print_header("1. CREATE USER (POST)")
+    payload = {"name": f"Fields Test {timestamp}", "email": f"fields.{timestamp}@check.com", "role": "user", "password": "Pwd_1234"}
+    resp = send_and_print(f"{BASE_URL}/users", headers, method="POST", body=payload, output_file="test_fields_1_create.json")
+    if resp.status_code != 201:
+        print_fail(f"Create failed with status {resp.status_code}")
+        sys.exit(1)
+    user_id = resp.json()['id']
+
+    try:
+        # --- STEP 2: DETAIL ---
+        print_header("2. GET /users/:id?fields=name,email")
+        resp = send_and_print(f"{BASE_URL}/users/{user_id}?fields=name,email", headers, method="GET", output_file="test_fields_2_detail.json")
+        data = resp.json() if resp.status_code == 200 else None
+        if data == {"name": payload["name"], "email": payload["email"]}:
+            print_pass("Detail returned exactly the requested fields.")
+        else:
+            print_fail(f"Unexpected detail: {resp.status_code} {data}")
+
+        # --- STEP 3: LIST ---
+        print_header("3. GET /users?fields=id,role")
+        resp = send_and_print(f"{BASE_URL}/users?search=fields.{timestamp}&fields=id,role", headers, method="GET", output_file="test_fields_3_list.json")
+        results = resp.json()['results'] if resp.status_code == 200 else None
+        if results == [{"id": user_id, "role": "user"}]:
+            print_pass("List rows carry exactly the requested fields.")
+        else:
+            print_fail(f"Unexpected list: {resp.status_code} {results}")
+
+        # --- STEP 4: UNKNOWN / PRIVATE FIELDS ---
+        print_header("4. UNKNOWN FIELD (400)")
+        for fields in ["password", "name,nope"]:
+            resp = send_and_print(f"{BASE_URL}/users/{user_id}?fields={fields}", headers, method="GET", output_file="test_fields_4_invalid.json")
+            if resp.status_code == 400:
+                print_pass(f"fields={fields} rejected with 400.")
+            else:
+                print_fail(f"fields={fields}: expected 400 but got {resp.status_code}")
+    finally:
+        # --- CLEANUP ---
+        print_header("CLEANUP")
+        send_and_print(f"{BASE_URL}/users/{user_id}", headers, method="DELETE", output_file="test_fields_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,97 @@
+import sys
+import os
+import time
+import csv
+import io
+import json
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def run_test():
+    print_header("TEST: STREAMING EXPORT (GET /users/export)")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+    prefix = f"export{timestamp}"
+
+    # --- STEP 1: CREATE 3 USERS ---
+    print_header("1. CREATE 3 USERS (POST)")
+    created_ids = []
+    for i in range(3):
+        payload = {"name": f"Export, Test {i}", "email": f"{prefix}.{i}@check.com", "role": "user", "password": "Pwd_1234"}
+        resp = send_and_print(f"{BASE_URL}/users", headers, method="POST", body=payload, output_file="test_export_1_create.json")
+        if resp.status_code != 201:
+            print_fail(f"Create failed with status {resp.status_code}")
+            sys.exit(1)
+        created_ids.append(resp.json()['id'])
+
+    try:
+        # --- STEP 2: NDJSON ---
+        print_header("2. format=ndjson")
+        url = f"{BASE_URL}/users/export?format=ndjson&search={prefix}&sortBy=email:asc&fields=id,email"
+        resp = send_and_print(url, headers, method="GET", output_file="test_export_2_ndjson.json")
+        body = resp.json()
+        # A single line is stored already parsed, several as raw text
+        rows = [body] if isinstance(body, dict) else [json.loads(line) for line in (body or "").splitlines() if line]
+        if resp.status_code == 200 and [row.get('id') for row in rows] == created_ids and all(set(row) == {"id", "email"} for row in rows):
+            print_pass("One JSON object per line, in order, with the requested fields.")
+        else:
+            print_fail(f"Unexpected NDJSON export: {resp.status_code} {body}")
+
+        # --- STEP 3: CSV ---
+        print_header("3. format=csv")
+        url = f"{BASE_URL}/users/export?format=csv&search={prefix}&sortBy=email:asc&fields=name,email"
+        resp = send_and_print(url, headers, method="GET", output_file="test_export_3_csv.json")
+        rows = list(csv.reader(io.StringIO(resp.json() or "")))
+        # Columns follow the user representation order, not the ?fields= order
+        expected = [["email", "name"]] + [[f"{prefix}.{i}@check.com", f"Export, Test {i}"] for i in range(3)]
+        if resp.status_code == 200 and rows == expected:
+            print_pass("Header row plus one quoted row per user.")
+        else:
+            print_fail(f"Unexpected CSV export: {resp.status_code} {rows}")
+
+        # --- STEP 4: UNKNOWN FORMAT ---
+        print_header("4. format=xml (400)")
+        resp = send_and_print(f"{BASE_URL}/users/export?format=xml", headers, method="GET", output_file="test_export_4_invalid.json")
+        if resp.status_code == 400:
+            print_pass("Unsupported format rejected with 400.")
+        else:
+            print_fail(f"Expected 400 but got {resp.status_code}")
+    finally:
+        # --- CLEANUP ---
+        print_header("CLEANUP")
+        for user_id in created_ids:
+            send_and_print(f"{BASE_URL}/users/{user_id}", headers, method="DELETE", output_file="test_export_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
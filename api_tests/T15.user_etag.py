@@ -0,0 +1,102 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def get_header(resp, name):
+    headers = resp.result_dict.get("response", {}).get("headers", {})
+    return next((value for key, value in headers.items() if key.lower() == name.lower()), None)
+
+def run_test():
+    print_header("TEST: ETAG / CONDITIONAL GET")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+
+    # --- STEP 1: CREATE USER ---
+    print_header("1. CREATE USER (POST)")
+    payload = {"name": f"ETag Test {timestamp}", "email": f"etag.{timestamp}@check.com", "role": "user", "password": "Pwd_1234"}
+    resp = send_and_print(f"{BASE_URL}/users", headers, method="POST", body=payload, output_file="test_etag_1_create.json")
+    if resp.status_code != 201:
+        print_fail(f"Create failed with status {resp.status_code}")
+        sys.exit(1)
+    user_id = resp.json()['id']
+    url_detail = f"{BASE_URL}/users/{user_id}"
+    url_list = f"{BASE_URL}/users?search=etag.{timestamp}"
+
+    try:
+        # --- STEP 2: DETAIL REVALIDATION ---
+        print_header("2. DETAIL: If-None-Match (304)")
+        resp = send_and_print(url_detail, headers, method="GET", output_file="test_etag_2_detail.json")
+        etag = get_header(resp, "ETag")
+        if not etag:
+            print_fail("GET /users/:id returned no ETag.")
+            return
+        resp = send_and_print(url_detail, {**headers, "If-None-Match": etag}, method="GET", output_file="test_etag_2_revalidate.json")
+        if resp.status_code == 304:
+            print_pass("Unchanged user revalidated with 304.")
+        else:
+            print_fail(f"Expected 304 but got {resp.status_code}")
+
+        # --- STEP 3: LIST REVALIDATION ---
+        print_header("3. LIST: If-None-Match (304)")
+        resp = send_and_print(url_list, headers, method="GET", output_file="test_etag_3_list.json")
+        list_etag = get_header(resp, "ETag")
+        resp = send_and_print(url_list, {**headers, "If-None-Match": list_etag or ""}, method="GET", output_file="test_etag_3_revalidate.json")
+        if list_etag and resp.status_code == 304:
+            print_pass("Unchanged page revalidated with 304.")
+        else:
+            print_fail(f"Expected an ETag and 304, got {list_etag!r} and {resp.status_code}")
+
+        # --- STEP 4: UPDATE CHANGES THE ETAG ---
+        print_header("4. AFTER PATCH: OLD ETAG IS STALE (200)")
+        resp = send_and_print(url_detail, headers, method="PATCH", body={"name": f"ETag Renamed {timestamp}"}, output_file="test_etag_4_update.json")
+        new_etag = get_header(resp, "ETag")
+        if new_etag and new_etag != etag:
+            print_pass("PATCH returned a new ETag.")
+        else:
+            print_fail(f"Expected a new ETag, got {new_etag!r}")
+        for url, old, name in [(url_detail, etag, "Detail"), (url_list, list_etag, "List")]:
+            resp = send_and_print(url, {**headers, "If-None-Match": old or ""}, method="GET", output_file="test_etag_4_stale.json")
+            if resp.status_code == 200:
+                print_pass(f"{name} with the old ETag returned 200 and a fresh body.")
+            else:
+                print_fail(f"{name}: expected 200 but got {resp.status_code}")
+    finally:
+        # --- CLEANUP ---
+        print_header("CLEANUP")
+        send_and_print(url_detail, headers, method="DELETE", output_file="test_etag_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
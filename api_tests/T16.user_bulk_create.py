@@ -0,0 +1,93 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def run_test():
+    print_header("TEST: BULK CREATE (POST /users/bulk)")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+    prefix = f"bulk{timestamp}"
+    created_ids = []
+
+    def item(i, **overrides):
+        return {"name": f"Bulk Test {i}", "email": f"{prefix}.{i}@check.com", "role": "user", "password": "Pwd_1234", **overrides}
+
+    try:
+        # --- STEP 1: ALL VALID (201) ---
+        print_header("1. ALL ITEMS VALID (201)")
+        resp = send_and_print(f"{BASE_URL}/users/bulk", headers, method="POST", body=[item(0), item(1)], output_file="test_bulk_1_create.json")
+        data = resp.json() if resp.status_code == 201 else None
+        if data and data['succeeded'] == 2 and data['failed'] == 0 and [r['code'] for r in data['results']] == [201, 201]:
+            print_pass("Every item created; 201 with one result per item.")
+            created_ids.extend(r['user']['id'] for r in data['results'])
+        else:
+            print_fail(f"Unexpected response: {resp.status_code} {resp.json()}")
+
+        # --- STEP 2: PARTIAL FAILURE (207) ---
+        print_header("2. MIXED BATCH (207 Multi-Status)")
+        batch = [
+            item(2),                         # ok
+            item(0),                         # email already taken
+            item(3, password="short"),       # invalid password
+            item(2, name="Repeat"),          # repeated within the batch
+        ]
+        resp = send_and_print(f"{BASE_URL}/users/bulk", headers, method="POST", body=batch, output_file="test_bulk_2_mixed.json")
+        data = resp.json() if resp.status_code == 207 else None
+        if data is None:
+            print_fail(f"Expected 207 but got {resp.status_code}")
+        else:
+            created_ids.extend(r['user']['id'] for r in data['results'] if r['code'] == 201)
+            codes = [(r['index'], r['code']) for r in data['results']]
+            if codes == [(0, 201), (1, 400), (2, 400), (3, 400)] and data['succeeded'] == 1 and data['failed'] == 3:
+                print_pass("Valid item created; taken, invalid and repeated emails reported per index.")
+            else:
+                print_fail(f"Unexpected results: {codes}")
+
+        # --- STEP 3: NOT A LIST (400) ---
+        print_header("3. NON-LIST BODY (400)")
+        resp = send_and_print(f"{BASE_URL}/users/bulk", headers, method="POST", body=item(9), output_file="test_bulk_3_invalid.json")
+        if resp.status_code == 400:
+            print_pass("Object body rejected with 400.")
+        else:
+            print_fail(f"Expected 400 but got {resp.status_code}")
+    finally:
+        # --- CLEANUP ---
+        print_header("CLEANUP")
+        for user_id in created_ids:
+            send_and_print(f"{BASE_URL}/users/{user_id}", headers, method="DELETE", output_file="test_bulk_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,118 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def run_test():
+    print_header("TEST: BULK UPDATE / DELETE (PATCH, DELETE /users/bulk)")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+    prefix = f"bulkedit{timestamp}"
+
+    # --- STEP 1: REGISTER 3 USERS (keep one user's tokens) ---
+    print_header("1. REGISTER 3 USERS")
+    created_ids = []
+    user_headers = None
+    refresh_token = None
+    for i in range(3):
+        payload = {"name": f"Bulk Edit {i}", "email": f"{prefix}.{i}@check.com", "password": "Pwd_1234"}
+        resp = send_and_print(f"{BASE_URL}/auth/register", method="POST", body=payload, output_file="test_bulkedit_1_register.json")
+        if resp.status_code != 201:
+            print_fail(f"Register failed with status {resp.status_code}")
+            sys.exit(1)
+        created_ids.append(resp.json()['user']['id'])
+        if i == 0:
+            user_headers = {"Authorization": f"Bearer {resp.json()['tokens']['access']['token']}"}
+            refresh_token = resp.json()['tokens']['refresh']['token']
+
+    try:
+        # --- STEP 2: UPDATE BY IDS ---
+        print_header("2. PATCH BY IDS (verify 2 users)")
+        body = {"ids": created_ids[1:], "data": {"is_email_verified": True}}
+        resp = send_and_print(f"{BASE_URL}/users/bulk", headers, method="PATCH", body=body, output_file="test_bulkedit_2_patch_ids.json")
+        if resp.status_code == 200 and resp.json() == {"updated": 2}:
+            print_pass("Two users updated.")
+        else:
+            print_fail(f"Unexpected response: {resp.status_code} {resp.json()}")
+        resp = send_and_print(f"{BASE_URL}/users/{created_ids[1]}", headers, method="GET", output_file="test_bulkedit_2_get.json")
+        if resp.status_code == 200 and resp.json().get('is_email_verified') is True:
+            print_pass("GET /users/:id shows the bulk update.")
+        else:
+            print_fail(f"Update not visible: {resp.status_code} {resp.json()}")
+
+        # --- STEP 3: DEACTIVATE BY FILTER ---
+        print_header("3. PATCH BY FILTER (deactivate user 0)")
+        body = {"filter": {"search": f"{prefix}.0", "scope": "email"}, "data": {"is_active": False}}
+        resp = send_and_print(f"{BASE_URL}/users/bulk", headers, method="PATCH", body=body, output_file="test_bulkedit_3_patch_filter.json")
+        if resp.status_code == 200 and resp.json() == {"updated": 1}:
+            print_pass("One user deactivated.")
+        else:
+            print_fail(f"Unexpected response: {resp.status_code} {resp.json()}")
+        resp = send_and_print(f"{BASE_URL}/users/{created_ids[0]}", user_headers, method="GET", output_file="test_bulkedit_3_access.json")
+        if resp.status_code == 401:
+            print_pass("Access token of the deactivated user rejected with 401.")
+        else:
+            print_fail(f"Expected 401 but got {resp.status_code}")
+        resp = send_and_print(f"{BASE_URL}/auth/refresh-tokens", method="POST", body={"refresh_token": refresh_token}, output_file="test_bulkedit_3_refresh.json")
+        if resp.status_code == 401:
+            print_pass("Refresh token of the deactivated user rejected with 401.")
+        else:
+            print_fail(f"Expected 401 but got {resp.status_code}")
+
+        # --- STEP 4: EMPTY FILTER ---
+        print_header("4. EMPTY FILTER (400)")
+        resp = send_and_print(f"{BASE_URL}/users/bulk", headers, method="DELETE", body={"filter": {}}, output_file="test_bulkedit_4_empty.json")
+        if resp.status_code == 400:
+            print_pass("A filter matching every user is rejected with 400.")
+        else:
+            print_fail(f"Expected 400 but got {resp.status_code}")
+
+        # --- STEP 5: DELETE BY FILTER ---
+        print_header("5. DELETE BY FILTER")
+        body = {"filter": {"search": prefix, "scope": "email"}}
+        resp = send_and_print(f"{BASE_URL}/users/bulk", headers, method="DELETE", body=body, output_file="test_bulkedit_5_delete.json")
+        if resp.status_code == 200 and resp.json() == {"deleted": 3}:
+            print_pass("All three users deleted.")
+            created_ids = []
+        else:
+            print_fail(f"Unexpected response: {resp.status_code} {resp.json()}")
+    finally:
+        # --- CLEANUP ---
+        print_header("CLEANUP")
+        for user_id in created_ids:
+            send_and_print(f"{BASE_URL}/users/{user_id}", headers, method="DELETE", output_file="test_bulkedit_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
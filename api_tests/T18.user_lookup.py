@@ -0,0 +1,98 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+MISSING_ID = "00000000-0000-0000-0000-000000000000"
+
+def run_test():
+    print_header("TEST: BATCH LOOKUP (GET /users?ids=, POST /users/lookup)")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+
+    # --- STEP 1: REGISTER 2 USERS ---
+    print_header("1. REGISTER 2 USERS")
+    created_ids = []
+    user_headers = None
+    for i in range(2):
+        payload = {"name": f"Lookup Test {i}", "email": f"lookup{timestamp}.{i}@check.com", "password": "Pwd_1234"}
+        resp = send_and_print(f"{BASE_URL}/auth/register", method="POST", body=payload, output_file="test_lookup_1_register.json")
+        if resp.status_code != 201:
+            print_fail(f"Register failed with status {resp.status_code}")
+            sys.exit(1)
+        created_ids.append(resp.json()['user']['id'])
+        if i == 0:
+            user_headers = {"Authorization": f"Bearer {resp.json()['tokens']['access']['token']}"}
+
+    try:
+        # --- STEP 2: ADMIN, GET ?ids= ---
+        print_header("2. ADMIN: GET /users?ids= (input order, notFound)")
+        ids = [created_ids[1], MISSING_ID, created_ids[0], created_ids[1], "not-a-uuid"]
+        resp = send_and_print(f"{BASE_URL}/users?ids={','.join(ids)}", headers, method="GET", output_file="test_lookup_2_get.json")
+        data = resp.json() if resp.status_code == 200 else {}
+        if [user['id'] for user in data.get('results', [])] == [created_ids[1], created_ids[0]]:
+            print_pass("Found users returned once each, in input order.")
+        else:
+            print_fail(f"Unexpected results: {resp.status_code} {data}")
+        if data.get('notFound') == [MISSING_ID.replace('-', ''), "not-a-uuid"] and data.get('forbidden') == []:
+            print_pass("Unknown and malformed ids listed under notFound.")
+        else:
+            print_fail(f"Unexpected notFound/forbidden: {data.get('notFound')} {data.get('forbidden')}")
+
+        # --- STEP 3: STANDARD USER, POST /users/lookup ---
+        print_header("3. STANDARD USER: POST /users/lookup (forbidden)")
+        body = {"ids": created_ids}
+        resp = send_and_print(f"{BASE_URL}/users/lookup?fields=id,name", user_headers, method="POST", body=body, output_file="test_lookup_3_user.json")
+        data = resp.json() if resp.status_code == 200 else {}
+        if data.get('results') == [{"id": created_ids[0], "name": "Lookup Test 0"}] and data.get('forbidden') == [created_ids[1]]:
+            print_pass("Own user returned with the requested fields; the other id listed under forbidden.")
+        else:
+            print_fail(f"Unexpected response: {resp.status_code} {data}")
+
+        # --- STEP 4: EMPTY LIST ---
+        print_header("4. EMPTY ids (400)")
+        resp = send_and_print(f"{BASE_URL}/users/lookup", user_headers, method="POST", body={"ids": []}, output_file="test_lookup_4_empty.json")
+        if resp.status_code == 400:
+            print_pass("Empty id list rejected with 400.")
+        else:
+            print_fail(f"Expected 400 but got {resp.status_code}")
+    finally:
+        # --- CLEANUP ---
+        print_header("CLEANUP")
+        for user_id in created_ids:
+            send_and_print(f"{BASE_URL}/users/{user_id}", headers, method="DELETE", output_file="test_lookup_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,85 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def run_test():
+    print_header("TEST: CACHED USERS NEVER SERVE STALE CREDENTIALS")
+    timestamp = int(time.time())
+    email = f"creds.{timestamp}@check.com"
+
+    # --- STEP 1: REGISTER, THEN READ TWICE (fills the user cache) ---
+    print_header("1. REGISTER USER, READ PROFILE TWICE")
+    payload = {"name": "Credentials Test", "email": email, "password": "Pwd_1234"}
+    resp = send_and_print(f"{BASE_URL}/auth/register", method="POST", body=payload, output_file="test_creds_1_register.json")
+    if resp.status_code != 201:
+        print_fail(f"Register failed with status {resp.status_code}")
+        sys.exit(1)
+    user_id = resp.json()['user']['id']
+    user_headers = {"Authorization": f"Bearer {resp.json()['tokens']['access']['token']}"}
+    url_detail = f"{BASE_URL}/users/{user_id}"
+    for _ in range(2):
+        send_and_print(url_detail, user_headers, method="GET", output_file="test_creds_1_get.json")
+
+    # --- STEP 2: CHANGE PASSWORD AND NAME ---
+    print_header("2. PATCH PASSWORD AND NAME")
+    resp = send_and_print(url_detail, user_headers, method="PATCH", body={"password": "newPwd_1234", "name": "Renamed"}, output_file="test_creds_2_update.json")
+    if resp.status_code != 200:
+        print_fail(f"Update failed with status {resp.status_code}")
+        sys.exit(1)
+
+    # --- STEP 3: READS SEE THE UPDATE ---
+    print_header("3. PROFILE SHOWS THE NEW NAME")
+    resp = send_and_print(url_detail, user_headers, method="GET", output_file="test_creds_3_get.json")
+    if resp.status_code == 200 and resp.json().get('name') == "Renamed":
+        print_pass("GET /users/:id is not served from a stale cache entry.")
+    else:
+        print_fail(f"Unexpected profile: {resp.status_code} {resp.json()}")
+
+    # --- STEP 4: LOGIN CHECKS THE CURRENT PASSWORD ---
+    print_header("4. LOGIN WITH OLD (401) AND NEW (200) PASSWORD")
+    resp = send_and_print(f"{BASE_URL}/auth/login", method="POST", body={"email": email, "password": "Pwd_1234"}, output_file="test_creds_4_old.json")
+    if resp.status_code == 401:
+        print_pass("Old password rejected with 401.")
+    else:
+        print_fail(f"Old password: expected 401 but got {resp.status_code}")
+    resp = send_and_print(f"{BASE_URL}/auth/login", method="POST", body={"email": email, "password": "newPwd_1234"}, output_file="test_creds_4_new.json")
+    if resp.status_code == 200:
+        print_pass("New password accepted.")
+    else:
+        print_fail(f"New password: expected 200 but got {resp.status_code}")
+
+    # --- CLEANUP ---
+    print_header("CLEANUP")
+    token = load_config("accessToken")
+    if token:
+        send_and_print(url_detail, {"Authorization": f"Bearer {token}"}, method="DELETE", output_file="test_creds_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
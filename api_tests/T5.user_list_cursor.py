@@ -0,0 +1,114 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def run_test():
+    print_header("TEST: CURSOR PAGINATION (GET /users?cursor=)")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+    prefix = f"cursor{timestamp}"
+
+    # --- STEP 1: CREATE 5 USERS ---
+    print_header("1. CREATE 5 USERS (POST)")
+    created_ids = []
+    for i in range(5):
+        payload = {
+            "name": f"Cursor Test {i}",
+            "email": f"{prefix}.{i}@check.com",
+            "role": "user",
+            "password": "Pwd_1234"
+        }
+        resp = send_and_print(f"{BASE_URL}/users", headers, method="POST", body=payload, output_file="test_cursor_1_create.json")
+        if resp.status_code != 201:
+            print_fail(f"Create failed with status {resp.status_code}")
+            sys.exit(1)
+        created_ids.append(resp.json()['id'])
+
+    try:
+        # --- STEP 2: WALK THE PAGES FORWARD ---
+        print_header("2. WALK FORWARD (limit=2)")
+        url = f"{BASE_URL}/users?search={prefix}&sortBy=email:asc&limit=2&cursor="
+        seen = []
+        pages = []
+        while url:
+            resp = send_and_print(url, headers, method="GET", output_file="test_cursor_2_forward.json")
+            if resp.status_code != 200:
+                print_fail(f"Page failed with status {resp.status_code}")
+                return
+            data = resp.json()
+            if 'totalResults' in data:
+                print_fail("Cursor pages should not carry totalResults.")
+            pages.append(data)
+            seen.extend(user['id'] for user in data['results'])
+            url = f"{BASE_URL}/users?search={prefix}&sortBy=email:asc&limit=2&cursor={data['next']}" if data['next'] else None
+
+        if seen == created_ids:
+            print_pass(f"{len(pages)} pages returned every user once, in email order.")
+        else:
+            print_fail(f"Expected {created_ids}, got {seen}")
+
+        if pages[0]['previous'] is None and pages[-1]['next'] is None:
+            print_pass("First page has no 'previous', last page has no 'next'.")
+        else:
+            print_fail("Unexpected 'previous' on the first page or 'next' on the last page.")
+
+        # --- STEP 3: STEP BACK ---
+        print_header("3. STEP BACK (previous cursor)")
+        url = f"{BASE_URL}/users?search={prefix}&sortBy=email:asc&limit=2&cursor={pages[-1]['previous']}"
+        resp = send_and_print(url, headers, method="GET", output_file="test_cursor_3_previous.json")
+        back = [user['id'] for user in resp.json()['results']] if resp.status_code == 200 else None
+        expected = [user['id'] for user in pages[-2]['results']]
+        if back == expected:
+            print_pass("'previous' of the last page returned the page before it.")
+        else:
+            print_fail(f"Expected {expected}, got {back}")
+
+        # --- STEP 4: TAMPERED CURSOR ---
+        print_header("4. TAMPERED CURSOR (404)")
+        url = f"{BASE_URL}/users?search={prefix}&limit=2&cursor=not-a-cursor"
+        resp = send_and_print(url, headers, method="GET", output_file="test_cursor_4_invalid.json")
+        if resp.status_code == 404:
+            print_pass("Invalid cursor rejected with 404.")
+        else:
+            print_fail(f"Expected 404 but got {resp.status_code}")
+    finally:
+        # --- CLEANUP ---
+        print_header("CLEANUP")
+        for user_id in created_ids:
+            send_and_print(f"{BASE_URL}/users/{user_id}", headers, method="DELETE", output_file="test_cursor_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,94 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def run_test():
+    print_header("TEST: LIST WITHOUT TOTALS (GET /users?count=false)")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+    prefix = f"count{timestamp}"
+
+    # --- STEP 1: CREATE 3 USERS ---
+    print_header("1. CREATE 3 USERS (POST)")
+    created_ids = []
+    for i in range(3):
+        payload = {
+            "name": f"Count Test {i}",
+            "email": f"{prefix}.{i}@check.com",
+            "role": "user",
+            "password": "Pwd_1234"
+        }
+        resp = send_and_print(f"{BASE_URL}/users", headers, method="POST", body=payload, output_file="test_count_1_create.json")
+        if resp.status_code != 201:
+            print_fail(f"Create failed with status {resp.status_code}")
+            sys.exit(1)
+        created_ids.append(resp.json()['id'])
+
+    try:
+        # --- STEP 2: DEFAULT LIST HAS TOTALS ---
+        print_header("2. DEFAULT LIST (totals)")
+        resp = send_and_print(f"{BASE_URL}/users?search={prefix}&limit=2", headers, method="GET", output_file="test_count_2_default.json")
+        data = resp.json() if resp.status_code == 200 else {}
+        if data.get('totalResults') == 3 and data.get('totalPages') == 2:
+            print_pass("totalResults and totalPages are counted.")
+        else:
+            print_fail(f"Unexpected totals: {resp.status_code} {data}")
+
+        # --- STEP 3: count=false, FIRST PAGE ---
+        print_header("3. count=false, PAGE 1")
+        resp = send_and_print(f"{BASE_URL}/users?search={prefix}&limit=2&page=1&count=false", headers, method="GET", output_file="test_count_3_page1.json")
+        data = resp.json() if resp.status_code == 200 else {}
+        if data.get('totalResults') is None and data.get('totalPages') is None and data.get('hasNextPage') is True and len(data.get('results', [])) == 2:
+            print_pass("No totals; hasNextPage=true on page 1.")
+        else:
+            print_fail(f"Unexpected page 1: {resp.status_code} {data}")
+
+        # --- STEP 4: count=false, LAST PAGE ---
+        print_header("4. count=false, PAGE 2")
+        resp = send_and_print(f"{BASE_URL}/users?search={prefix}&limit=2&page=2&count=false", headers, method="GET", output_file="test_count_4_page2.json")
+        data = resp.json() if resp.status_code == 200 else {}
+        if data.get('hasNextPage') is False and len(data.get('results', [])) == 1:
+            print_pass("hasNextPage=false on the last page.")
+        else:
+            print_fail(f"Unexpected page 2: {resp.status_code} {data}")
+    finally:
+        # --- CLEANUP ---
+        print_header("CLEANUP")
+        for user_id in created_ids:
+            send_and_print(f"{BASE_URL}/users/{user_id}", headers, method="DELETE", output_file="test_count_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
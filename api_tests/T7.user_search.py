@@ -0,0 +1,111 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def search_ids(headers, query, output_file):
+    resp = send_and_print(f"{BASE_URL}/users?{query}&limit=100", headers, method="GET", output_file=output_file)
+    if resp.status_code != 200:
+        print_fail(f"Search failed with status {resp.status_code}")
+        return None
+    return {user['id'] for user in resp.json()['results']}
+
+def run_test():
+    print_header("TEST: SUBSTRING SEARCH (GET /users?search=)")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+    marker = f"zq{timestamp}"
+
+    # --- STEP 1: CREATE USERS ---
+    print_header("1. CREATE USERS (POST)")
+    payloads = {
+        "by_name": {"name": f"Alice X{marker}X Smith", "email": f"alice.{timestamp}@check.com"},
+        "by_email": {"name": "Bob Jones", "email": f"bob.{marker}@check.com"},
+    }
+    created = {}
+    for key, payload in payloads.items():
+        resp = send_and_print(f"{BASE_URL}/users", headers, method="POST", body={**payload, "role": "user", "password": "Pwd_1234"}, output_file="test_search_1_create.json")
+        if resp.status_code != 201:
+            print_fail(f"Create failed with status {resp.status_code}")
+            sys.exit(1)
+        created[key] = resp.json()['id']
+
+    try:
+        # --- STEP 2: MID-WORD, ANY CASE ---
+        print_header("2. MID-WORD SUBSTRING, UPPER CASE")
+        found = search_ids(headers, f"search={marker.upper()}", "test_search_2_all.json")
+        if found == set(created.values()):
+            print_pass("Substring inside name and email matched, case-insensitively.")
+        else:
+            print_fail(f"Expected {set(created.values())}, got {found}")
+
+        # --- STEP 3: SCOPES ---
+        print_header("3. SCOPE name / email")
+        found = search_ids(headers, f"search={marker}&scope=name", "test_search_3_name.json")
+        if found == {created['by_name']}:
+            print_pass("scope=name matched the name only.")
+        else:
+            print_fail(f"scope=name: expected {created['by_name']}, got {found}")
+        found = search_ids(headers, f"search={marker}&scope=email", "test_search_3_email.json")
+        if found == {created['by_email']}:
+            print_pass("scope=email matched the email only.")
+        else:
+            print_fail(f"scope=email: expected {created['by_email']}, got {found}")
+
+        # --- STEP 4: SEARCH SEES UPDATES ---
+        print_header("4. RENAME, THEN SEARCH (PATCH)")
+        renamed = f"Carol Y{marker}Y"
+        send_and_print(f"{BASE_URL}/users/{created['by_email']}", headers, method="PATCH", body={"name": renamed}, output_file="test_search_4_update.json")
+        found = search_ids(headers, f"search=Y{marker}Y&scope=name", "test_search_4_search.json")
+        if found == {created['by_email']}:
+            print_pass("Renamed user is found by the new name.")
+        else:
+            print_fail(f"Expected {created['by_email']}, got {found}")
+
+        # --- STEP 5: TERM SHORTER THAN A TRIGRAM ---
+        print_header("5. TWO-LETTER TERM")
+        found = search_ids(headers, "search=zq&scope=email", "test_search_5_short.json")
+        if found is not None and created['by_email'] in found:
+            print_pass("Two-letter term still matches (plain substring fallback).")
+        else:
+            print_fail(f"Two-letter term did not match {created['by_email']}: {found}")
+    finally:
+        # --- CLEANUP ---
+        print_header("CLEANUP")
+        for user_id in created.values():
+            send_and_print(f"{BASE_URL}/users/{user_id}", headers, method="DELETE", output_file="test_search_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
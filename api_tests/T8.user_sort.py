@@ -0,0 +1,95 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def run_test():
+    print_header("TEST: WHITELISTED SORT (GET /users?sortBy=)")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+    prefix = f"sort{timestamp}"
+
+    # --- STEP 1: CREATE USERS (names out of order) ---
+    print_header("1. CREATE 3 USERS (POST)")
+    created_ids = []
+    for i, name in enumerate(["Charlie", "Alpha", "Bravo"]):
+        payload = {
+            "name": f"{name} {prefix}",
+            "email": f"{prefix}.{i}@check.com",
+            "role": "user",
+            "password": "Pwd_1234"
+        }
+        resp = send_and_print(f"{BASE_URL}/users", headers, method="POST", body=payload, output_file="test_sort_1_create.json")
+        if resp.status_code != 201:
+            print_fail(f"Create failed with status {resp.status_code}")
+            sys.exit(1)
+        created_ids.append(resp.json()['id'])
+
+    try:
+        # --- STEP 2: WHITELISTED FIELDS ---
+        print_header("2. SORT BY name / email / createdAt")
+        cases = [
+            ("name:asc", ["Alpha", "Bravo", "Charlie"], "name"),
+            ("name:desc", ["Charlie", "Bravo", "Alpha"], "name"),
+            ("email:asc", [f"{prefix}.0@check.com", f"{prefix}.1@check.com", f"{prefix}.2@check.com"], "email"),
+            ("createdAt:desc", list(reversed(created_ids)), "id"),
+        ]
+        for sort_by, expected, key in cases:
+            resp = send_and_print(f"{BASE_URL}/users?search={prefix}&sortBy={sort_by}", headers, method="GET", output_file="test_sort_2_sort.json")
+            if resp.status_code != 200:
+                print_fail(f"sortBy={sort_by} failed with status {resp.status_code}")
+                continue
+            got = [user[key].split(' ')[0] if key == "name" else user[key] for user in resp.json()['results']]
+            if got == expected:
+                print_pass(f"sortBy={sort_by} ordered correctly.")
+            else:
+                print_fail(f"sortBy={sort_by}: expected {expected}, got {got}")
+
+        # --- STEP 3: FIELDS OUTSIDE THE WHITELIST ---
+        print_header("3. UNINDEXED FIELD / BAD DIRECTION (400)")
+        for sort_by in ["password:asc", "role:asc", "name:sideways"]:
+            resp = send_and_print(f"{BASE_URL}/users?sortBy={sort_by}", headers, method="GET", output_file="test_sort_3_invalid.json")
+            if resp.status_code == 400:
+                print_pass(f"sortBy={sort_by} rejected with 400.")
+            else:
+                print_fail(f"sortBy={sort_by}: expected 400 but got {resp.status_code}")
+    finally:
+        # --- CLEANUP ---
+        print_header("CLEANUP")
+        for user_id in created_ids:
+            send_and_print(f"{BASE_URL}/users/{user_id}", headers, method="DELETE", output_file="test_sort_cleanup.json")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
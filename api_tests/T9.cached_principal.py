@@ -0,0 +1,86 @@
+import sys
+import os
+import time
+
+# Add current directory to path to import utils
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import send_and_print, BASE_URL, load_config
+
+# --- COLORS ---
+class Colors:
+    OKGREEN = '\033[92m'
+    FAIL = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+
+def print_header(msg):
+    print(f"\n{Colors.BOLD}=== {msg} ==={Colors.ENDC}")
+
+def print_pass(msg):
+    print(f"{Colors.OKGREEN}[PASS] {msg}{Colors.ENDC}")
+
+def print_fail(msg):
+    print(f"{Colors.FAIL}[FAIL] {msg}{Colors.ENDC}")
+
+# --- MAIN TEST FLOW ---
+
+def run_test():
+    print_header("TEST: CACHED PRINCIPALS FOLLOW USER CHANGES")
+
+    token = load_config("accessToken")
+    if not token:
+        print_fail("No access token found. Run A2.auth_login.py first.")
+        sys.exit(1)
+
+    admin_headers = {"Authorization": f"Bearer {token}"}
+    timestamp = int(time.time())
+
+    # --- STEP 1: REGISTER A STANDARD USER ---
+    print_header("1. REGISTER STANDARD USER")
+    payload = {"name": "Principal Test", "email": f"principal.{timestamp}@check.com", "password": "Pwd_1234"}
+    resp = send_and_print(f"{BASE_URL}/auth/register", method="POST", body=payload, output_file="test_principal_1_register.json")
+    if resp.status_code != 201:
+        print_fail(f"Register failed with status {resp.status_code}")
+        sys.exit(1)
+    user_id = resp.json()['user']['id']
+    user_headers = {"Authorization": f"Bearer {resp.json()['tokens']['access']['token']}"}
+
+    # --- STEP 2: PRIME THE CACHE ---
+    print_header("2. STANDARD USER ON AN ADMIN ROUTE (403)")
+    resp = send_and_print(f"{BASE_URL}/users", user_headers, method="GET", output_file="test_principal_2_forbidden.json")
+    if resp.status_code == 403:
+        print_pass("GET /users forbidden for the standard user.")
+    else:
+        print_fail(f"Expected 403 but got {resp.status_code}")
+
+    # --- STEP 3: PROMOTE, SAME TOKEN ---
+    print_header("3. PROMOTE TO ADMIN, REUSE THE SAME TOKEN")
+    # Role is not editable on PATCH /users/:id; the bulk route updates with QuerySet.update()
+    body = {"ids": [user_id], "data": {"role": "admin"}}
+    resp = send_and_print(f"{BASE_URL}/users/bulk", admin_headers, method="PATCH", body=body, output_file="test_principal_3_promote.json")
+    if resp.status_code != 200:
+        print_fail(f"Promote failed with status {resp.status_code}")
+    resp = send_and_print(f"{BASE_URL}/users", user_headers, method="GET", output_file="test_principal_3_allowed.json")
+    if resp.status_code == 200:
+        print_pass("New role applies at once (no stale cached principal).")
+    else:
+        print_fail(f"Expected 200 but got {resp.status_code}")
+
+    # --- STEP 4: DELETE, SAME TOKEN ---
+    print_header("4. DELETE THE USER, REUSE THE SAME TOKEN")
+    resp = send_and_print(f"{BASE_URL}/users/{user_id}", admin_headers, method="DELETE", output_file="test_principal_4_delete.json")
+    if resp.status_code != 204:
+        print_fail(f"Delete failed with status {resp.status_code}")
+    resp = send_and_print(f"{BASE_URL}/users/{user_id}", user_headers, method="GET", output_file="test_principal_4_rejected.json")
+    if resp.status_code == 401:
+        print_pass("Token of the deleted user rejected with 401.")
+    else:
+        print_fail(f"Expected 401 but got {resp.status_code}")
+
+if __name__ == "__main__":
+    try:
+        run_test()
+    except Exception as e:
+        print(f"\n{Colors.FAIL}CRITICAL ERROR: {e}{Colors.ENDC}")
+        import traceback
+        traceback.print_exc()
@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+class CommonConfig(AppConfig):
+    name = 'apps.common'
+    verbose_name = 'Common'
+
+    def ready(self):
+        # System checks (shared cache with several workers)
+        from apps.common import checks
+
+        # SQL instrumentation for RequestTimingMiddleware / MetricsMiddleware
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+        from apps.common.timing import install_query_wrapper
+        connection_created.connect(install_query_wrapper)
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(connection=connection)
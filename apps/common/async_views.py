@@ -0,0 +1,115 @@
+"""
+Base class for the async (ASGI) serving path.
+
+DRF 3.x runs `async def` handlers only through a sync adapter, so the async
+views are plain Django views that keep the DRF contract: JSON bodies parsed
+and rendered with the configured DRF parser/renderer, authentication via
+`aauthenticate()` of the DEFAULT_AUTHENTICATION_CLASSES, DRF permission
+classes, and errors formatted by the EXCEPTION_HANDLER.
+"""
+import io
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.parsers import JSONParser
+from rest_framework.settings import api_settings
+
+
+class AsyncAPIView(View):
+    permission_classes = []
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Token-authenticated JSON API, same as DRF's APIView.as_view()
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.query_params = request.GET
+        try:
+            request.data = self.parse(request)
+            await self.perform_authentication(request)
+            self.check_permissions(request)
+            handler = getattr(self, request.method.lower(), None)
+            if request.method.lower() not in self.http_method_names or handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            return await handler(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(request, exc)
+
+    # --------------------------------------------------------------------------
+    # Request / response
+    # --------------------------------------------------------------------------
+
+    def parse(self, request):
+        if not request.body:
+            return {}
+        if request.content_type in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+            return request.POST
+        parser_class = next(
+            (p for p in api_settings.DEFAULT_PARSER_CLASSES if issubclass(p, JSONParser)), JSONParser
+        )
+        return parser_class().parse(io.BytesIO(request.body), parser_context={'request': request})
+
+    def respond(self, data=None, status=status.HTTP_200_OK, headers=None):
+        renderer_class = api_settings.DEFAULT_RENDERER_CLASSES[0]
+        if data is None:
+            response = HttpResponse(status=status)
+        else:
+            renderer = renderer_class()
+            content_type = f'{renderer.media_type}; charset={renderer.charset}' if renderer.charset else renderer.media_type
+            response = HttpResponse(renderer.render(data), status=status, content_type=content_type)
+        for name, value in (headers or {}).items():
+            response[name] = value
+        return response
+
+    def handle_exception(self, request, exc):
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticators = self.get_authenticators()
+            if authenticators:
+                exc.auth_header = authenticators[0].authenticate_header(request)
+            else:
+                exc.status_code = status.HTTP_403_FORBIDDEN
+
+        handler = api_settings.EXCEPTION_HANDLER
+        response = handler(exc, {'view': self, 'request': request, 'args': self.args, 'kwargs': self.kwargs})
+        if response is None:
+            raise exc
+        # WWW-Authenticate / Retry-After set by the handler; the body is rendered here
+        headers = {name: value for name, value in response.items() if name.lower() != 'content-type'}
+        return self.respond(response.data, response.status_code, headers=headers)
+
+    # --------------------------------------------------------------------------
+    # Authentication / permissions
+    # --------------------------------------------------------------------------
+
+    def get_authenticators(self):
+        return [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+    async def perform_authentication(self, request):
+        request.user, request.auth = AnonymousUser(), None
+        for authenticator in self.get_authenticators():
+            result = await authenticator.aauthenticate(request)
+            if result is not None:
+                request.user, request.auth = result
+                return
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    def check_permissions(self, request):
+        for permission in self.get_permissions():
+            if not permission.has_permission(request, self):
+                self.permission_denied(request, permission)
+
+    def check_object_permissions(self, request, obj):
+        for permission in self.get_permissions():
+            if not permission.has_object_permission(request, self, obj):
+                self.permission_denied(request, permission)
+
+    def permission_denied(self, request, permission):
+        if request.auth is None and not request.user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+        raise exceptions.PermissionDenied(getattr(permission, 'message', None))
@@ -0,0 +1,253 @@
+"""
+Two-tier cache: a bounded in-process LRU (with TTL) in front of a shared
+Django cache backend (CACHES, see CACHE_URL in settings).
+
+    users = TwoTierCache('users', timeout=300)
+    row = users.get_or_set(f'id:{pk}', lambda: load_row(pk))
+    users.delete(f'id:{pk}')      # one entry (new key version)
+    users.bump_version()          # every entry of the namespace
+
+- Local tier: per process, no network round trip. Other processes only see
+  a delete or a version bump once their local entry expires, so it is kept
+  short (CACHE_LOCAL_TTL). Pass local=False where that staleness is not
+  acceptable (credentials): the shared tier is invalidated immediately.
+- Single-flight: concurrent misses for the same key in one process wait for
+  the first caller's loader instead of each running their own query.
+- Per-key versions: entries are stored as (key version, value) and only
+  served while the key's version key still holds that version. delete()
+  sets a new version rather than just removing the entry, so a miss that
+  loaded the row before a write committed can't store it back as current
+  (the same scheme as the principal cache, apps.users.authentication).
+- Versioned keys: every key embeds the namespace version. bump_version()
+  invalidates the whole namespace at once (bulk updates that bypass model
+  signals), old entries simply age out of the backend. A missing version
+  is seeded with a random value (new_version()), so an evicted version key
+  never brings back entries stored under an earlier version.
+
+Cached values are shared between callers and must be treated as read-only.
+None is never cached (it means "miss").
+"""
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from apps.common import metrics
+
+
+def new_version():
+    """Random cache version: a re-created version key never repeats an earlier value."""
+    return secrets.randbits(63)
+
+
+class LocalLRU:
+    """Thread-safe LRU dict with a per-entry expiry."""
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TwoTierCache:
+    def __init__(self, namespace, timeout=None, alias='default', local_ttl=None, local_max_entries=None):
+        self.namespace = namespace
+        self.timeout = timeout
+        self.alias = alias
+        self._local_ttl = local_ttl
+        self._local_max_entries = local_max_entries
+        self._local = None
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    # Settings are read on first use, so overrides in tests apply
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    @property
+    def local(self):
+        if self._local is None:
+            self._local = LocalLRU(
+                settings.CACHE_LOCAL_MAX_ENTRIES if self._local_max_entries is None else self._local_max_entries,
+                settings.CACHE_LOCAL_TTL if self._local_ttl is None else self._local_ttl,
+            )
+        return self._local
+
+    # --------------------------------------------------------------------------
+    # Versioned keys
+    # --------------------------------------------------------------------------
+
+    @property
+    def _version_key(self):
+        return f'{self.namespace}:version'
+
+    def version(self, local=True):
+        version = self.local.get(self._version_key) if local else None
+        if version is None:
+            version = self.shared.get(self._version_key)
+            if version is None:
+                seed = new_version()
+                self.shared.add(self._version_key, seed, timeout=None)
+                version = self.shared.get(self._version_key, seed)
+            self.local.set(self._version_key, version)
+        return version
+
+    def bump_version(self):
+        """Invalidate every key of the namespace (shared tier now, other processes' local tiers within CACHE_LOCAL_TTL)."""
+        try:
+            version = self.shared.incr(self._version_key)
+        except ValueError:
+            # Not set yet (or evicted): a fresh random version
+            version = new_version()
+            self.shared.set(self._version_key, version, timeout=None)
+        self.local.clear()
+        self.local.set(self._version_key, version)
+        return version
+
+    def make_key(self, key, local=True):
+        # local=False reads the version from the shared tier: sees other processes' bumps at once
+        return f'{self.namespace}:v{self.version(local)}:{key}'
+
+    # --------------------------------------------------------------------------
+    # Get / set
+    # --------------------------------------------------------------------------
+
+    def _key_version(self, version_key, cached=None):
+        """Current version of one key, from `cached` (a get_many() result) or the shared tier; seeded if missing."""
+        version = self.shared.get(version_key) if cached is None else cached.get(version_key)
+        if version is None:
+            # No expiry: an evicted key version only turns its entry into a miss
+            seed = new_version()
+            self.shared.add(version_key, seed, timeout=None)
+            version = self.shared.get(version_key, seed)
+        return version
+
+    def _lookup(self, key, local):
+        """
+        (full key, value, key version). value is None on a miss; the key
+        version is read before any loader runs, so the loaded value is
+        stored under it even if delete() has moved it on meanwhile.
+        """
+        full_key = self.make_key(key, local)
+        version_key = f'{full_key}:version'
+        if local:
+            version, entry = self.local.get(version_key), self.local.get(full_key)
+            if version is not None and entry is not None and entry[0] == version:
+                metrics.CACHE_REQUESTS.inc(cache=self.namespace, result='local_hit')
+                return full_key, entry[1], version
+
+        cached = self.shared.get_many([full_key, version_key])
+        version = self._key_version(version_key, cached)
+        entry = cached.get(full_key)
+        if local:
+            self.local.set(version_key, version)
+        if entry is None or entry[0] != version:
+            metrics.CACHE_REQUESTS.inc(cache=self.namespace, result='miss')
+            return full_key, None, version
+        metrics.CACHE_REQUESTS.inc(cache=self.namespace, result='shared_hit')
+        if local:
+            self.local.set(full_key, entry)
+        return full_key, entry[1], version
+
+    def _store(self, full_key, version, value, timeout, local):
+        entry = (version, value)
+        self.shared.set(full_key, entry, self.timeout if timeout is None else timeout)
+        if local:
+            self.local.set(full_key, entry)
+
+    def get(self, key, local=True):
+        return self._lookup(key, local)[1]
+
+    def set(self, key, value, timeout=None, local=True):
+        full_key = self.make_key(key, local)
+        self._store(full_key, self._key_version(f'{full_key}:version'), value, timeout, local)
+
+    def delete(self, key):
+        """
+        Invalidate one key: it gets a new version, so its entry stops
+        matching, including one a loader that started before this call
+        stores afterwards. Other processes' local tiers follow within
+        CACHE_LOCAL_TTL.
+        """
+        full_key = self.make_key(key, local=False)
+        version_key = f'{full_key}:version'
+        version = new_version()
+        self.shared.set(version_key, version, timeout=None)
+        self.shared.delete(full_key)
+        self.local.set(version_key, version)
+        self.local.delete(full_key)
+
+    def get_or_set(self, key, loader, timeout=None, local=True):
+        """
+        Cached value for key, else loader() (stored unless None). Concurrent
+        misses in this process share a single loader() call.
+        """
+        full_key, value, version = self._lookup(key, local)
+        if value is not None:
+            return value
+
+        with self._flights_lock:
+            flight = self._flights.get(full_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[full_key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            if flight.value is not None:
+                # Under the key (namespace version included) and key version
+                # read before loading: a concurrent delete() or bump_version()
+                # leaves this entry behind instead of serving it
+                self._store(full_key, version, flight.value, timeout, local)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[full_key]
+            flight.done.set()
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Cache invalidation (principals, user rows, namespace versions) goes
+    through the default cache. A locmem one is per process, so with several
+    workers a password reset or a deactivation would reach only one of them.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or settings.WEB_CONCURRENCY <= 1 or not backend.endswith('.LocMemCache'):
+        return []
+    return [Error(
+        f'The default cache is per process (LocMemCache) but WEB_CONCURRENCY={settings.WEB_CONCURRENCY} '
+        'worker processes are configured: cache invalidation would only reach one of them.',
+        hint='Set CACHE_URL to a shared backend (filecache://, dbcache://, rediscache://) or run one worker.',
+        id='common.E001',
+    )]
+
+
+@register(Tags.security, deploy=True)
+def check_metrics_token(app_configs, **kwargs):
+    """
+    /metrics is only mounted without a token in DEBUG (config/urls.py).
+    Runs with `manage.py check --deploy`.
+    """
+    if not settings.METRICS_ENABLED or settings.DEBUG or settings.METRICS_AUTH_TOKEN:
+        return []
+    return [Warning(
+        'METRICS_ENABLED is on but METRICS_AUTH_TOKEN is empty: /metrics is not served.',
+        hint='Set METRICS_AUTH_TOKEN and scrape with "Authorization: Bearer <token>", or set METRICS_ENABLED=False.',
+        id='common.W001',
+    )]
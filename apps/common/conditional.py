@@ -0,0 +1,36 @@
+"""
+Conditional GET: strong ETags computed from what a response is built from
+(ids, updated_at, query parameters), so an unchanged resource is answered
+with 304 Not Modified before it is serialized.
+
+    etag = compute_etag(user.pk, user.updated_at)
+    response = not_modified(request, etag)
+    if response is None:
+        response = Response(UserSerializer(user).data)
+        set_etag(response, etag)
+    return response
+"""
+import hashlib
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+
+def compute_etag(*parts):
+    digest = hashlib.sha1('|'.join(map(str, parts)).encode('utf-8')).hexdigest()
+    return quote_etag(digest)
+
+
+def set_etag(response, etag):
+    response['ETag'] = etag
+    # Responses are per-user (auth required): shared caches must not keep them,
+    # clients must revalidate before reuse
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def not_modified(request, etag):
+    """A 304 (or 412 for a failed If-Match) response if the request's preconditions match `etag`, else None."""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        set_etag(response, etag)
+    return response
@@ -0,0 +1,26 @@
+import time
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from apps.common import metrics, timing
+
+
+class TimedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2 hasher (same 'pbkdf2_sha256' algorithm and hash format),
+    reporting time spent hashing to the request timing middleware and to
+    /metrics. verify() goes through encode(), so logins are measured too.
+
+    The work factor comes from PASSWORD_HASHER_ITERATIONS (see
+    `manage.py calibrate_hasher`); 0 keeps Django's default. Hashes stored
+    with another count are upgraded on the next successful login.
+    """
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASHER_ITERATIONS or PBKDF2PasswordHasher.iterations
+
+    def encode(self, password, salt, iterations=None):
+        start = time.perf_counter()
+        with timing.measure('hash'):
+            encoded = super().encode(password, salt, iterations)
+        metrics.PASSWORD_HASH_DURATION.observe(time.perf_counter() - start)
+        return encoded
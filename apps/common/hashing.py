@@ -0,0 +1,133 @@
+"""
+Bounded executor for password hashing.
+
+Hashing is CPU-heavy on purpose. Running it on a fixed pool caps how many
+hashes a server process computes at once, and a bounded queue in front of
+the pool turns overload into an immediate 503 + Retry-After (HashingBusy)
+instead of stalling every request thread behind a login burst.
+
+    PASSWORD_HASHING_POOL         thread | process | inline (no pool)
+    PASSWORD_HASHING_WORKERS      concurrent hashes per process
+                                  (0 = CPU count / WEB_CONCURRENCY)
+    PASSWORD_HASHING_QUEUE_SIZE   hashes allowed to wait for a worker
+    PASSWORD_HASHING_RETRY_AFTER  seconds sent in Retry-After
+
+The pool is per process. The bound only fires when a process runs more
+requests at once than WORKERS + QUEUE_SIZE: gunicorn gthread workers with
+WEB_THREADS above that sum (entrypoint.sh), or ASGI. A sync worker serves
+one request at a time and would never fill it.
+
+A process pool sidesteps the GIL entirely but costs a pickle round trip per
+hash; PBKDF2 releases the GIL, so threads are the default.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from apps.common import timing
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Server is busy, please retry shortly.'
+    default_code = 'hashing_busy'
+
+    def __init__(self, wait):
+        super().__init__()
+        self.wait = wait  # DRF's exception handler turns this into Retry-After
+
+
+def _init_process_worker():
+    # Only needed for 'spawn'/'forkserver' start methods; forked workers inherit Django
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+        django.setup()
+
+
+class HashingPool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._executor = None
+        self._slots = None
+        self._workers = None
+
+    def _get_executor(self):
+        # Created lazily, and again after a fork (executors don't survive one)
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                # Default: the server's cores shared among its worker processes
+                workers = self._workers = settings.PASSWORD_HASHING_WORKERS or max(
+                    1, (os.cpu_count() or 1) // settings.WEB_CONCURRENCY
+                )
+                if settings.PASSWORD_HASHING_POOL == 'process':
+                    self._executor = ProcessPoolExecutor(workers, initializer=_init_process_worker)
+                else:
+                    self._executor = ThreadPoolExecutor(workers, thread_name_prefix='password-hashing')
+                self._slots = threading.BoundedSemaphore(workers + settings.PASSWORD_HASHING_QUEUE_SIZE)
+            return self._executor, self._slots
+
+    def run(self, fn, *args):
+        """Run fn(*args) on the pool and wait for it; HashingBusy if the queue is full."""
+        if settings.PASSWORD_HASHING_POOL == 'inline':
+            return fn(*args)
+        executor, slots = self._get_executor()
+        if not slots.acquire(blocking=False):
+            raise HashingBusy(wait=settings.PASSWORD_HASHING_RETRY_AFTER)
+        try:
+            # Measured here, including queue wait: the time the request spent on it
+            with timing.measure('hash'):
+                return executor.submit(fn, *args).result()
+        finally:
+            slots.release()
+
+    def map(self, fn, items):
+        """
+        [fn(item) for item in items], computed on the pool (batch jobs). Waits
+        for a slot instead of raising HashingBusy, and keeps at most one item
+        per worker in flight so interactive hashes (logins) still find room in
+        the queue.
+        """
+        items = list(items)
+        if settings.PASSWORD_HASHING_POOL == 'inline':
+            return [fn(item) for item in items]
+        executor, slots = self._get_executor()
+        window = threading.BoundedSemaphore(self._workers)
+
+        def release(_future):
+            slots.release()
+            window.release()
+
+        futures = []
+        with timing.measure('hash'):
+            for item in items:
+                window.acquire()
+                slots.acquire()
+                try:
+                    future = executor.submit(fn, item)
+                except BaseException:
+                    release(None)
+                    raise
+                future.add_done_callback(release)
+                futures.append(future)
+            return [future.result() for future in futures]
+
+
+pool = HashingPool()
+
+def make_password(raw_password):
+    return pool.run(hashers.make_password, raw_password)
+
+def make_passwords(raw_passwords):
+    """make_password() for a batch, hashed in parallel (HashingPool.map)."""
+    return pool.map(hashers.make_password, raw_passwords)
+
+def verify_password(raw_password, encoded):
+    """(is_correct, must_update), as django.contrib.auth.hashers.verify_password."""
+    return pool.run(hashers.verify_password, raw_password, encoded)
@@ -0,0 +1,97 @@
+import os
+import re
+import statistics
+import time
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.crypto import get_random_string
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the configured PASSWORD_HASHERS on this machine and recommend a PBKDF2 '
+        'iteration count (PASSWORD_HASHER_ITERATIONS) for a target time per hash.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target-ms', type=float, default=50.0, help='Wanted time for one hash, in milliseconds.')
+        parser.add_argument('--rounds', type=int, default=5, help='Hashes timed per measurement (the median is used).')
+        parser.add_argument(
+            '--write', nargs='?', const=os.path.join(settings.BASE_DIR, '.env'), metavar='ENV_FILE',
+            help='Store the recommendation as PASSWORD_HASHER_ITERATIONS in an env file (default: .env).',
+        )
+
+    def handle(self, *args, **options):
+        if options['target_ms'] <= 0 or options['rounds'] < 1:
+            raise CommandError('--target-ms must be positive and --rounds at least 1.')
+        self.rounds = options['rounds']
+
+        self.stdout.write(f'{"hasher":<24} {"parameters":<44} {"ms/hash":>9}')
+        for hasher in get_hashers():
+            try:
+                seconds = self.measure(hasher)
+            except ValueError as exc:
+                # Optional backend library (argon2-cffi, bcrypt) not installed
+                self.stdout.write(f'{hasher.algorithm:<24} {"-":<44} {"n/a":>9}  ({exc})')
+                continue
+            self.stdout.write(f'{hasher.algorithm:<24} {self.parameters(hasher):<44} {seconds * 1000:>9.1f}')
+
+        hasher = get_hashers()[0]
+        if not hasattr(hasher, 'iterations') or not hasher.algorithm.startswith('pbkdf2'):
+            raise CommandError(f'The preferred hasher ({hasher.algorithm}) has no PBKDF2 iteration count to calibrate.')
+
+        # PBKDF2 cost is linear in the iteration count: scale, then check
+        seconds = self.measure(hasher)
+        iterations = max(1000, int(round(hasher.iterations * options['target_ms'] / 1000 / seconds, -3)))
+        seconds = self.measure(hasher, iterations)
+
+        workers = settings.PASSWORD_HASHING_WORKERS or os.cpu_count() or 1
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'PASSWORD_HASHER_ITERATIONS={iterations}  ({seconds * 1000:.1f} ms/hash, '
+            f'currently {hasher.iterations})'
+        ))
+        self.stdout.write(
+            f'Capacity: ~{1 / seconds:.0f} logins/s per hashing worker, '
+            f'~{workers / seconds:.0f}/s per process with PASSWORD_HASHING_WORKERS={workers} '
+            f'(if that many cores are free).'
+        )
+
+        if options['write']:
+            self.write_env(options['write'], iterations)
+            self.stdout.write(
+                f'Wrote PASSWORD_HASHER_ITERATIONS={iterations} to {options["write"]}. '
+                'Existing hashes are upgraded as users log in.'
+            )
+
+    def measure(self, hasher, iterations=None):
+        password, salt = get_random_string(16), hasher.salt()
+        kwargs = {'iterations': iterations} if iterations else {}
+        hasher.encode(password, salt, **kwargs)  # warm-up (library load, first-call overhead)
+        durations = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            hasher.encode(password, salt, **kwargs)
+            durations.append(time.perf_counter() - start)
+        return statistics.median(durations)
+
+    @staticmethod
+    def parameters(hasher):
+        names = ('iterations', 'rounds', 'time_cost', 'memory_cost', 'parallelism', 'work_factor', 'block_size')
+        return ' '.join(f'{name}={getattr(hasher, name)}' for name in names if hasattr(hasher, name))
+
+    @staticmethod
+    def write_env(path, iterations):
+        line = f'PASSWORD_HASHER_ITERATIONS={iterations}'
+        content = ''
+        if os.path.exists(path):
+            with open(path) as f:
+                content = f.read()
+        pattern = re.compile(r'^PASSWORD_HASHER_ITERATIONS=.*$', re.MULTILINE)
+        if pattern.search(content):
+            content = pattern.sub(line, content)
+        else:
+            content += ('' if not content or content.endswith('\n') else '\n') + line + '\n'
+        with open(path, 'w') as f:
+            f.write(content)
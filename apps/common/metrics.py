@@ -0,0 +1,293 @@
+"""
+Prometheus-style metrics shared by all server processes.
+
+Every process (gunicorn worker) writes its own samples to an mmap'd file in
+METRICS_MULTIPROC_DIR (`metrics_<pid>.db`: 8-byte header with the used size,
+then records of <key length><key, 8-byte aligned><float64 value>). A scrape
+of /metrics on any worker reads every file and sums the samples, so the
+result covers the whole server. Files of dead workers keep counting, which
+is correct for counters and histograms; entrypoint.sh clears the directory
+on startup.
+
+Without METRICS_MULTIPROC_DIR (runserver, tests) samples stay in memory.
+
+    from apps.common import metrics
+    metrics.TOKEN_REFRESH.inc(outcome='success')
+    metrics.PASSWORD_HASH_DURATION.observe(0.21)
+"""
+import glob
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from django.conf import settings
+
+INITIAL_FILE_SIZE = 1024 * 1024
+_header = struct.Struct('<Q')   # used bytes
+_length = struct.Struct('<I')   # key length
+_value = struct.Struct('<d')
+
+# ==============================================================================
+# STORAGE
+# ==============================================================================
+
+def _padded(length):
+    # Keep every float64 8-byte aligned
+    return length + (-(length + _length.size) % 8)
+
+
+class MmapedDict:
+    """
+    Append-only key -> float map backed by a memory-mapped file.
+    Written by a single process; other processes only read it.
+    """
+    def __init__(self, path):
+        self.path = path
+        exists = os.path.exists(path)
+        self._file = open(path, 'a+b')
+        if not exists or os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(INITIAL_FILE_SIZE)
+        self._capacity = os.fstat(self._file.fileno()).st_size
+        self._m = mmap.mmap(self._file.fileno(), self._capacity)
+        self._positions = {}
+        self._used = _header.unpack_from(self._m, 0)[0]
+        if not self._used:
+            self._used = _header.size
+            _header.pack_into(self._m, 0, self._used)
+        for key, value, position in self._read_all(self._m, self._used):
+            self._positions[key] = position
+
+    @staticmethod
+    def _read_all(data, used):
+        offset = _header.size
+        while offset < used:
+            length = _length.unpack_from(data, offset)[0]
+            key_start = offset + _length.size
+            key = bytes(data[key_start:key_start + length]).decode('utf-8')
+            value_position = key_start + _padded(length)
+            yield key, _value.unpack_from(data, value_position)[0], value_position
+            offset = value_position + _value.size
+
+    @classmethod
+    def read_file(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < _header.size:
+            return []
+        used = _header.unpack_from(data, 0)[0]
+        return [(key, value) for key, value, _ in cls._read_all(data, used)]
+
+    def _init_key(self, key):
+        encoded = key.encode('utf-8')
+        record = _length.pack(len(encoded)) + encoded.ljust(_padded(len(encoded)), b' ') + _value.pack(0.0)
+        while self._used + len(record) > self._capacity:
+            self._capacity *= 2
+            self._m.close()
+            self._file.truncate(self._capacity)
+            self._m = mmap.mmap(self._file.fileno(), self._capacity)
+        self._m[self._used:self._used + len(record)] = record
+        self._positions[key] = self._used + len(record) - _value.size
+        # Publish the record only once it is fully written
+        self._used += len(record)
+        _header.pack_into(self._m, 0, self._used)
+
+    def add(self, key, amount):
+        if key not in self._positions:
+            self._init_key(key)
+        position = self._positions[key]
+        _value.pack_into(self._m, position, _value.unpack_from(self._m, position)[0] + amount)
+
+    def close(self):
+        self._m.close()
+        self._file.close()
+
+
+class MetricStore:
+    """
+    Process-local writer. Re-opens its file after a fork, so workers forked
+    from a preloaded master never share one.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._file = None
+        self._memory = {}
+
+    @staticmethod
+    def directory():
+        return getattr(settings, 'METRICS_MULTIPROC_DIR', '')
+
+    def _mmap(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            self._pid = pid
+            self._file = None
+            directory = self.directory()
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+                self._file = MmapedDict(os.path.join(directory, f'metrics_{pid}.db'))
+        return self._file
+
+    def add(self, key, amount):
+        with self._lock:
+            store = self._mmap()
+            if store is None:
+                self._memory[key] = self._memory.get(key, 0.0) + amount
+            else:
+                store.add(key, amount)
+
+    def collect(self):
+        """Sum of every process's samples: {key: value}."""
+        with self._lock:
+            store = self._mmap()
+            if store is None:
+                return dict(self._memory)
+        totals = {}
+        for path in glob.glob(os.path.join(self.directory(), 'metrics_*.db')):
+            try:
+                samples = MmapedDict.read_file(path)
+            except OSError:
+                continue  # worker file removed mid-scrape
+            for key, value in samples:
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+
+store = MetricStore()
+
+# ==============================================================================
+# METRIC TYPES
+# ==============================================================================
+
+REGISTRY = []
+
+def _key(name, sample, labels):
+    return json.dumps([name, sample, sorted(labels.items())], separators=(',', ':'))
+
+def _str_labels(labels):
+    return {name: str(value) for name, value in labels.items()}
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        REGISTRY.append(self)
+
+    def inc(self, amount=1, **labels):
+        store.add(_key(self.name, f'{self.name}_total', _str_labels(labels)), amount)
+
+
+class Histogram:
+    type = 'histogram'
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, documentation, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        REGISTRY.append(self)
+
+    def observe(self, value, **labels):
+        # Buckets are stored non-cumulative and accumulated at scrape time
+        labels = _str_labels(labels)
+        bucket = next((b for b in self.buckets if value <= b), math.inf)
+        store.add(_key(self.name, f'{self.name}_bucket', {**labels, 'le': bucket}), 1)
+        store.add(_key(self.name, f'{self.name}_sum', labels), value)
+        store.add(_key(self.name, f'{self.name}_count', labels), 1)
+
+# ==============================================================================
+# EXPOSITION
+# ==============================================================================
+
+def _format_float(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        f'{k}="' + str(v).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') + '"'
+        for k, v in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+def render():
+    """All registered metrics in the Prometheus text format (version 0.0.4)."""
+    samples = {}
+    for key, value in store.collect().items():
+        name, sample, labels = json.loads(key)
+        samples.setdefault(name, []).append((sample, [tuple(label) for label in labels], value))
+
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        metric_samples = samples.get(metric.name, [])
+        if metric.type == 'histogram':
+            lines.extend(_render_histogram(metric, metric_samples))
+        else:
+            for sample, labels, value in sorted(metric_samples, key=lambda s: s[1]):
+                lines.append(f'{sample}{_format_labels(labels)} {_format_float(value)}')
+    return '\n'.join(lines) + '\n'
+
+def _render_histogram(metric, metric_samples):
+    series = {}  # labels without 'le' -> {'buckets': {le: n}, 'sum': x, 'count': n}
+    for sample, labels, value in metric_samples:
+        le = next((v for k, v in labels if k == 'le'), None)
+        base = tuple(label for label in labels if label[0] != 'le')
+        entry = series.setdefault(base, {'buckets': {}, 'sum': 0.0, 'count': 0.0})
+        if sample.endswith('_bucket'):
+            bound = float(le)
+            entry['buckets'][bound] = entry['buckets'].get(bound, 0.0) + value
+        elif sample.endswith('_sum'):
+            entry['sum'] += value
+        else:
+            entry['count'] += value
+
+    lines = []
+    for base in sorted(series):
+        entry = series[base]
+        cumulative = 0.0
+        for bound in (*metric.buckets, math.inf):
+            cumulative += entry['buckets'].get(bound, 0.0)
+            labels = _format_labels([*base, ('le', _format_float(bound))])
+            lines.append(f'{metric.name}_bucket{labels} {_format_float(cumulative)}')
+        lines.append(f'{metric.name}_sum{_format_labels(base)} {_format_float(entry["sum"])}')
+        lines.append(f'{metric.name}_count{_format_labels(base)} {_format_float(entry["count"])}')
+    return lines
+
+# ==============================================================================
+# APPLICATION METRICS
+# ==============================================================================
+
+HTTP_REQUESTS = Counter(
+    'http_requests', 'HTTP responses by route template, method and status code.')
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Request latency by route template and method.')
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds', 'Duration of individual SQL queries.',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+DB_QUERIES_PER_REQUEST = Histogram(
+    'db_queries_per_request', 'Number of SQL queries run by one request, by route template.',
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100))
+PASSWORD_HASH_DURATION = Histogram(
+    'password_hash_duration_seconds', 'Time spent computing one password hash (set or verify).')
+PASSWORD_REHASH = Counter(
+    'password_rehash', 'Stored hashes upgraded at login because their hasher or work factor is outdated.')
+LOGIN_DURATION = Histogram(
+    'auth_login_duration_seconds', 'Email/password check duration by outcome.')
+CACHE_REQUESTS = Counter(
+    'cache_requests', 'TwoTierCache lookups by cache namespace and result (local_hit, shared_hit, miss).')
+TOKEN_REFRESH = Counter(
+    'auth_token_refresh', 'Refresh token rotations by outcome.')
+TOKEN_BLACKLIST = Counter(
+    'auth_token_blacklist', 'Refresh tokens added to the blacklist (logout, rotation and bulk deactivation).')
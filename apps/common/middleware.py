@@ -0,0 +1,145 @@
+import json
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from apps.common import metrics, timing
+
+logger = logging.getLogger('apps.common.timing')
+
+
+class InstrumentationMiddleware(ABC):
+    """
+    Base for middleware that runs natively under both WSGI and ASGI, so the
+    async views never get pushed through a sync adapter thread.
+    Subclasses implement track() and finish().
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.track(request) as state:
+            start = time.perf_counter()
+            response = self.get_response(request)
+            duration = time.perf_counter() - start
+        return self.finish(request, response, state, duration)
+
+    async def __acall__(self, request):
+        with self.track(request) as state:
+            start = time.perf_counter()
+            response = await self.get_response(request)
+            duration = time.perf_counter() - start
+        return self.finish(request, response, state, duration)
+
+    @abstractmethod
+    def track(self, request):
+        """Context manager around the rest of the stack; yields the state passed to finish()."""
+
+    @abstractmethod
+    def finish(self, request, response, state, duration):
+        """Record the request (duration: seconds spent below this middleware); returns the response."""
+
+
+class RequestTimingMiddleware(InstrumentationMiddleware):
+    """
+    Records, for a sample of requests, SQL query count/time (and the slowest
+    query), view time, serializer time and password-hashing time.
+    Emits them as a Server-Timing header (visible in browser dev tools) and
+    as one structured JSON log line per request. The header carries only
+    durations and counts; the slowest query's SQL goes to the log line.
+
+    Settings: REQUEST_TIMING_ENABLED, REQUEST_TIMING_SAMPLE_RATE (0.0 - 1.0),
+    REQUEST_TIMING_HEADER, REQUEST_TIMING_LOG.
+    Keep it last in MIDDLEWARE so 'view' covers the view and little else.
+    """
+    @contextmanager
+    def track(self, request):
+        if not settings.REQUEST_TIMING_ENABLED or random.random() >= settings.REQUEST_TIMING_SAMPLE_RATE:
+            yield None
+            return
+        timings, token = timing.start()
+        try:
+            with timing.observe_queries(timings.record_query):
+                yield timings
+        finally:
+            timing.stop(token)
+
+    def finish(self, request, response, timings, view_time):
+        if timings is None:
+            return response
+        if settings.REQUEST_TIMING_HEADER:
+            response['Server-Timing'] = self.server_timing(timings, view_time)
+        if settings.REQUEST_TIMING_LOG:
+            logger.info(json.dumps(self.log_record(request, response, timings, view_time)))
+        return response
+
+    @staticmethod
+    def server_timing(timings, view_time):
+        metrics = [f'db;dur={timings.db_time * 1000:.1f};desc="{timings.db_queries} queries"']
+        sql, seconds = timings.slowest_query
+        if sql:
+            # SQL stays out of the response: it would expose the schema
+            metrics.append(f'db-slowest;dur={seconds * 1000:.1f}')
+        for section, seconds in timings.durations.items():
+            metrics.append(f'{section};dur={seconds * 1000:.1f}')
+        metrics.append(f'view;dur={view_time * 1000:.1f}')
+        return ', '.join(metrics)
+
+    @staticmethod
+    def log_record(request, response, timings, view_time):
+        sql, slowest = timings.slowest_query
+        record = {
+            'event': 'request_timing',
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'view_ms': round(view_time * 1000, 2),
+            'db_queries': timings.db_queries,
+            'db_ms': round(timings.db_time * 1000, 2),
+            'db_share': round(timings.db_time / view_time, 3) if view_time else 0,
+            'db_slowest_ms': round(slowest * 1000, 2),
+            'db_slowest_sql': ' '.join(sql.split())[:200],
+        }
+        for section, seconds in timings.durations.items():
+            record[f'{section}_ms'] = round(seconds * 1000, 2)
+        return record
+
+
+class MetricsMiddleware(InstrumentationMiddleware):
+    """
+    Feeds the /metrics endpoint: request count and latency per route template
+    (e.g. 'v1/users/<str:userId>', so ids don't explode the label set),
+    status codes, and per-query / per-request SQL histograms.
+    Keep it first in MIDDLEWARE so latency covers the whole stack.
+    """
+    @contextmanager
+    def track(self, request):
+        if not settings.METRICS_ENABLED:
+            yield None
+            return
+        queries = [0]
+        def observe_query(sql, seconds):
+            queries[0] += 1
+            metrics.DB_QUERY_DURATION.observe(seconds)
+        with timing.observe_queries(observe_query):
+            yield queries
+
+    def finish(self, request, response, queries, duration):
+        if queries is None:
+            return response
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match else 'unmatched'
+        metrics.HTTP_REQUESTS.inc(method=request.method, route=route, status=response.status_code)
+        metrics.HTTP_REQUEST_DURATION.observe(duration, method=request.method, route=route)
+        metrics.DB_QUERIES_PER_REQUEST.observe(queries[0], route=route)
+        return response
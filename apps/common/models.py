@@ -1,6 +1,17 @@
+from django.conf import settings
 from django.db import models
+from apps.common.utils import uuid7
 import uuid
 
+def generate_uuid():
+    """
+    Primary key default for UUIDModel.
+    UUID_PRIMARY_KEY_VERSION=7 opts into time-ordered ids; the default (4) is random.
+    """
+    if getattr(settings, 'UUID_PRIMARY_KEY_VERSION', 4) == 7:
+        return uuid7()
+    return uuid.uuid4()
+
 class TimeStampedModel(models.Model):
     """
     An abstract base class model that provides self-updating
@@ -17,7 +28,7 @@ class UUIDModel(TimeStampedModel):
     Abstract model that uses UUID as primary key instead of Integer.
     Matches the MongoDB _id string behavior better than auto-increment ints.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=generate_uuid, editable=False)
 
     class Meta:
         abstract = True
\ No newline at end of file
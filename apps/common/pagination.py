@@ -1,26 +1,305 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, InvalidPage, PageNotAnInteger, Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import datetime
+import hashlib
+import json
 import math
 
+COUNT_EXACT = 'exact'
+COUNT_CACHED = 'cached'
+COUNT_ESTIMATED = 'estimated'
+COUNT_NONE = 'none'
+
+
+class CountingPaginator(DjangoPaginator):
+    """
+    Django Paginator with a configurable strategy for `count`:
+    - exact:     SELECT COUNT(*) on every call (Django default).
+    - cached:    exact count stored in the cache for a TTL, keyed by the filtered SQL.
+    - estimated: planner statistics for unfiltered lists (pg_class.reltuples on
+                 Postgres, MAX(rowid) on SQLite); filtered lists fall back to cached.
+    - none:      no count at all; fetches limit + 1 rows to detect a next page.
+    `approximate` is set when the count did not come from a fresh COUNT(*).
+    """
+    def __init__(self, object_list, per_page, strategy=COUNT_EXACT, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.strategy = strategy
+        self.approximate = False
+        self.has_next_page = None
+
+    @cached_property
+    def count(self):
+        if self.strategy == COUNT_NONE:
+            return None
+        if self.strategy == COUNT_ESTIMATED:
+            estimate = self._estimated_count()
+            if estimate is not None:
+                self.approximate = True
+                return estimate
+            return self._cached_count()
+        if self.strategy == COUNT_CACHED:
+            return self._cached_count()
+        return super().count
+
+    @cached_property
+    def num_pages(self):
+        if self.count is None:
+            return None
+        return super().num_pages
+
+    def _cached_count(self):
+        queryset = self.object_list.order_by()
+        sql, params = queryset.query.sql_with_params()
+        digest = hashlib.sha1(f'{queryset.db}|{sql}|{params!r}'.encode('utf-8')).hexdigest()
+        key = f'pagination:count:{digest}'
+
+        total = cache.get(key)
+        if total is not None:
+            # Served from cache: may be up to TTL seconds stale
+            self.approximate = True
+            return total
+        total = queryset.count()
+        cache.set(key, total, settings.PAGINATION_COUNT_CACHE_TTL)
+        return total
+
+    def _estimated_count(self):
+        query = self.object_list.query
+        if query.where or query.distinct or query.low_mark or query.high_mark is not None:
+            return None
+
+        connection = connections[self.object_list.db]
+        table = self.object_list.model._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+            elif connection.vendor == 'sqlite':
+                cursor.execute(f'SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}')
+            else:
+                return None
+            row = cursor.fetchone()
+
+        estimate = row[0] if row else None
+        # Small tables are cheap to count and their statistics are least reliable
+        if estimate is None or estimate < settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD:
+            return None
+        return estimate
+
+    def validate_number(self, number):
+        if self.count is not None and not self.approximate:
+            return super().validate_number(number)
+        # Without an exact total only the lower bound can be enforced
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        if self.count is not None and not self.approximate:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        if self.count is None:
+            rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+            self.has_next_page = len(rows) > self.per_page
+            return self._get_page(rows[:self.per_page], number, self)
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class KeysetPaginator:
+    """
+    Keyset (cursor) pagination over the queryset's active ordering.
+    The first ordering field is the sort key and the primary key is appended
+    as a tiebreaker, so every page is a single indexed range scan:
+        WHERE (field, id) < (last_field, last_id) ORDER BY field DESC, id DESC LIMIT n
+    Unlike OFFSET, the cost does not grow with how deep the client pages.
+    """
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, queryset, limit):
+        self.queryset = queryset
+        self.limit = limit
+        self.model = queryset.model
+        self.pk_name = self.model._meta.pk.attname
+
+        ordering = list(queryset.query.order_by) or ['-pk']
+        first = ordering[0]
+        self.descending = first.startswith('-')
+        field_name = first.lstrip('-')
+        if field_name == 'pk':
+            field_name = self.pk_name
+        self.field = self.model._meta.get_field(field_name)
+
+    # --------------------------------------------------------------------------
+    # Cursor encoding: base64(JSON) of the boundary row + direction.
+    # --------------------------------------------------------------------------
+
+    def encode_cursor(self, row, reverse):
+        payload = {
+            'v': self._encode_value(self._get_value(row, self.field.attname)),
+            'k': str(self._get_value(row, self.pk_name)),
+            'r': reverse,
+        }
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, encoded):
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(urlsafe_b64decode(padded.encode('ascii')))
+            value = self.field.to_python(payload['v'])
+            key = self.model._meta.pk.to_python(payload['k'])
+            reverse = bool(payload['r'])
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return value, key, reverse
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        return str(value)
+
+    @staticmethod
+    def _get_value(row, attname):
+        # Rows may be model instances or dicts from .values()
+        if isinstance(row, dict):
+            return row[attname]
+        return getattr(row, attname)
+
+    # --------------------------------------------------------------------------
+    # Pagination
+    # --------------------------------------------------------------------------
+
+    def paginate(self, encoded_cursor):
+        field = self.field.attname
+        reverse = False
+        queryset = self.queryset
+
+        if encoded_cursor:
+            value, key, reverse = self.decode_cursor(encoded_cursor)
+            # Walking backwards flips the comparison and the ordering.
+            lookup = 'lt' if self.descending != reverse else 'gt'
+            if field == self.pk_name:
+                queryset = queryset.filter(**{f'{field}__{lookup}': key})
+            else:
+                queryset = queryset.filter(
+                    Q(**{f'{field}__{lookup}': value}) |
+                    Q(**{field: value, f'{self.pk_name}__{lookup}': key})
+                )
+
+        descending = self.descending != reverse
+        prefix = '-' if descending else ''
+        ordering = [f'{prefix}{field}']
+        if field != self.pk_name:
+            ordering.append(f'{prefix}{self.pk_name}')
+
+        rows = list(queryset.order_by(*ordering)[:self.limit + 1])
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if reverse:
+            rows.reverse()
+
+        self.next_cursor = None
+        self.previous_cursor = None
+        if rows:
+            # Going forward, a previous page exists iff we came from a cursor;
+            # going backward, a next page always exists (we came from it).
+            if (has_more and not reverse) or (reverse and encoded_cursor):
+                self.next_cursor = self.encode_cursor(rows[-1], reverse=False)
+            if (has_more and reverse) or (not reverse and encoded_cursor):
+                self.previous_cursor = self.encode_cursor(rows[0], reverse=True)
+        return rows
+
+
 class CustomPageNumberPagination(PageNumberPagination):
     """
     Custom pagination to match the Regular boilerplate response format.
     Query params: ?page=1&limit=10
+    Opt-in keyset mode: ?cursor=&limit=10 (then follow 'next' / 'previous').
+    Skip the total count: ?count=false
     """
     page_size_query_param = 'limit'  # Allow client to set limit via ?limit=
     max_page_size = 100
-    
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    keyset = None
+
+    def get_count_strategy(self, request):
+        if request.query_params.get(self.count_query_param, '').lower() in ('false', '0'):
+            return COUNT_NONE
+        return settings.PAGINATION_COUNT_STRATEGY
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+
+        # Presence of ?cursor (even empty, for the first page) selects keyset mode
+        if self.cursor_query_param in request.query_params:
+            self.keyset = KeysetPaginator(queryset, self.get_page_size(request))
+            return self.keyset.paginate(request.query_params.get(self.cursor_query_param))
+
+        self.keyset = None
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = CountingPaginator(queryset, page_size, strategy=self.get_count_strategy(request))
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+        return list(self.page)
+
     def get_paginated_response(self, data):
-        # Calculate total pages
-        total_results = self.page.paginator.count
+        if self.keyset is not None:
+            return Response({
+                'results': data,
+                'limit': self.keyset.limit,
+                'next': self.keyset.next_cursor,
+                'previous': self.keyset.previous_cursor,
+            })
+
+        paginator = self.page.paginator
         limit = self.get_page_size(self.request)
-        total_pages = math.ceil(total_results / limit) if limit else 1
         current_page = self.page.number
 
-        return Response({
+        if paginator.count is None:
+            # ?count=false: no totals, only whether another page follows
+            return Response({
+                'results': data,
+                'page': current_page,
+                'limit': limit,
+                'totalPages': None,
+                'totalResults': None,
+                'hasNextPage': paginator.has_next_page,
+            })
+
+        # Calculate total pages
+        total_results = paginator.count
+        total_pages = math.ceil(total_results / limit) if limit else 1
+
+        body = {
             'results': data,
             'page': current_page,
             'limit': limit,
             'totalPages': total_pages,
             'totalResults': total_results
-        })
\ No newline at end of file
+        }
+        if paginator.approximate:
+            body['approximate'] = True
+        return Response(body)
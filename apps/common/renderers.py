@@ -0,0 +1,63 @@
+"""
+JSON renderer / parser pair backed by orjson when it is installed, with
+DRF's stdlib implementation as the fallback. Output is the same bytes DRF's
+JSONRenderer produces with the default COMPACT_JSON / UNICODE_JSON settings:
+UUIDs as their hyphenated string, datetimes in ISO 8601 with 'Z' for UTC
+(the `expires` values of the auth tokens), no whitespace, non-ASCII as
+UTF-8 and U+2028 / U+2029 escaped.
+
+orjson serializes UUID, datetime, dict and list (and their subclasses:
+ReturnDict, ErrorDetail, ...) natively; anything else goes through DRF's
+JSONEncoder.default. Indented output (browsable API) and whatever orjson
+rejects (integers beyond 64 bits, ...) go through the stdlib path, so errors
+match DRF's. Two known differences, irrelevant to this API's payloads:
+orjson renders NaN / Infinity as null where STRICT_JSON raises, and parses
+integer literals beyond 64 bits as floats.
+"""
+import io
+from django.conf import settings
+from rest_framework import parsers, renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # optional: `pip install orjson`
+    orjson = None
+
+# Types orjson has no native support for (Decimal, lazy strings, querysets, ...)
+_default = encoders.JSONEncoder().default
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            # Browsable API / '; indent=N': rare, leave it to the stdlib
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same strict-javascript-subset escaping as DRF
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(parsers.JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Invalid for orjson: let the stdlib decide, with DRF's error message
+            return super().parse(io.BytesIO(body), media_type, parser_context)
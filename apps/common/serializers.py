@@ -0,0 +1,21 @@
+from rest_framework import serializers
+from apps.common import timing
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """ListSerializer whose .data is reported as 'serializer' time."""
+    @property
+    def data(self):
+        with timing.measure('serializer'):
+            return super().data
+
+
+class TimedSerializerMixin:
+    """
+    Reports serializer time to the request timing middleware.
+    Also set Meta.list_serializer_class = TimedListSerializer for many=True.
+    """
+    @property
+    def data(self):
+        with timing.measure('serializer'):
+            return super().data
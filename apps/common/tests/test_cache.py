@@ -0,0 +1,36 @@
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from apps.common.cache import TwoTierCache
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-two-tier'}}
+
+
+@override_settings(CACHES=LOCMEM)
+class NamespaceVersionTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.cache = TwoTierCache('test', timeout=60)
+
+    def test_bump_hides_every_entry(self):
+        self.cache.set('a', 1)
+        self.cache.bump_version()
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_evicted_version_does_not_revive_old_entries(self):
+        # Entries stored under the first version, then the version moves on
+        self.cache.set('a', 'v1 value')
+        first = self.cache.version()
+        self.cache.bump_version()
+        self.cache.bump_version()
+
+        # The version key is evicted: the re-seeded version must not be the first one
+        caches['default'].delete(self.cache._version_key)
+        self.cache.local.clear()
+        self.assertNotEqual(self.cache.version(), first)
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_bump_after_eviction(self):
+        self.cache.set('a', 1)
+        caches['default'].delete(self.cache._version_key)
+        self.cache.bump_version()
+        self.assertIsNone(self.cache.get('a'))
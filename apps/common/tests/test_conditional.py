@@ -0,0 +1,44 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from apps.common import conditional
+
+
+class NotModifiedTests(SimpleTestCase):
+    etag = conditional.compute_etag('user-id', '2026-01-01T00:00:00+00:00')
+
+    def get(self, **headers):
+        return RequestFactory().get('/v1/users/user-id', headers=headers)
+
+    def test_no_precondition(self):
+        self.assertIsNone(conditional.not_modified(self.get(), self.etag))
+
+    def test_matching_if_none_match_is_304(self):
+        response = conditional.not_modified(self.get(if_none_match=self.etag), self.etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_any_listed_or_wildcard_etag_matches(self):
+        for header in (f'"other", {self.etag}', f'W/{self.etag}', '*'):
+            with self.subTest(header=header):
+                response = conditional.not_modified(self.get(if_none_match=header), self.etag)
+                self.assertEqual(response.status_code, 304)
+
+    def test_changed_resource_is_served(self):
+        stale = conditional.compute_etag('user-id', '2025-12-31T00:00:00+00:00')
+        self.assertIsNone(conditional.not_modified(self.get(if_none_match=stale), self.etag))
+
+    def test_failed_if_match_is_412(self):
+        request = RequestFactory().patch('/v1/users/user-id', headers={'if_match': '"other"'})
+        self.assertEqual(conditional.not_modified(request, self.etag).status_code, 412)
+
+    def test_etag_depends_on_every_part(self):
+        self.assertNotEqual(
+            conditional.compute_etag('user-id', 'ts', ['name']), conditional.compute_etag('user-id', 'ts', None)
+        )
+
+    def test_set_etag(self):
+        response = conditional.set_etag(HttpResponse(), self.etag)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertIn('private', response['Cache-Control'])
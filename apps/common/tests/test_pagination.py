@@ -0,0 +1,78 @@
+import json
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from apps.common.pagination import KeysetPaginator
+from apps.users.models import User
+
+
+def make_cursor(payload):
+    raw = json.dumps(payload).encode('utf-8')
+    return urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+class KeysetCursorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.users = []
+        for i in range(5):
+            user = User.objects.create_user(f'keyset{i}@example.com', 'Str0ng-Pass!9', name=f'Keyset {i}')
+            cls.users.append(user)
+        # Two rows share a created_at: the id tiebreaker must order them
+        for i, user in enumerate(cls.users):
+            User.objects.filter(pk=user.pk).update(created_at=now - timedelta(minutes=min(i, 3)))
+
+    def paginator(self, limit=2):
+        return KeysetPaginator(User.objects.order_by('-created_at', '-id'), limit)
+
+    def test_cursor_round_trip(self):
+        paginator = self.paginator()
+        user = User.objects.get(pk=self.users[1].pk)
+        value, key, reverse = paginator.decode_cursor(paginator.encode_cursor(user, reverse=True))
+        self.assertEqual(value, user.created_at)
+        self.assertEqual(key, user.pk)
+        self.assertIs(reverse, True)
+
+    def test_cursor_from_values_row(self):
+        paginator = self.paginator()
+        row = User.objects.filter(pk=self.users[2].pk).values('id', 'created_at').get()
+        value, key, reverse = paginator.decode_cursor(paginator.encode_cursor(row, reverse=False))
+        self.assertEqual((value, key, reverse), (row['created_at'], row['id'], False))
+
+    def test_invalid_cursors_are_not_found(self):
+        paginator = self.paginator()
+        valid = {'v': timezone.now().isoformat(), 'k': str(self.users[0].pk), 'r': False}
+        cursors = [
+            'not base64 !',
+            make_cursor(['a', 'list']),
+            make_cursor({'v': valid['v'], 'r': False}),              # no key
+            make_cursor({**valid, 'k': 'not-a-uuid'}),
+            make_cursor({**valid, 'v': 'not-a-datetime'}),
+            urlsafe_b64encode(b'\xff\xfe').decode('ascii'),           # not UTF-8 JSON
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                with self.assertRaisesMessage(NotFound, KeysetPaginator.invalid_cursor_message):
+                    paginator.decode_cursor(cursor)
+
+    def test_pages_forward_and_back(self):
+        expected = list(User.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+
+        seen, cursor, pages = [], '', []
+        while True:
+            paginator = self.paginator()
+            rows = paginator.paginate(cursor)
+            pages.append((cursor, [row.pk for row in rows]))
+            seen += [row.pk for row in rows]
+            if paginator.next_cursor is None:
+                break
+            cursor = paginator.next_cursor
+        self.assertEqual(seen, expected)
+
+        # previous from the last page returns the page before it
+        paginator = self.paginator()
+        paginator.paginate(pages[-1][0])
+        self.assertEqual([row.pk for row in self.paginator().paginate(paginator.previous_cursor)], pages[-2][1])
@@ -0,0 +1,81 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import mock
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from apps.common import renderers
+from apps.common.renderers import FastJSONParser, FastJSONRenderer
+
+PAYLOAD = {
+    'id': uuid.UUID('5ebac534-954b-4546-a0e3-7f6a1e5a4b3c'),
+    'expires': datetime.datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+    'local': datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+    'naive': datetime.datetime(2026, 1, 2, 3, 4, 5),
+    'day': datetime.date(2026, 1, 2),
+    'price': Decimal('10.50'),
+    'message': _('Not found.'),
+    'name': 'Zoë \u2028\u2029 "quoted"',
+    'nested': [{'flag': True, 'empty': None}, 1, 2.5],
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Same bytes as DRF's JSONRenderer, with or without orjson."""
+    def assert_same(self, data, **attrs):
+        fast = type('Fast', (FastJSONRenderer,), attrs)()
+        stock = type('Stock', (JSONRenderer,), attrs)()
+        self.assertEqual(fast.render(data), stock.render(data))
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(fast.render(data), stock.render(data))
+
+    def test_default_settings(self):
+        self.assert_same(PAYLOAD)
+
+    def test_ensure_ascii(self):
+        # UNICODE_JSON = False
+        self.assert_same(PAYLOAD, ensure_ascii=True)
+
+    def test_not_compact(self):
+        # COMPACT_JSON = False
+        self.assert_same(PAYLOAD, compact=False)
+
+    def test_indent(self):
+        renderer_context = {'indent': 2}
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD, renderer_context=renderer_context),
+            JSONRenderer().render(PAYLOAD, renderer_context=renderer_context),
+        )
+
+    def test_beyond_orjson(self):
+        # Integers over 64 bits: orjson refuses, the stdlib path renders them
+        self.assert_same({'big': 2 ** 70})
+
+    def test_none(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser.parse(io.BytesIO(body), parser_context={'encoding': encoding})
+
+    def test_same_data(self):
+        body = JSONRenderer().render(PAYLOAD)
+        self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_other_encoding(self):
+        body = '{"name": "Zoë"}'.encode('latin-1')
+        self.assertEqual(self.parse(FastJSONParser(), body, 'latin-1'), {'name': 'Zoë'})
+
+    def test_invalid_json_same_error(self):
+        for body in (b'{"a": ', b'{"a": NaN}', b''):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as stock:
+                    self.parse(JSONParser(), body)
+                with self.assertRaises(ParseError) as fast:
+                    self.parse(FastJSONParser(), body)
+                self.assertEqual(str(fast.exception.detail), str(stock.exception.detail))
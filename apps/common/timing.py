@@ -0,0 +1,86 @@
+"""
+Per-request timing collector used by RequestTimingMiddleware.
+Code measures a section with `with timing.measure('serializer'): ...`;
+outside a sampled request this is a no-op costing one ContextVar lookup.
+
+SQL is observed by a wrapper installed on every DB connection (see
+CommonConfig.ready) that reports to the callbacks registered with
+`observe_queries()`. Being ContextVar based, it also sees queries that
+async views run in sync_to_async threads, which have their own connections.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('request_timings', default=None)
+_query_observers = ContextVar('query_observers', default=())
+
+
+class RequestTimings:
+    def __init__(self):
+        self.durations = {}  # section -> seconds
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.slowest_query = ('', 0.0)
+
+    def add(self, section, seconds):
+        self.durations[section] = self.durations.get(section, 0.0) + seconds
+
+    def record_query(self, sql, seconds):
+        self.db_queries += 1
+        self.db_time += seconds
+        if seconds > self.slowest_query[1]:
+            self.slowest_query = (sql, seconds)
+
+
+def start():
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+def stop(token):
+    _current.reset(token)
+
+def current():
+    return _current.get()
+
+@contextmanager
+def measure(section):
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(section, time.perf_counter() - start_time)
+
+# ==============================================================================
+# SQL OBSERVATION
+# ==============================================================================
+
+@contextmanager
+def observe_queries(callback):
+    """Call callback(sql, seconds) for every query run inside the block."""
+    token = _query_observers.set(_query_observers.get() + (callback,))
+    try:
+        yield
+    finally:
+        _query_observers.reset(token)
+
+def _query_wrapper(execute, sql, params, many, context):
+    observers = _query_observers.get()
+    if not observers:
+        return execute(sql, params, many, context)
+    start_time = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        seconds = time.perf_counter() - start_time
+        for callback in observers:
+            callback(sql, seconds)
+
+def install_query_wrapper(sender=None, connection=None, **kwargs):
+    """connection_created receiver; idempotent across reconnects."""
+    if _query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_wrapper)
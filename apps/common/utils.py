@@ -1,3 +1,40 @@
+import secrets
+import threading
+import time
+import uuid
+
 # Helper to pick fields from a dictionary (similar to lodash.pick or utils/pick.js)
 def pick(dictionary, keys):
-    return {k: v for k, v in dictionary.items() if k in keys}
\ No newline at end of file
+    return {k: v for k, v in dictionary.items() if k in keys}
+
+# Time-ordered UUID (RFC 9562 version 7): 48-bit unix-ms timestamp + random bits.
+# New ids land at the right-hand edge of the primary-key B-tree instead of a
+# random leaf, so bulk inserts don't split pages all over the index.
+_uuid7_lock = threading.Lock()
+_uuid7_last = [0, 0]  # [timestamp_ms, 12-bit sequence]
+
+def uuid7():
+    """
+    Generate a UUIDv7. Monotonic within the process: ids created in the same
+    millisecond use an incrementing 12-bit counter in place of rand_a.
+    """
+    with _uuid7_lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        last_ms, sequence = _uuid7_last
+        if timestamp_ms <= last_ms:
+            timestamp_ms = last_ms
+            sequence += 1
+            if sequence > 0xFFF:
+                # Counter exhausted: borrow the next millisecond
+                timestamp_ms += 1
+                sequence = secrets.randbits(11)
+        else:
+            sequence = secrets.randbits(11)
+        _uuid7_last[0], _uuid7_last[1] = timestamp_ms, sequence
+
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76                      # version
+    value |= sequence << 64                 # rand_a (used as counter)
+    value |= 0b10 << 62                     # variant
+    value |= secrets.randbits(62)           # rand_b
+    return uuid.UUID(int=value)
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from apps.common import metrics
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint: totals of every worker process.
+    Requires 'Authorization: Bearer <METRICS_AUTH_TOKEN>'; only mounted
+    without a token when DEBUG is on (config/urls.py).
+    """
+    token = settings.METRICS_AUTH_TOKEN
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
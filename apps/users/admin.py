@@ -1,5 +1,5 @@
 from django.contrib import admin
-from apps.users.models import User, Token
+from apps.users.models import User, Token, EmailOutbox
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
@@ -12,4 +12,10 @@ class UserAdmin(admin.ModelAdmin):
 class TokenAdmin(admin.ModelAdmin):
     list_display = ('user', 'type', 'expires', 'blacklisted', 'created_at')
     search_fields = ('user__email', 'token')
-    list_filter = ('type', 'blacklisted')
\ No newline at end of file
+    list_filter = ('type', 'blacklisted')
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('to_email', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    search_fields = ('to_email',)
+    list_filter = ('status',)
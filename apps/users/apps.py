@@ -3,4 +3,12 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
-    verbose_name = 'Users & Authentication'
\ No newline at end of file
+    verbose_name = 'Users & Authentication'
+
+    def ready(self):
+        # Connect signal receivers (principal cache invalidation)
+        from apps.users import signals
+        # System checks (search index triggers, token purge index)
+        from apps.users import checks
+        # OpenAPI security scheme of CachedJWTAuthentication
+        from apps.users import schema
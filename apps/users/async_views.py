@@ -0,0 +1,264 @@
+"""
+Async counterparts of apps/users/views.py, served when ASYNC_VIEWS=True
+(see apps/users/async_urls.py). Same routes, payloads and responses.
+
+Queries use the async ORM; what has no async form yet runs in a worker
+thread via sync_to_async: DRF serializer validation that queries (unique
+email), transaction.atomic() blocks, password hashing, the paginator and
+filter_queryset() (the search backend probes the database on first use).
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
+
+from apps.common import conditional
+from apps.common.async_views import AsyncAPIView
+from apps.users import bulk, export, lookup, serializers, services
+from apps.users.cache import aget_user
+from apps.users.models import User, Token
+from apps.users.permissions import IsAdmin, IsUserOrAdmin
+from apps.users.views import UserBulkMixin, UserFilterMixin, user_etag, user_page_etag
+
+# ==============================================================================
+# AUTH CONTROLLERS
+# ==============================================================================
+
+class RegisterView(AsyncAPIView):
+    async def post(self, request):
+        serializer = serializers.RegisterSerializer(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        user = await User.objects.acreate_user(**serializer.validated_data)
+
+        tokens = await services.agenerate_auth_tokens(user)
+        user_data = serializers.UserSerializer(user).data
+        return self.respond({'user': user_data, 'tokens': tokens}, status=status.HTTP_201_CREATED)
+
+class LoginView(AsyncAPIView):
+    async def post(self, request):
+        serializer = serializers.LoginSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        email = serializer.validated_data['email']
+        password = serializer.validated_data['password']
+
+        user = await services.alogin_user_with_email_and_password(email, password)
+        tokens = await services.agenerate_auth_tokens(user)
+        user_data = serializers.UserSerializer(user).data
+        return self.respond({'user': user_data, 'tokens': tokens})
+
+class LogoutView(AsyncAPIView):
+    async def post(self, request):
+        serializer = serializers.LogoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        await services.alogout_user(serializer.validated_data['refresh_token'])
+        return self.respond(status=status.HTTP_204_NO_CONTENT)
+
+class RefreshTokensView(AsyncAPIView):
+    async def post(self, request):
+        serializer = serializers.RefreshTokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        tokens = await services.arefresh_auth(serializer.validated_data['refresh_token'])
+        return self.respond(tokens)
+
+class ForgotPasswordView(AsyncAPIView):
+    async def post(self, request):
+        serializer = serializers.ForgotPasswordSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        email = serializer.validated_data['email']
+        try:
+            user = await User.objects.aget(email=email)
+        except User.DoesNotExist:
+            return self.respond({'code': 404, 'message': 'No users found with this email'}, status=status.HTTP_404_NOT_FOUND)
+
+        await sync_to_async(self.send_reset_email)(user, email)
+        return self.respond(status=status.HTTP_204_NO_CONTENT)
+
+    @staticmethod
+    def send_reset_email(user, email):
+        # Token row and outbox row commit (or roll back) together
+        with transaction.atomic():
+            token = services.generate_opaque_token(user, Token.TYPE_RESET_PASSWORD, settings.JWT_RESET_PASSWORD_EXPIRATION_MINUTES)
+            services.send_reset_password_email(email, token)
+
+class ResetPasswordView(AsyncAPIView):
+    async def post(self, request):
+        token = request.query_params.get('token')
+        if not token:
+            return self.respond({'code': 400, 'message': 'Token required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = serializers.ResetPasswordSerializer(data={'password': request.data.get('password'), 'token': token})
+        serializer.is_valid(raise_exception=True)
+
+        await sync_to_async(services.reset_password)(token, serializer.validated_data['password'])
+        return self.respond(status=status.HTTP_204_NO_CONTENT)
+
+class SendVerificationEmailView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+
+    async def post(self, request):
+        await sync_to_async(self.send_verification_email)(request.user)
+        return self.respond(status=status.HTTP_204_NO_CONTENT)
+
+    @staticmethod
+    def send_verification_email(user):
+        with transaction.atomic():
+            token = services.generate_opaque_token(user, Token.TYPE_VERIFY_EMAIL, settings.JWT_VERIFY_EMAIL_EXPIRATION_MINUTES)
+            services.send_verification_email(user.email, token)
+
+class VerifyEmailView(AsyncAPIView):
+    async def post(self, request):
+        token = request.query_params.get('token')
+        if not token:
+            return self.respond({'code': 400, 'message': 'Token required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        await sync_to_async(services.verify_email)(token)
+        return self.respond(status=status.HTTP_204_NO_CONTENT)
+
+
+# ==============================================================================
+# USER CONTROLLERS
+# ==============================================================================
+
+class UserListCreateView(UserFilterMixin, AsyncAPIView):
+    """
+    Handles GET /users and POST /users (admin only)
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    async def get(self, request):
+        fields = serializers.requested_user_fields(request)
+        if 'ids' in request.query_params:
+            ids = lookup.parse_ids(request.query_params['ids'])
+            return self.respond(await lookup.alookup_users(request.user, ids, fields))
+
+        queryset = serializers.user_values(await sync_to_async(self.filter_queryset)(User.objects.all()), fields)
+        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        # The paginator (count strategies, keyset cursors) is sync code
+        page = await sync_to_async(paginator.paginate_queryset)(queryset, request, view=self)
+
+        body = paginator.get_paginated_response([]).data
+        etag = user_page_etag(page, {key: value for key, value in body.items() if key != 'results'}, fields)
+        unchanged = conditional.not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        body['results'] = serializers.serialize_user_values(page, fields)
+        return conditional.set_etag(self.respond(body), etag)
+
+    async def post(self, request):
+        serializer = serializers.CreateUserSerializer(data=request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        user = await User.objects.acreate_user(**serializer.validated_data)
+        return self.respond(serializers.UserSerializer(user).data, status=status.HTTP_201_CREATED)
+
+
+class UserExportView(UserFilterMixin, AsyncAPIView):
+    """
+    Handles GET /users/export?format=ndjson|csv (admin only)
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    async def get(self, request):
+        export_format = export.get_export_format(request)
+        fields = serializers.requested_user_fields(request)
+        queryset = serializers.user_values(await sync_to_async(self.filter_queryset)(User.objects.all()), fields)
+        encoder = export.ChunkEncoder(export_format, fields)
+        return export.export_response(export.astream_users(queryset, encoder), export_format)
+
+
+class UserLookupView(AsyncAPIView):
+    """
+    Handles POST /users/lookup
+    """
+    permission_classes = [IsAuthenticated]
+
+    async def post(self, request):
+        fields = serializers.requested_user_fields(request)
+        serializer = serializers.UserLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self.respond(await lookup.alookup_users(request.user, serializer.validated_data['ids'], fields))
+
+
+class UserBulkView(UserBulkMixin, AsyncAPIView):
+    """
+    Handles POST, PATCH, DELETE /users/bulk (admin only)
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    async def post(self, request):
+        # Validation, hashing and the inserts are one sync unit of work
+        results = await sync_to_async(bulk.create_users)(request.data)
+        body, status_code = bulk.bulk_response_body(results)
+        return self.respond(body, status=status_code)
+
+    async def patch(self, request):
+        serializer = serializers.BulkUpdateUserSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = await sync_to_async(self.get_selected_users)(serializer.validated_data)
+        updated = await sync_to_async(bulk.update_users)(queryset, serializer.validated_data['data'])
+        return self.respond({'updated': updated})
+
+    async def delete(self, request):
+        serializer = serializers.BulkSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = await sync_to_async(self.get_selected_users)(serializer.validated_data)
+        return self.respond({'deleted': await sync_to_async(bulk.delete_users)(queryset)})
+
+
+class UserDetailView(AsyncAPIView):
+    """
+    Handles GET, PATCH, DELETE /users/:userId
+    """
+    def get_permissions(self):
+        # DELETE -> Admin only; GET / PATCH -> the user themselves or an admin
+        if self.request.method == 'DELETE':
+            return [IsAuthenticated(), IsAdmin()]
+        return [IsAuthenticated(), IsUserOrAdmin()]
+
+    async def get_object(self, request, user_id):
+        # Same messages as DRF's get_object()
+        try:
+            user = await User.objects.aget(pk=user_id)
+        except User.DoesNotExist:
+            raise NotFound('No User matches the given query.')
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound()
+        self.check_object_permissions(request, user)
+        return user
+
+    async def get(self, request, userId):
+        fields = serializers.requested_user_fields(request)
+        try:
+            user = await aget_user(userId)
+        except ValueError:
+            raise NotFound()
+        if user is None:
+            raise NotFound('No User matches the given query.')
+        self.check_object_permissions(request, user)
+
+        etag = user_etag(user, fields)
+        unchanged = conditional.not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        return conditional.set_etag(self.respond(serializers.UserSerializer(user, fields=fields).data), etag)
+
+    async def patch(self, request, userId):
+        user = await self.get_object(request, userId)
+        serializer = serializers.UpdateUserSerializer(user, data=request.data, partial=True)
+
+        def validate_and_save():
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        await sync_to_async(validate_and_save)()
+
+        return conditional.set_etag(self.respond(serializers.UserSerializer(user).data), user_etag(user))
+
+    async def delete(self, request, userId):
+        user = await self.get_object(request, userId)
+        await user.adelete()
+        return self.respond(status=status.HTTP_204_NO_CONTENT)
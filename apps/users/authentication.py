@@ -0,0 +1,151 @@
+import uuid
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from apps.common.cache import new_version
+from apps.users.cache import user_from_values
+from apps.users.models import User
+
+# Fields needed by permissions (IsAdmin / IsUserOrAdmin) and the views.
+# Anything else is deferred and loads from the DB on first access.
+PRINCIPAL_FIELDS = ('id', 'email', 'name', 'role', 'is_active', 'is_email_verified')
+
+def principal_cache_key(user_id):
+    return f'users:principal:{uuid.UUID(str(user_id)).hex}'
+
+def principal_version_key(user_id):
+    return f'users:principal-version:{uuid.UUID(str(user_id)).hex}'
+
+def _version_timeout():
+    # Outlives the entries it guards; an evicted version just means a miss
+    return settings.AUTH_PRINCIPAL_CACHE_TTL * 10
+
+def invalidate_principal(user_id):
+    invalidate_principals([user_id])
+
+def invalidate_principals(user_ids):
+    """
+    Give these users a new principal version once the current transaction
+    commits (right away outside one). Entries stored under the old version
+    stop matching, including one a reader that loaded the row before the
+    commit writes back afterwards; deleting the entry wouldn't stop that.
+    """
+    keys = [principal_version_key(user_id) for user_id in user_ids]
+    transaction.on_commit(
+        lambda: cache.set_many({key: new_version() for key in keys}, _version_timeout())
+    )
+
+def get_principal(user_id):
+    """
+    Return the User for a token's user id, served from the shared cache.
+    Only a miss queries the DB (one indexed SELECT of PRINCIPAL_FIELDS).
+    Returns None if the user no longer exists.
+
+    Entries are (version, values) and only served while the user's version
+    key still holds that version (see invalidate_principals()).
+    """
+    key, version_key = principal_cache_key(user_id), principal_version_key(user_id)
+    cached = cache.get_many([key, version_key])
+    version = cached.get(version_key)
+    if version is None:
+        cache.add(version_key, new_version(), _version_timeout())
+        version = cache.get(version_key)
+
+    entry = cached.get(key)
+    if entry is not None and version is not None and entry[0] == version:
+        return user_from_values(entry[1])
+
+    # The version was read before the row: if a write commits in between,
+    # the entry is stored under the version it has already replaced
+    values = User.objects.filter(pk=user_id).values(*PRINCIPAL_FIELDS).first()
+    if values is None:
+        return None
+    if version is not None:
+        cache.set(key, (version, values), settings.AUTH_PRINCIPAL_CACHE_TTL)
+    return user_from_values(values)
+
+async def aget_principal(user_id):
+    """Async get_principal() (async cache and ORM APIs)."""
+    key, version_key = principal_cache_key(user_id), principal_version_key(user_id)
+    cached = await cache.aget_many([key, version_key])
+    version = cached.get(version_key)
+    if version is None:
+        await cache.aadd(version_key, new_version(), _version_timeout())
+        version = await cache.aget(version_key)
+
+    entry = cached.get(key)
+    if entry is not None and version is not None and entry[0] == version:
+        return user_from_values(entry[1])
+
+    values = await User.objects.filter(pk=user_id).values(*PRINCIPAL_FIELDS).afirst()
+    if values is None:
+        return None
+    if version is not None:
+        await cache.aset(key, (version, values), settings.AUTH_PRINCIPAL_CACHE_TTL)
+    return user_from_values(values)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves request.user from the principal cache
+    instead of running SELECT ... FROM users_user on every request.
+    Entries are invalidated whenever the user is saved or deleted
+    (apps.users.signals), so role changes, deactivation and deletion take
+    effect on the next request. The default cache must be shared by every
+    worker process for that (see CACHES in config/settings.py).
+    """
+    def get_user(self, validated_token):
+        try:
+            user = get_principal(self._user_id(validated_token))
+        except ValueError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        self.check_user(user)
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Password is not cached; this path costs a query per request.
+            return super().get_user(validated_token)
+
+        return user
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for the async views (apps.common.async_views): token
+        checks are CPU only, the principal comes from the async cache/ORM.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        try:
+            user = await aget_principal(self._user_id(validated_token))
+        except ValueError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        self.check_user(user)
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            user = await sync_to_async(super().get_user)(validated_token)
+        return user, validated_token
+
+    @staticmethod
+    def _user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    @staticmethod
+    def check_user(user):
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
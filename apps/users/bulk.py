@@ -0,0 +1,157 @@
+"""
+Bulk user writes (POST / PATCH / DELETE /v1/users/bulk).
+
+POST /users/bulk
+
+Every item is validated on its own and gets its own result, so one bad row
+doesn't sink the batch:
+
+- CreateUserSerializer rules per item, minus the unique-email query: the
+  emails of the whole batch are checked with one IN query, repeats within
+  the batch are rejected too
+- passwords are hashed in parallel on the hashing pool (hashing.make_passwords)
+- rows are written with bulk_create in batches of USER_BULK_BATCH_SIZE
+
+A request carries at most USER_BULK_MAX_ITEMS items.
+
+PATCH / DELETE /users/bulk
+Set-based: the selected users (ids or the GET /users filters) are walked in
+chunks of USER_BULK_BATCH_SIZE primary keys, and each chunk is one UPDATE
+(or one DELETE plus its cascades) in its own transaction. QuerySet.update()
+sends no post_save, so principals, the user cache and, on deactivation,
+refresh tokens are invalidated here.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from apps.common import hashing
+from apps.users import services
+from apps.users.authentication import invalidate_principals
+from apps.users.cache import user_cache
+from apps.users.models import User
+from apps.users.serializers import BulkCreateUserSerializer, UserSerializer
+
+
+def _unique_email_message():
+    # Same wording as the UniqueValidator of POST /users
+    field = User._meta.get_field('email')
+    return field.error_messages['unique'] % {
+        'model_name': User._meta.verbose_name, 'field_label': field.verbose_name,
+    }
+
+
+def _failure(index, errors):
+    # Same "field: first error" message as apps.common.exceptions.api_exception_handler
+    message = ", ".join(f"{k}: {v[0] if isinstance(v, list) else v}" for k, v in errors.items())
+    return {'index': index, 'code': status.HTTP_400_BAD_REQUEST, 'message': message}
+
+
+def get_items(data):
+    if not isinstance(data, list):
+        raise ValidationError('Expected a list of users.')
+    if not data:
+        raise ValidationError('The list of users is empty.')
+    if len(data) > settings.USER_BULK_MAX_ITEMS:
+        raise ValidationError(f'At most {settings.USER_BULK_MAX_ITEMS} users per request.')
+    return data
+
+
+def create_users(data):
+    """
+    Create the users of a POST /users/bulk payload. Returns one result per
+    item, in input order: {index, code: 201, user} or {index, code: 400, message}.
+    """
+    items = get_items(data)
+    results = [None] * len(items)
+
+    valid = []
+    for index, item in enumerate(items):
+        serializer = BulkCreateUserSerializer(data=item)
+        if serializer.is_valid():
+            values = dict(serializer.validated_data)
+            values['email'] = User.objects.normalize_email(values['email'])
+            valid.append((index, values))
+        else:
+            results[index] = _failure(index, serializer.errors)
+
+    # Unique emails: one query for the batch, then repeats within it
+    taken = set(
+        User.objects.filter(email__in=[values['email'] for _, values in valid]).values_list('email', flat=True)
+    )
+    accepted = []
+    for index, values in valid:
+        if values['email'] in taken:
+            results[index] = _failure(index, {'email': [_unique_email_message()]})
+        else:
+            taken.add(values['email'])
+            accepted.append((index, values))
+    if not accepted:
+        return results
+
+    passwords = hashing.make_passwords([values.pop('password') for _, values in accepted])
+    users = [User(password=password, **values) for (_, values), password in zip(accepted, passwords)]
+    with transaction.atomic():
+        # ignore_conflicts: an email inserted by someone else since the check
+        # above skips that row instead of failing the batch
+        User.objects.bulk_create(users, batch_size=settings.USER_BULK_BATCH_SIZE, ignore_conflicts=True)
+    inserted = set(User.objects.filter(pk__in=[user.pk for user in users]).values_list('pk', flat=True))
+
+    for (index, _), user in zip(accepted, users):
+        if user.pk in inserted:
+            results[index] = {'index': index, 'code': status.HTTP_201_CREATED, 'user': UserSerializer(user).data}
+        else:
+            results[index] = _failure(index, {'email': [_unique_email_message()]})
+    return results
+
+
+def bulk_response_body(results):
+    """(body, status): 201 when every item succeeded, else 207 Multi-Status."""
+    failed = sum(1 for result in results if result['code'] >= 400)
+    body = {'results': results, 'succeeded': len(results) - failed, 'failed': failed}
+    return body, status.HTTP_207_MULTI_STATUS if failed else status.HTTP_201_CREATED
+
+
+def iter_pk_chunks(queryset):
+    """
+    Primary keys of queryset, USER_BULK_BATCH_SIZE at a time. Keyset on pk:
+    rows an earlier chunk updated or deleted don't shift the later ones.
+    """
+    queryset = queryset.order_by('pk')
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(pk__gt=last)
+        pks = list(page.values_list('pk', flat=True)[:settings.USER_BULK_BATCH_SIZE])
+        if not pks:
+            return
+        yield pks
+        last = pks[-1]
+
+
+def update_users(queryset, values):
+    """Set values on every user of queryset; returns the number of rows updated."""
+    # update() skips auto_now: without this, ETags wouldn't change
+    values = {**values, 'updated_at': timezone.now()}
+    updated = 0
+    for pks in iter_pk_chunks(queryset):
+        with transaction.atomic():
+            updated += User.objects.filter(pk__in=pks).update(**values)
+            if values.get('is_active') is False:
+                services.blacklist_user_tokens(pks)
+        # After commit, so nothing re-caches the old rows in between
+        invalidate_principals(pks)
+        user_cache.bump_version()
+    return updated
+
+
+def delete_users(queryset):
+    """Delete every user of queryset; returns the number of users deleted."""
+    deleted = 0
+    for pks in iter_pk_chunks(queryset):
+        with transaction.atomic():
+            # One query per related table per chunk; post_delete
+            # (apps.users.signals) still drops each user's cache entries
+            _, per_model = User.objects.filter(pk__in=pks).delete()
+        deleted += per_model.get(User._meta.label, 0)
+    return deleted
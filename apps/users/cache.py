@@ -0,0 +1,63 @@
+"""
+Cached user rows (apps.common.cache.TwoTierCache) for GET /users/<id>.
+
+    id:<hex>       -> row dict (USER_ROW_FIELDS)
+
+Rows carry no password hash: login and token refresh read the user from
+the DB, so a password reset, deactivation or deletion applies at once in
+every process.
+
+Rows are invalidated whenever a User is saved or deleted (apps.users.signals),
+once the transaction commits; bulk updates call user_cache.bump_version().
+A miss that loaded the row before such a commit stores it under the key
+version it has replaced, so it is never served (see TwoTierCache.delete()).
+"""
+import uuid
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from apps.common.cache import TwoTierCache
+from apps.users.models import User
+
+USER_ROW_FIELDS = ('id', 'email', 'name', 'role', 'is_active', 'is_email_verified', 'updated_at')
+
+user_cache = TwoTierCache('users')
+
+
+def user_from_values(values):
+    """
+    User instance from a dict of field values. from_db() marks the other
+    fields as deferred, so the instance behaves like a DB-loaded user and
+    save() only writes the loaded fields.
+    """
+    field_names = [f.attname for f in User._meta.concrete_fields if f.attname in values]
+    return User.from_db(DEFAULT_DB_ALIAS, field_names, [values[name] for name in field_names])
+
+
+def _id_key(user_id):
+    return f'id:{uuid.UUID(str(user_id)).hex}'
+
+def _load_row(**lookup):
+    return User.objects.filter(**lookup).values(*USER_ROW_FIELDS).first()
+
+
+def get_user(user_id):
+    """
+    User by id, or None if it doesn't exist. Raises ValueError for an id
+    that isn't a UUID.
+    """
+    row = user_cache.get_or_set(
+        _id_key(user_id), lambda: _load_row(pk=user_id), timeout=settings.USER_CACHE_TTL
+    )
+    return user_from_values(row) if row is not None else None
+
+
+def invalidate_user(user_id):
+    # After commit: a version set earlier would be read by a concurrent miss,
+    # which then stores the old (still committed) row under it
+    key = _id_key(user_id)
+    transaction.on_commit(lambda: user_cache.delete(key))
+
+
+# The cache tiers are sync (local LRU, single-flight locks): one worker thread per call
+aget_user = sync_to_async(get_user)
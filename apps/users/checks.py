@@ -0,0 +1,54 @@
+from django.core.checks import Tags, Warning, register
+from django.db import connections
+
+from apps.users import search
+
+OUTSTANDING_TOKEN_EXPIRY_INDEX = 'token_blacklist_outstandingtoken_expires_at_idx'
+
+
+@register(Tags.database)
+def check_search_index(app_configs, databases=None, **kwargs):
+    """
+    The SQLite FTS index is only correct while its triggers on users_user
+    exist; a migration that remakes the table drops them silently.
+    Runs with the database checks (migrate, check --database).
+    """
+    errors = []
+    for alias in databases or []:
+        connection = connections[alias]
+        if connection.vendor != 'sqlite':
+            continue
+        table, triggers = search.sqlite_fts_state(connection)
+        if table and not triggers:
+            errors.append(Warning(
+                'The user search index (users_user_fts) is missing its sync triggers, '
+                'so it no longer follows users_user; search falls back to icontains.',
+                hint='Run: python manage.py rebuild_user_search_index',
+                id='users.W001',
+            ))
+    return errors
+
+
+@register(Tags.database)
+def check_outstanding_token_index(app_configs, databases=None, **kwargs):
+    """
+    Migration users.0006 adds an index to simplejwt's outstanding token
+    table for the purge; a later token_blacklist migration that rebuilds
+    the table would drop it without a trace.
+    """
+    errors = []
+    for alias in databases or []:
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            tables = connection.introspection.table_names(cursor)
+            if 'token_blacklist_outstandingtoken' not in tables:
+                continue
+            constraints = connection.introspection.get_constraints(cursor, 'token_blacklist_outstandingtoken')
+        if OUTSTANDING_TOKEN_EXPIRY_INDEX not in constraints:
+            errors.append(Warning(
+                f'The index {OUTSTANDING_TOKEN_EXPIRY_INDEX} on token_blacklist_outstandingtoken '
+                '(added by migration users.0006) is missing; the expired token purge will scan the table.',
+                hint='Recreate it with the CREATE INDEX statement of apps/users/migrations/0006_token_purge_indexes.py.',
+                id='users.W002',
+            ))
+    return errors
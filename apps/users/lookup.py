@@ -0,0 +1,66 @@
+"""
+Batch lookup of users by id (GET /v1/users?ids=a,b,c and POST /v1/users/lookup).
+
+One id__in query for the whole list (at most USER_LOOKUP_MAX_IDS ids).
+Users come back in input order, repeated ids once. Ids that match no user
+(or aren't UUIDs) are listed under notFound. Ids the caller may not read
+under IsUserOrAdmin (non-admins: anyone but themselves) are listed under
+forbidden and never queried.
+
+    {"results": [...], "notFound": ["..."], "forbidden": ["..."]}
+"""
+import uuid
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from apps.users.models import User
+from apps.users.permissions import IsUserOrAdmin
+from apps.users.serializers import serialize_user_values, user_values
+
+
+def parse_ids(raw):
+    """?ids=a,b,c -> ['a', 'b', 'c']"""
+    return [user_id.strip() for user_id in (raw or '').split(',') if user_id.strip()]
+
+
+class UserLookup:
+    def __init__(self, user, ids, fields=None):
+        if not ids:
+            raise ValidationError('ids: at least one id is required.')
+        if len(ids) > settings.USER_LOOKUP_MAX_IDS:
+            raise ValidationError(f'ids: at most {settings.USER_LOOKUP_MAX_IDS} ids per request.')
+        self.fields = fields
+        # Input order, first occurrence of each id; None for ids that aren't UUIDs
+        self.ids = {}
+        for raw in ids:
+            try:
+                pk = uuid.UUID(str(raw))
+            except ValueError:
+                pk = None
+            self.ids.setdefault(pk.hex if pk else str(raw), pk)
+        self.forbidden = [key for key, pk in self.ids.items() if pk and not IsUserOrAdmin.allows(user, pk)]
+
+    def queryset(self):
+        forbidden = set(self.forbidden)
+        pks = [pk for key, pk in self.ids.items() if pk and key not in forbidden]
+        return user_values(User.objects.filter(pk__in=pks), self.fields)
+
+    def result(self, rows):
+        by_pk = {row['id']: row for row in rows}
+        forbidden = set(self.forbidden)
+        found = [by_pk[pk] for pk in self.ids.values() if pk in by_pk]
+        not_found = [key for key, pk in self.ids.items() if pk not in by_pk and key not in forbidden]
+        return {
+            'results': serialize_user_values(found, self.fields),
+            'notFound': not_found,
+            'forbidden': self.forbidden,
+        }
+
+
+def lookup_users(user, ids, fields=None):
+    lookup = UserLookup(user, ids, fields)
+    return lookup.result(list(lookup.queryset()))
+
+
+async def alookup_users(user, ids, fields=None):
+    lookup = UserLookup(user, ids, fields)
+    return lookup.result([row async for row in lookup.queryset()])
@@ -0,0 +1,33 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.users.outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the EmailOutbox table in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when the outbox is drained.')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep between polls when idle (--loop).')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total_sent = total_failed = 0
+
+        while True:
+            sent, failed = deliver_batch(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f'Batch: {sent} sent, {failed} failed')
+                # A full batch means there is probably more waiting
+                if sent + failed >= batch_size:
+                    continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Done: {total_sent} sent, {total_failed} failed'))
@@ -0,0 +1,27 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.users.purge import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete expired reset/verify tokens and JWT outstanding/blacklisted tokens in small batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.TOKEN_PURGE_BATCH_SIZE)
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between batches (eases load on busy databases).')
+        parser.add_argument('--loop', action='store_true', help='Keep purging every --interval seconds instead of exiting (run a single instance).')
+        parser.add_argument('--interval', type=float, default=settings.TOKEN_PURGE_INTERVAL_SECONDS, help='Seconds between purges (--loop).')
+
+    def handle(self, *args, **options):
+        def report(label, batch_no, rows, seconds):
+            self.stdout.write(f'{label}: batch {batch_no} deleted {rows} rows in {seconds:.3f}s')
+
+        while True:
+            totals = purge_expired_tokens(batch_size=options['batch_size'], sleep=options['sleep'], report=report)
+            for label, rows in totals.items():
+                self.stdout.write(self.style.SUCCESS(f'{label}: {rows} rows purged'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.users import search
+
+
+class Command(BaseCommand):
+    help = 'Recreate the user search index (SQLite FTS5 table and triggers / Postgres trigram indexes).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        with connection.schema_editor() as schema_editor:
+            if connection.vendor == 'postgresql':
+                search.install_postgres_trigram_indexes(schema_editor)
+            elif connection.vendor == 'sqlite':
+                search.install_sqlite_fts(schema_editor)
+            else:
+                self.stdout.write(f'No search index for {connection.vendor}; icontains is used.')
+                return
+        search._fts_available.pop(options['database'], None)
+        self.stdout.write(self.style.SUCCESS('User search index rebuilt.'))
@@ -1,3 +1,4 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.base_user import BaseUserManager
 from django.utils.translation import gettext_lazy as _
 
@@ -18,6 +19,19 @@ class CustomUserManager(BaseUserManager):
         user.save()
         return user
 
+    async def acreate_user(self, email, password, **extra_fields):
+        """
+        Async create_user(): hashing runs in a worker thread, the INSERT
+        goes through the async ORM.
+        """
+        if not email:
+            raise ValueError(_('The Email must be set'))
+        email = self.normalize_email(email)
+        user = self.model(email=email, **extra_fields)
+        await sync_to_async(user.set_password)(password)
+        await user.asave()
+        return user
+
     def create_superuser(self, email, password, **extra_fields):
         """
         Create and save a SuperUser with the given email and password.
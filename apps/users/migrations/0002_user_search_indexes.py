@@ -0,0 +1,72 @@
+from django.db import migrations
+
+# The SQL lives here rather than in apps.users.search so that this step
+# keeps building the same schema whatever search.py does later.
+
+POSTGRES_TRIGRAM_INDEXES = {
+    'users_user_name_trgm': 'name',
+    'users_user_email_trgm': 'email',
+}
+
+
+def install_sqlite_fts(schema_editor):
+    # External-content FTS5 index keyed on users_user's rowid, kept in sync by
+    # triggers (migration 0007 replaces it with one keyed on stable ids)
+    try:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS users_user_fts USING fts5("
+            "name, email, content='users_user', content_rowid='rowid', tokenize='trigram')"
+        )
+    except Exception:
+        # SQLite built without FTS5 or older than 3.34 (no trigram tokenizer)
+        return
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_ai AFTER INSERT ON users_user BEGIN '
+        'INSERT INTO users_user_fts(rowid, name, email) VALUES (new.rowid, new.name, new.email); END'
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_ad AFTER DELETE ON users_user BEGIN '
+        "INSERT INTO users_user_fts(users_user_fts, rowid, name, email) VALUES ('delete', old.rowid, old.name, old.email); END"
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_au AFTER UPDATE OF name, email ON users_user BEGIN '
+        "INSERT INTO users_user_fts(users_user_fts, rowid, name, email) VALUES ('delete', old.rowid, old.name, old.email); "
+        'INSERT INTO users_user_fts(rowid, name, email) VALUES (new.rowid, new.name, new.email); END'
+    )
+    schema_editor.execute("INSERT INTO users_user_fts(users_user_fts) VALUES ('rebuild')")
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for index_name, column in POSTGRES_TRIGRAM_INDEXES.items():
+            # Expression must match Django's icontains lhs exactly: UPPER("col"::text)
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {index_name} ON users_user '
+                f'USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+            )
+    elif vendor == 'sqlite':
+        install_sqlite_fts(schema_editor)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for index_name in POSTGRES_TRIGRAM_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {index_name}')
+    elif vendor == 'sqlite':
+        for trigger in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS users_user_fts_{trigger}')
+        schema_editor.execute('DROP TABLE IF EXISTS users_user_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.14 on 2026-10-17 22:56
+
+import apps.common.models
+from django.db import migrations, models
+
+
+def reinstall_sqlite_search_index(apps, schema_editor):
+    # SQLite applies the AlterField by remaking users_user, which drops the
+    # FTS sync triggers and renumbers rowids: recreate the triggers of the
+    # rowid-keyed index of 0002 and rebuild it (SQL copied from 0002).
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_user_fts'")
+        if cursor.fetchone() is None:
+            return  # no FTS5 when 0002 ran
+    for trigger in ('ai', 'ad', 'au'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS users_user_fts_{trigger}')
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_ai AFTER INSERT ON users_user BEGIN '
+        'INSERT INTO users_user_fts(rowid, name, email) VALUES (new.rowid, new.name, new.email); END'
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_ad AFTER DELETE ON users_user BEGIN '
+        "INSERT INTO users_user_fts(users_user_fts, rowid, name, email) VALUES ('delete', old.rowid, old.name, old.email); END"
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_au AFTER UPDATE OF name, email ON users_user BEGIN '
+        "INSERT INTO users_user_fts(users_user_fts, rowid, name, email) VALUES ('delete', old.rowid, old.name, old.email); "
+        'INSERT INTO users_user_fts(rowid, name, email) VALUES (new.rowid, new.name, new.email); END'
+    )
+    schema_editor.execute("INSERT INTO users_user_fts(users_user_fts) VALUES ('rebuild')")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='id',
+            field=models.UUIDField(default=apps.common.models.generate_uuid, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.RunPython(reinstall_sqlite_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-17 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_email_outbox'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='token',
+            name='expires',
+            field=models.DateTimeField(db_index=True),
+        ),
+        # simplejwt's OutstandingToken.expires_at has no index; the purge
+        # selects expired rows through it. This index lives on a table owned
+        # by another app, so that app's migrations don't know about it: one
+        # that rebuilds the table drops it (users.W002 reports that; rerun
+        # this SQL to restore it). Reversing this migration drops it.
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS token_blacklist_outstandingtoken_expires_at_idx '
+            'ON token_blacklist_outstandingtoken (expires_at)',
+            'DROP INDEX IF EXISTS token_blacklist_outstandingtoken_expires_at_idx',
+        ),
+    ]
@@ -0,0 +1,93 @@
+from django.db import migrations
+
+# SQL copied here (not imported from apps.users.search) so this step always
+# performs the same change.
+
+FTS_TRIGGERS = ('users_user_fts_ai', 'users_user_fts_ad', 'users_user_fts_au')
+
+
+def drop_sqlite_fts(schema_editor):
+    for trigger in FTS_TRIGGERS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    schema_editor.execute('DROP TABLE IF EXISTS users_user_fts')
+    schema_editor.execute('DROP TABLE IF EXISTS users_user_fts_ids')
+
+
+def install_stable_id_index(apps, schema_editor):
+    """
+    Replace the external-content index keyed on users_user's implicit rowid
+    (0002), which VACUUM and table remakes renumber. The FTS table keeps its
+    own copy of name/email, and users_user_fts_ids maps each user id to the
+    rowid of its FTS row.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    drop_sqlite_fts(schema_editor)
+    try:
+        schema_editor.execute("CREATE VIRTUAL TABLE users_user_fts USING fts5(name, email, tokenize='trigram')")
+    except Exception:
+        # SQLite built without FTS5 or older than 3.34 (no trigram tokenizer)
+        return
+    schema_editor.execute(
+        'CREATE TABLE users_user_fts_ids (rowid INTEGER PRIMARY KEY, user_id CHAR(32) NOT NULL UNIQUE)'
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_ai AFTER INSERT ON users_user BEGIN '
+        'INSERT INTO users_user_fts_ids(user_id) VALUES (new.id); '
+        'INSERT INTO users_user_fts(rowid, name, email) VALUES '
+        '((SELECT rowid FROM users_user_fts_ids WHERE user_id = new.id), new.name, new.email); END'
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_ad AFTER DELETE ON users_user BEGIN '
+        'DELETE FROM users_user_fts WHERE rowid = (SELECT rowid FROM users_user_fts_ids WHERE user_id = old.id); '
+        'DELETE FROM users_user_fts_ids WHERE user_id = old.id; END'
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_au AFTER UPDATE OF name, email ON users_user BEGIN '
+        'UPDATE users_user_fts SET name = new.name, email = new.email '
+        'WHERE rowid = (SELECT rowid FROM users_user_fts_ids WHERE user_id = old.id); END'
+    )
+    schema_editor.execute('INSERT INTO users_user_fts_ids(user_id) SELECT id FROM users_user')
+    schema_editor.execute(
+        'INSERT INTO users_user_fts(rowid, name, email) '
+        'SELECT ids.rowid, u.name, u.email FROM users_user u JOIN users_user_fts_ids ids ON ids.user_id = u.id'
+    )
+
+
+def restore_rowid_index(apps, schema_editor):
+    # Back to the layout of 0002
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    drop_sqlite_fts(schema_editor)
+    try:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE users_user_fts USING fts5("
+            "name, email, content='users_user', content_rowid='rowid', tokenize='trigram')"
+        )
+    except Exception:
+        return
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_ai AFTER INSERT ON users_user BEGIN '
+        'INSERT INTO users_user_fts(rowid, name, email) VALUES (new.rowid, new.name, new.email); END'
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_ad AFTER DELETE ON users_user BEGIN '
+        "INSERT INTO users_user_fts(users_user_fts, rowid, name, email) VALUES ('delete', old.rowid, old.name, old.email); END"
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER users_user_fts_au AFTER UPDATE OF name, email ON users_user BEGIN '
+        "INSERT INTO users_user_fts(users_user_fts, rowid, name, email) VALUES ('delete', old.rowid, old.name, old.email); "
+        'INSERT INTO users_user_fts(rowid, name, email) VALUES (new.rowid, new.name, new.email); END'
+    )
+    schema_editor.execute("INSERT INTO users_user_fts(users_user_fts) VALUES ('rebuild')")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_token_purge_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_stable_id_index, restore_rowid_index),
+    ]
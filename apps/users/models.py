@@ -1,5 +1,7 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from apps.common import hashing, metrics
 from apps.common.models import UUIDModel, TimeStampedModel
 from apps.users.managers import CustomUserManager
 import uuid
@@ -29,13 +31,51 @@ class User(AbstractBaseUser, PermissionsMixin, UUIDModel):
 
     objects = CustomUserManager()
 
+    # sortBy key (camelCase or snake_case) -> column.
+    # Every column has an index below that leads with it and ends in 'id', so
+    # ORDER BY column, id (and keyset pagination over it) is an index scan.
+    SORTABLE_FIELDS = {
+        'createdAt': 'created_at',
+        'created_at': 'created_at',
+        'updatedAt': 'updated_at',
+        'updated_at': 'updated_at',
+        'name': 'name',
+        'email': 'email',  # served by the unique index on email
+        'isEmailVerified': 'is_email_verified',
+        'is_email_verified': 'is_email_verified',
+    }
+
     class Meta:
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='users_user_created_id_idx'),
+            models.Index(fields=['updated_at', 'id'], name='users_user_updated_id_idx'),
+            models.Index(fields=['name', 'id'], name='users_user_name_id_idx'),
+            models.Index(fields=['is_email_verified', 'id'], name='users_user_verified_id_idx'),
+            # GET /users?role=x (newest first)
+            models.Index(fields=['role', 'created_at', 'id'], name='users_user_role_created_idx'),
+        ]
 
     def __str__(self):
         return self.email
 
+    # Hashing goes through the bounded pool (apps/common/hashing.py); both
+    # raise HashingBusy (503 + Retry-After) when it is saturated.
+    def set_password(self, raw_password):
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        is_correct, must_update = hashing.verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            # Stored with an outdated hasher or work factor: upgrade it
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+            metrics.PASSWORD_REHASH.inc()
+        return is_correct
+
 
 class Token(TimeStampedModel):
     """
@@ -57,7 +97,7 @@ class Token(TimeStampedModel):
     token = models.CharField(max_length=255, db_index=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tokens')
     type = models.CharField(max_length=20, choices=TOKEN_TYPE_CHOICES)
-    expires = models.DateTimeField()
+    expires = models.DateTimeField(db_index=True) # Indexed for the expired-token purge
     blacklisted = models.BooleanField(default=False)
 
     class Meta:
@@ -65,4 +105,40 @@ class Token(TimeStampedModel):
         verbose_name_plural = 'Tokens'
 
     def __str__(self):
-        return f"{self.type} - {self.user.email}"
\ No newline at end of file
+        return f"{self.type} - {self.user.email}"
+
+
+class EmailOutbox(TimeStampedModel):
+    """
+    Transactional outbox for outgoing emails.
+    Requests insert a row (in the same transaction as the token it mails) and
+    return; `manage.py process_email_outbox` delivers pending rows in batches.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Email Outbox'
+        verbose_name_plural = 'Email Outbox'
+        indexes = [
+            # Worker query: status = 'pending' AND next_attempt_at <= now()
+            models.Index(fields=['status', 'next_attempt_at'], name='users_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
@@ -0,0 +1,105 @@
+"""
+Batched delivery of EmailOutbox rows.
+One SMTP connection is opened per batch and reused for every message in it.
+Failed messages are retried with exponential backoff until
+EMAIL_OUTBOX_MAX_ATTEMPTS, then marked failed (kept for inspection).
+"""
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from apps.users.models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+def enqueue_email(to, subject, text):
+    return EmailOutbox.objects.create(to_email=to, subject=subject, body=text)
+
+def _retry_delay(attempts):
+    base = settings.EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 3600))
+
+def _claim(batch_size, now):
+    """
+    Lease up to batch_size due messages in one short transaction: attempts
+    goes up by one and next_attempt_at moves EMAIL_OUTBOX_LEASE_SECONDS
+    ahead, so other workers skip them. Nothing is sent while the rows are
+    locked. A worker that dies mid-batch leaves its messages to be retried
+    once the lease runs out.
+    """
+    with transaction.atomic():
+        messages = list(
+            EmailOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if messages:
+            lease = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+            EmailOutbox.objects.filter(pk__in=[message.pk for message in messages]).update(
+                attempts=F('attempts') + 1, next_attempt_at=lease,
+            )
+            for message in messages:
+                message.attempts += 1
+    return messages
+
+def _record_sent(message):
+    EmailOutbox.objects.filter(pk=message.pk).update(status=EmailOutbox.STATUS_SENT, sent_at=timezone.now())
+
+def _record_failure(message, error):
+    # The attempt was counted when the message was claimed
+    fields = {'last_error': str(error)[:1000]}
+    if message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        fields['status'] = EmailOutbox.STATUS_FAILED
+        logger.error(f"Giving up on email {message.pk} to {message.to_email}: {error}")
+    else:
+        fields['next_attempt_at'] = timezone.now() + _retry_delay(message.attempts)
+        logger.warning(f"Email {message.pk} to {message.to_email} failed (attempt {message.attempts}): {error}")
+    EmailOutbox.objects.filter(pk=message.pk).update(**fields)
+
+def deliver_batch(batch_size=None):
+    """
+    Deliver up to batch_size due messages. Returns (sent, failed) counts.
+    Messages are claimed first (_claim, SKIP LOCKED where supported), so
+    several workers can drain the outbox concurrently without sending
+    anything twice. Each one is then sent outside any transaction and its
+    result recorded right away.
+    """
+    messages = _claim(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE, timezone.now())
+    if not messages:
+        return 0, 0
+    sent = failed = 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Server unreachable: the whole batch is retried later
+        for message in messages:
+            _record_failure(message, e)
+        return 0, len(messages)
+
+    try:
+        for message in messages:
+            try:
+                EmailMessage(
+                    subject=message.subject,
+                    body=message.body,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[message.to_email],
+                    connection=connection,
+                ).send()
+            except Exception as e:
+                _record_failure(message, e)
+                failed += 1
+            else:
+                _record_sent(message)
+                sent += 1
+    finally:
+        connection.close()
+
+    logger.info(f"Email outbox batch: {sent} sent, {failed} failed")
+    return sent, failed
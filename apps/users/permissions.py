@@ -15,8 +15,13 @@ class IsUserOrAdmin(permissions.BasePermission):
     if (req.params.userId !== user.id) ...
     """
     def has_object_permission(self, request, view, obj):
+        return self.allows(request.user, obj.id)
+
+    @staticmethod
+    def allows(user, user_id):
+        """The same rule for a bare id (batch lookups check many without loading them)."""
         # Admin can do anything
-        if request.user.role == 'admin':
+        if user.role == 'admin':
             return True
         # User can only access their own object
-        return obj.id == request.user.id
\ No newline at end of file
+        return user_id == user.id
\ No newline at end of file
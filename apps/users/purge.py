@@ -0,0 +1,76 @@
+"""
+Purge engine for expired token rows:
+- users.Token (reset password / verify email) past `expires`
+- simplejwt BlacklistedToken / OutstandingToken past `expires_at`
+
+Rows are deleted in small primary-key chunks, each in its own short
+transaction, selected through an index on the expiry column. Locks are
+therefore held for milliseconds and the purge can run alongside live traffic.
+
+Run it from cron or a single scheduler process (manage.py
+purge_expired_tokens [--loop]), never from the web workers.
+
+OutstandingToken.expires_at has no index of its own: migration
+users.0006 adds token_blacklist_outstandingtoken_expires_at_idx to
+simplejwt's table (checked by users.W002, see apps/users/checks.py).
+"""
+import logging
+import time
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from apps.users.models import Token
+
+logger = logging.getLogger(__name__)
+
+def purge_targets(now):
+    """
+    (label, queryset, ordering) for every purgeable table.
+    Blacklisted rows go first so deleting their OutstandingToken needs no cascade.
+    """
+    return [
+        ('users.Token', Token.objects.filter(expires__lt=now), 'expires'),
+        ('token_blacklist.BlacklistedToken', BlacklistedToken.objects.filter(token__expires_at__lt=now), 'token__expires_at'),
+        ('token_blacklist.OutstandingToken', OutstandingToken.objects.filter(expires_at__lt=now), 'expires_at'),
+    ]
+
+def purge_queryset(label, queryset, ordering, batch_size, sleep=0.0, report=None):
+    """
+    Delete every row of `queryset` in chunks of batch_size.
+    `report(label, batch_no, rows, seconds)` is called after each chunk.
+    Returns the total number of rows deleted.
+    """
+    total = 0
+    batch_no = 0
+    model = queryset.model
+    while True:
+        start = time.perf_counter()
+        with transaction.atomic():
+            pks = list(queryset.order_by(ordering).values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            deleted = model.objects.filter(pk__in=pks).delete()[1].get(model._meta.label, 0)
+        elapsed = time.perf_counter() - start
+
+        batch_no += 1
+        total += deleted
+        logger.info(f"Purged {deleted} {label} rows (batch {batch_no}) in {elapsed:.3f}s")
+        if report:
+            report(label, batch_no, deleted, elapsed)
+        if len(pks) < batch_size:
+            break
+        if sleep:
+            time.sleep(sleep)
+    return total
+
+def purge_expired_tokens(batch_size=None, sleep=0.0, report=None):
+    """
+    Purge all expired token rows. Returns {label: rows deleted}.
+    """
+    batch_size = batch_size or settings.TOKEN_PURGE_BATCH_SIZE
+    now = timezone.now()
+    return {
+        label: purge_queryset(label, queryset, ordering, batch_size, sleep=sleep, report=report)
+        for label, queryset, ordering in purge_targets(now)
+    }
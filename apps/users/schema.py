@@ -0,0 +1,7 @@
+# OpenAPI (drf-spectacular) extensions, registered in UsersConfig.ready()
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Same bearer JWT security scheme as simplejwt's JWTAuthentication."""
+    target_class = 'apps.users.authentication.CachedJWTAuthentication'
@@ -0,0 +1,203 @@
+"""
+Index-backed substring search for users.
+
+- PostgreSQL: `icontains` compiles to UPPER(col::text) LIKE UPPER('%term%'),
+  which the pg_trgm GIN indexes created in migration 0002 serve directly.
+- SQLite: an FTS5 trigram table (users_user_fts) kept in sync by triggers on
+  users_user. A system check (apps.users.checks) reports missing triggers.
+- Anything else, terms shorter than one trigram, or a missing FTS table:
+  plain `icontains` (full scan, same results).
+"""
+import logging
+import uuid
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'users_user_fts'
+FTS_IDS_TABLE = 'users_user_fts_ids'
+FTS_TRIGGERS = (f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au')
+MIN_TRIGRAM_LENGTH = 3
+
+SCOPE_FIELDS = {
+    'all': ('name', 'email'),
+    'name': ('name',),
+    'email': ('email',),
+}
+
+# ==============================================================================
+# SCHEMA (rebuild_user_search_index; migrations carry their own copy of the SQL)
+# ==============================================================================
+
+POSTGRES_TRIGRAM_INDEXES = {
+    'users_user_name_trgm': 'name',
+    'users_user_email_trgm': 'email',
+}
+
+def install_postgres_trigram_indexes(schema_editor):
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, column in POSTGRES_TRIGRAM_INDEXES.items():
+        # Expression must match Django's icontains lhs exactly: UPPER("col"::text)
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} ON users_user '
+            f'USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+def drop_postgres_trigram_indexes(schema_editor):
+    for index_name in POSTGRES_TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+def install_sqlite_fts(schema_editor):
+    """
+    (Re)create the FTS5 index and its sync triggers, filled from users_user.
+    Idempotent: also the repair after anything that remakes users_user (a
+    SQLite AlterField drops its triggers), see rebuild_user_search_index.
+
+    users_user has a UUID primary key, so its rowid is implicit and VACUUM
+    or a table remake renumbers it. The index is keyed on its own stable
+    integers instead: FTS_IDS_TABLE maps each user id to the rowid of its
+    FTS row, and the FTS table keeps its own copy of name/email.
+    """
+    drop_sqlite_fts(schema_editor)
+    try:
+        schema_editor.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(name, email, tokenize='trigram')")
+    except Exception:
+        # SQLite built without FTS5 or older than 3.34 (no trigram tokenizer)
+        return
+    schema_editor.execute(
+        f'CREATE TABLE {FTS_IDS_TABLE} (rowid INTEGER PRIMARY KEY, user_id CHAR(32) NOT NULL UNIQUE)'
+    )
+
+    fts_rowid = f'(SELECT rowid FROM {FTS_IDS_TABLE} WHERE user_id = %s.id)'
+    schema_editor.execute(
+        f'CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON users_user BEGIN '
+        f'INSERT INTO {FTS_IDS_TABLE}(user_id) VALUES (new.id); '
+        f'INSERT INTO {FTS_TABLE}(rowid, name, email) VALUES ({fts_rowid % "new"}, new.name, new.email); END'
+    )
+    schema_editor.execute(
+        f'CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON users_user BEGIN '
+        f'DELETE FROM {FTS_TABLE} WHERE rowid = {fts_rowid % "old"}; '
+        f'DELETE FROM {FTS_IDS_TABLE} WHERE user_id = old.id; END'
+    )
+    schema_editor.execute(
+        f'CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF name, email ON users_user BEGIN '
+        f'UPDATE {FTS_TABLE} SET name = new.name, email = new.email WHERE rowid = {fts_rowid % "old"}; END'
+    )
+    schema_editor.execute(f'INSERT INTO {FTS_IDS_TABLE}(user_id) SELECT id FROM users_user')
+    schema_editor.execute(
+        f'INSERT INTO {FTS_TABLE}(rowid, name, email) '
+        f'SELECT ids.rowid, u.name, u.email FROM users_user u JOIN {FTS_IDS_TABLE} ids ON ids.user_id = u.id'
+    )
+
+def drop_sqlite_fts(schema_editor):
+    for trigger in FTS_TRIGGERS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_IDS_TABLE}')
+
+def sqlite_fts_state(connection):
+    """(table exists, all sync triggers exist) for the FTS index on `connection`."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT type, name FROM sqlite_master WHERE (type = 'table' AND name = %s) "
+            "OR (type = 'trigger' AND tbl_name = 'users_user')",
+            [FTS_TABLE],
+        )
+        rows = cursor.fetchall()
+    names = {name for _, name in rows}
+    return FTS_TABLE in names, set(FTS_TRIGGERS) <= names
+
+# ==============================================================================
+# QUERY
+# ==============================================================================
+
+_fts_available = {}
+
+def sqlite_fts_available(alias):
+    if alias not in _fts_available:
+        table, triggers = sqlite_fts_state(connections[alias])
+        if table and not triggers:
+            # Without its triggers the index goes stale: plain icontains until it is rebuilt
+            logger.warning('User search index has no sync triggers; run manage.py rebuild_user_search_index')
+        _fts_available[alias] = table and triggers
+    return _fts_available[alias]
+
+def _text_match(queryset, search, fields):
+    """
+    Q object matching `search` as a case-insensitive substring of any of `fields`.
+    """
+    connection = connections[queryset.db]
+    if (
+        connection.vendor == 'sqlite'
+        and len(search) >= MIN_TRIGRAM_LENGTH
+        and sqlite_fts_available(queryset.db)
+    ):
+        # FTS5 phrase of trigrams == substring; column filter restricts the scope
+        phrase = '"' + search.replace('"', '""') + '"'
+        match = '{%s} : %s' % (' '.join(fields), phrase)
+        return Q(pk__in=RawSQL(
+            f'SELECT user_id FROM {FTS_IDS_TABLE} WHERE rowid IN '
+            f'(SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)',
+            [match],
+        ))
+
+    # PostgreSQL: served by the pg_trgm GIN indexes
+    q_obj = Q()
+    for field in fields:
+        q_obj |= Q(**{f'{field}__icontains': search})
+    return q_obj
+
+def search_users(queryset, search, scope='all'):
+    """
+    Apply the `search` / `scope` query params of GET /users.
+    scope=all matches name, email, and the id (if `search` is a valid UUID).
+    """
+    if not search:
+        return queryset
+
+    # Helper: Check if search term is a valid UUID
+    is_uuid = False
+    try:
+        uuid.UUID(search)
+        is_uuid = True
+    except ValueError:
+        pass
+
+    if scope == 'id':
+        if is_uuid:
+            return queryset.filter(id=search)
+        # Searching by ID with invalid UUID string -> No results
+        return queryset.none()
+
+    fields = SCOPE_FIELDS.get(scope)
+    if fields is None:
+        # Unknown scope: no search filter (previous behavior)
+        return queryset
+
+    q_obj = _text_match(queryset, search, fields)
+    if scope == 'all' and is_uuid:
+        q_obj |= Q(id=search)
+    return queryset.filter(q_obj)
+
+def legacy_search_users(queryset, search, scope='all'):
+    """
+    The pre-index implementation (unconditional icontains), kept as the
+    benchmark baseline in benchmarks/bench_user_search.py.
+    """
+    if not search:
+        return queryset
+    fields = SCOPE_FIELDS.get(scope)
+    if scope == 'id' or fields is None:
+        return search_users(queryset, search, scope)
+    q_obj = Q()
+    for field in fields:
+        q_obj |= Q(**{f'{field}__icontains': search})
+    if scope == 'all':
+        try:
+            uuid.UUID(search)
+            q_obj |= Q(id=search)
+        except ValueError:
+            pass
+    return queryset.filter(q_obj)
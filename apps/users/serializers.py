@@ -1,12 +1,16 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+from django.conf import settings
 from django.contrib.auth.password_validation import validate_password
+from apps.common import timing
+from apps.common.serializers import TimedListSerializer, TimedSerializerMixin
 from apps.users.models import User
 
 # ==============================================================================
 # BASE SERIALIZERS
 # ==============================================================================
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Output serializer for User object.
     Hides private fields like password.
@@ -16,6 +20,73 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', 'name', 'role', 'is_email_verified']
+        list_serializer_class = TimedListSerializer
+
+    def __init__(self, *args, fields=None, **kwargs):
+        # fields: output only these (see requested_user_fields)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def requested_user_fields(request):
+    """
+    Sparse fieldsets: ?fields=id,name -> ['id', 'name'] (in UserSerializer
+    order), None when the parameter is absent or empty.
+    """
+    raw = request.query_params.get('fields')
+    requested = {name.strip() for name in (raw or '').split(',') if name.strip()}
+    if not requested:
+        return None
+    allowed = UserSerializer.Meta.fields
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise serializers.ValidationError(
+            f"fields: unknown field(s) {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return [name for name in allowed if name in requested]
+
+
+def user_values(queryset, fields=None):
+    """
+    Read-only list path: the UserSerializer columns (or just `fields`) as
+    .values() dicts, so no model instances are built. The id, updated_at (for
+    ETags) and ordering columns come along too (keyset pagination reads its
+    cursor from the last row).
+    """
+    ordering = [name.lstrip('-') for name in queryset.query.order_by if isinstance(name, str)]
+    columns = [
+        *(fields or UserSerializer.Meta.fields), 'id', 'updated_at',
+        *('id' if name == 'pk' else name for name in ordering),
+    ]
+    return queryset.values(*dict.fromkeys(columns))
+
+
+def serialize_user_values(rows, fields=None):
+    """
+    user_values() rows -> the same dicts UserSerializer(many=True, fields=fields).data
+    renders, without per-row DRF field objects.
+    """
+    with timing.measure('serializer'):
+        if fields is None:
+            return [
+                {
+                    'id': row['id'].hex,
+                    'email': row['email'],
+                    'name': row['name'],
+                    'role': row['role'],
+                    'is_email_verified': row['is_email_verified'],
+                }
+                for row in rows
+            ]
+        data = []
+        for row in rows:
+            item = {name: row[name] for name in fields}
+            if 'id' in item:
+                item['id'] = item['id'].hex
+            data.append(item)
+        return data
 
 
 # ==============================================================================
@@ -102,6 +173,75 @@ class CreateUserSerializer(serializers.ModelSerializer):
         return User.objects.create_user(**validated_data)
 
 
+class BulkCreateUserSerializer(CreateUserSerializer):
+    """
+    One item of POST /users/bulk: CreateUserSerializer without the per-item
+    unique-email query, which apps/users/bulk.py runs once for the batch.
+    """
+    def get_fields(self):
+        fields = super().get_fields()
+        email = fields['email']
+        email.validators = [v for v in email.validators if not isinstance(v, UniqueValidator)]
+        return fields
+
+
+class BulkFilterSerializer(serializers.Serializer):
+    """The GET /users filters, selecting the users of PATCH/DELETE /users/bulk."""
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+    search = serializers.CharField(required=False)
+    scope = serializers.ChoiceField(choices=['all', 'name', 'email', 'id'], required=False)
+
+    def validate(self, attrs):
+        if not attrs.get('role') and not attrs.get('search'):
+            raise serializers.ValidationError('Give role and/or search; an empty filter would match every user.')
+        return attrs
+
+
+class BulkSelectionSerializer(serializers.Serializer):
+    """
+    DELETE /users/bulk: exactly one of `ids` (at most USER_BULK_MAX_ITEMS)
+    or `filter`.
+    """
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False)
+    filter = BulkFilterSerializer(required=False)
+
+    def validate_ids(self, value):
+        if len(value) > settings.USER_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(f'At most {settings.USER_BULK_MAX_ITEMS} ids per request.')
+        return value
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Give either ids or filter.')
+        return attrs
+
+
+class BulkUpdateFieldsSerializer(serializers.Serializer):
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+    is_active = serializers.BooleanField(required=False)
+    is_email_verified = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError('Nothing to update.')
+        return attrs
+
+
+class BulkUpdateUserSerializer(BulkSelectionSerializer):
+    """
+    PATCH /users/bulk: the selection plus the values to set on every
+    selected user.
+    """
+    data = BulkUpdateFieldsSerializer()
+
+
+class UserLookupSerializer(serializers.Serializer):
+    """
+    POST /users/lookup (apps/users/lookup.py)
+    """
+    ids = serializers.ListField(child=serializers.CharField())
+
+
 class UpdateUserSerializer(serializers.ModelSerializer):
     """
     Updating user details.
@@ -1,15 +1,23 @@
 import logging
+from asgiref.sync import sync_to_async
 from django.utils import timezone
 from django.conf import settings
 from django.core.mail import send_mail
 from django.shortcuts import get_object_or_404
 from rest_framework_simplejwt.tokens import RefreshToken as JWTRefreshToken
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from apps.users.models import User, Token
+from apps.users import tokens as signed_tokens
+from apps.users.outbox import enqueue_email
+from apps.common import metrics
+from apps.common.hashing import HashingBusy
 from apps.common.exceptions import api_exception_handler
 from rest_framework.exceptions import AuthenticationFailed, NotFound, ValidationError
 from datetime import timedelta
 import secrets
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +31,9 @@ def generate_auth_tokens(user):
     Matches src/services/token.service.js -> generateAuthTokens
     """
     refresh = JWTRefreshToken.for_user(user)
-    
+    return _token_pair(refresh)
+
+def _token_pair(refresh):
     return {
         'access': {
             'token': str(refresh.access_token),
@@ -35,10 +45,30 @@ def generate_auth_tokens(user):
         }
     }
 
+def blacklist_user_tokens(user_ids):
+    """
+    Blacklist every live refresh token of these users (bulk deactivation):
+    one SELECT and one INSERT, whatever the number of users.
+    """
+    token_ids = OutstandingToken.objects.filter(
+        user_id__in=user_ids, expires_at__gt=timezone.now(), blacklistedtoken__isnull=True
+    ).values_list('id', flat=True)
+    created = BlacklistedToken.objects.bulk_create(
+        [BlacklistedToken(token_id=token_id) for token_id in token_ids], ignore_conflicts=True
+    )
+    # bulk_create sends no post_save (apps.users.signals counts the others)
+    metrics.TOKEN_BLACKLIST.inc(len(created))
+    return len(created)
+
 def generate_opaque_token(user, token_type, expiration_minutes):
     """
     Generates a random string token (not JWT) for Reset Password / Verify Email.
+    With AUTH_EMAIL_TOKEN_BACKEND='signed' the token is stateless (apps/users/tokens.py)
+    and no Token row is written.
     """
+    if settings.AUTH_EMAIL_TOKEN_BACKEND == 'signed':
+        return signed_tokens.make_token(user, token_type, expiration_minutes)
+
     token_str = secrets.token_urlsafe(32)
     expires = timezone.now() + timedelta(minutes=expiration_minutes)
     
@@ -64,14 +94,30 @@ def verify_token(token_str, token_type):
     except Token.DoesNotExist:
         raise NotFound('Token not found')
 
+def get_token_user(token_str, token_type):
+    """
+    Return the user of a valid Reset Password / Verify Email token.
+    Signed and DB tokens are both accepted, so switching AUTH_EMAIL_TOKEN_BACKEND
+    does not invalidate tokens already sent out.
+    """
+    if signed_tokens.is_signed_token(token_str):
+        return signed_tokens.check_token(token_str, token_type)
+    return verify_token(token_str, token_type).user
+
 # ==============================================================================
 # EMAIL SERVICE
 # ==============================================================================
 
 def send_email(to, subject, text):
     """
-    Wrapper for Django send_mail
+    Wrapper for Django send_mail.
+    With EMAIL_USE_OUTBOX the email is only queued (an INSERT in the caller's
+    transaction); `manage.py process_email_outbox` delivers it.
     """
+    if settings.EMAIL_USE_OUTBOX:
+        enqueue_email(to, subject, text)
+        return
+
     try:
         send_mail(
             subject=subject,
@@ -111,13 +157,21 @@ def login_user_with_email_and_password(email, password):
     """
     Matches src/services/auth.service.js -> loginUserWithEmailAndPassword
     """
+    start = time.perf_counter()
+    outcome = 'failure'
     try:
+        # Always from the DB: credentials are never served from a cache
         user = User.objects.get(email=email)
+        # Also rehashes a correct password whose stored hash is outdated (other
+        # algorithm, or fewer PBKDF2 iterations than PASSWORD_HASHER_ITERATIONS)
         if not user.check_password(password):
             raise AuthenticationFailed('Incorrect email or password')
+        outcome = 'success'
         return user
     except User.DoesNotExist:
         raise AuthenticationFailed('Incorrect email or password')
+    finally:
+        metrics.LOGIN_DURATION.observe(time.perf_counter() - start, outcome=outcome)
 
 def logout_user(refresh_token_str):
     """
@@ -140,15 +194,18 @@ def refresh_auth(refresh_token_str):
         # In SimpleJWT, we can't easily get the user object from just the object without decoding
         # But we can create a new access token.
         # To match Regular EXACTLY (return both tokens), we regenerate both.
-        user_id = refresh['user_id']
+        user_id = refresh[jwt_settings.USER_ID_CLAIM]
         user = User.objects.get(id=user_id)
         
         # Blacklist old one
         refresh.blacklist()
         
         # Generate new pair
-        return generate_auth_tokens(user)
+        tokens = generate_auth_tokens(user)
+        metrics.TOKEN_REFRESH.inc(outcome='success')
+        return tokens
     except (TokenError, User.DoesNotExist):
+        metrics.TOKEN_REFRESH.inc(outcome='failure')
         raise AuthenticationFailed('Please authenticate')
 
 def reset_password(token_str, new_password):
@@ -156,14 +213,17 @@ def reset_password(token_str, new_password):
     Matches src/services/auth.service.js -> resetPassword
     """
     try:
-        token_doc = verify_token(token_str, Token.TYPE_RESET_PASSWORD)
-        user = token_doc.user
+        user = get_token_user(token_str, Token.TYPE_RESET_PASSWORD)
         
         user.set_password(new_password)
         user.save()
         
-        # Delete all reset tokens for this user (Consume token)
-        Token.objects.filter(user=user, type=Token.TYPE_RESET_PASSWORD).delete()
+        # Delete all reset tokens for this user (Consume token).
+        # Signed tokens are consumed by the password change itself.
+        if not signed_tokens.is_signed_token(token_str):
+            Token.objects.filter(user=user, type=Token.TYPE_RESET_PASSWORD).delete()
+    except HashingBusy:
+        raise  # 503 + Retry-After: the token is still valid, the client can retry
     except Exception:
          raise AuthenticationFailed('Password reset failed')
 
@@ -172,12 +232,54 @@ def verify_email(token_str):
     Matches src/services/auth.service.js -> verifyEmail
     """
     try:
-        token_doc = verify_token(token_str, Token.TYPE_VERIFY_EMAIL)
-        user = token_doc.user
+        user = get_token_user(token_str, Token.TYPE_VERIFY_EMAIL)
         
         user.is_email_verified = True
         user.save()
         
-        Token.objects.filter(user=user, type=Token.TYPE_VERIFY_EMAIL).delete()
+        if not signed_tokens.is_signed_token(token_str):
+            Token.objects.filter(user=user, type=Token.TYPE_VERIFY_EMAIL).delete()
     except Exception:
-        raise AuthenticationFailed('Email verification failed')
\ No newline at end of file
+        raise AuthenticationFailed('Email verification failed')
+
+# ==============================================================================
+# ASYNC VARIANTS (apps/users/async_views.py)
+# ==============================================================================
+# Same behavior as the functions above. User lookups go through the async
+# ORM; password hashing and simplejwt's token bookkeeping (its outstanding
+# and blacklist tables have no async API) run in a worker thread.
+
+async def agenerate_auth_tokens(user):
+    refresh = await sync_to_async(JWTRefreshToken.for_user)(user)
+    return _token_pair(refresh)
+
+async def alogin_user_with_email_and_password(email, password):
+    start = time.perf_counter()
+    outcome = 'failure'
+    try:
+        # Always from the DB: credentials are never served from a cache
+        user = await User.objects.aget(email=email)
+        if not await sync_to_async(user.check_password)(password):
+            raise AuthenticationFailed('Incorrect email or password')
+        outcome = 'success'
+        return user
+    except User.DoesNotExist:
+        raise AuthenticationFailed('Incorrect email or password')
+    finally:
+        metrics.LOGIN_DURATION.observe(time.perf_counter() - start, outcome=outcome)
+
+async def alogout_user(refresh_token_str):
+    await sync_to_async(logout_user)(refresh_token_str)
+
+async def arefresh_auth(refresh_token_str):
+    try:
+        # Decoding checks the blacklist
+        refresh = await sync_to_async(JWTRefreshToken)(refresh_token_str)
+        user = await User.objects.aget(id=refresh[jwt_settings.USER_ID_CLAIM])
+        await sync_to_async(refresh.blacklist)()
+        tokens = await agenerate_auth_tokens(user)
+        metrics.TOKEN_REFRESH.inc(outcome='success')
+        return tokens
+    except (TokenError, User.DoesNotExist):
+        metrics.TOKEN_REFRESH.inc(outcome='failure')
+        raise AuthenticationFailed('Please authenticate')
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from apps.common import metrics
+from apps.users.authentication import invalidate_principal
+from apps.users.cache import invalidate_user
+from apps.users.models import User
+
+# Covers every ORM save/delete path: UpdateUserSerializer.update, views,
+# services (reset password, verify email) and the Django admin.
+# QuerySet.update() / bulk operations bypass signals and must invalidate explicitly
+# (invalidate_principal() per user, user_cache.bump_version()).
+
+@receiver(post_save, sender=User)
+def invalidate_principal_on_save(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+    invalidate_user(instance.pk)
+
+@receiver(post_delete, sender=User)
+def invalidate_principal_on_delete(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def count_blacklisted_token(sender, instance, created, **kwargs):
+    # Logout and refresh rotation both end up here
+    if created:
+        metrics.TOKEN_BLACKLIST.inc()
@@ -0,0 +1,92 @@
+import json
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import include, path
+from apps.users.cache import user_cache
+from apps.users.models import User
+
+PASSWORD = 'Str0ng-Pass!9'
+
+# The async routes (ASYNC_VIEWS=True) without reloading config.urls
+urlpatterns = [path('v1/', include('apps.users.async_urls'))]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin@example.com', PASSWORD, name='Admin', role='admin')
+        cls.user = User.objects.create_user('user@example.com', PASSWORD, name='User')
+
+    def setUp(self):
+        cache.clear()
+        user_cache.local.clear()
+
+    async def post(self, url, data, **headers):
+        return await self.async_client.post(url, json.dumps(data), content_type='application/json', headers=headers)
+
+    async def login(self, email):
+        response = await self.post('/v1/auth/login', {'email': email, 'password': PASSWORD})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['tokens']
+
+    async def bearer(self, email):
+        return {'Authorization': f"Bearer {(await self.login(email))['access']['token']}"}
+
+    async def test_register_then_login(self):
+        response = await self.post('/v1/auth/register', {'name': 'New', 'email': 'new@example.com', 'password': PASSWORD})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['user']['email'], 'new@example.com')
+        self.assertIn('refresh', response.json()['tokens'])
+        await self.login('new@example.com')
+
+    async def test_wrong_password(self):
+        response = await self.post('/v1/auth/login', {'email': 'user@example.com', 'password': 'wrong-Pass!1'})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {'code': 401, 'message': 'Incorrect email or password'})
+
+    async def test_refresh_rotates(self):
+        refresh = (await self.login('user@example.com'))['refresh']['token']
+        response = await self.post('/v1/auth/refresh-tokens', {'refresh_token': refresh})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.json())
+        self.assertEqual((await self.post('/v1/auth/refresh-tokens', {'refresh_token': refresh})).status_code, 401)
+
+    async def test_authentication_and_permissions(self):
+        self.assertEqual((await self.async_client.get('/v1/users')).status_code, 401)
+        headers = await self.bearer('user@example.com')
+        self.assertEqual((await self.async_client.get('/v1/users', headers=headers)).status_code, 403)
+        response = await self.async_client.get(f'/v1/users/{self.admin.pk}', headers=headers)
+        self.assertEqual(response.status_code, 403)
+
+    async def test_get_user_and_conditional_get(self):
+        headers = await self.bearer('user@example.com')
+        response = await self.async_client.get(f'/v1/users/{self.user.pk}', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['email'], 'user@example.com')
+
+        headers['If-None-Match'] = response['ETag']
+        response = await self.async_client.get(f'/v1/users/{self.user.pk}', headers=headers)
+        self.assertEqual(response.status_code, 304)
+
+    async def test_list_and_lookup(self):
+        headers = await self.bearer('admin@example.com')
+        response = await self.async_client.get('/v1/users?sortBy=email:asc', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['email'] for row in response.json()['results']], ['admin@example.com', 'user@example.com'])
+
+        missing = '00000000-0000-0000-0000-000000000000'
+        response = await self.post('/v1/users/lookup', {'ids': [str(self.user.pk), missing]}, **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.user.pk.hex])
+        self.assertEqual(response.json()['notFound'], [missing.replace('-', '')])
+
+    async def test_export_streams(self):
+        headers = await self.bearer('admin@example.com')
+        response = await self.async_client.get('/v1/users/export?format=ndjson&fields=email&sortBy=email:asc', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(
+            [json.loads(line) for line in body.splitlines()],
+            [{'email': 'admin@example.com'}, {'email': 'user@example.com'}],
+        )
@@ -0,0 +1,179 @@
+import threading
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed, NotFound, ValidationError
+from apps.common import hashing
+from apps.users import authentication, services, tokens
+from apps.users.cache import get_user
+from apps.users.models import Token, User
+
+PASSWORD = 'Str0ng-Pass!9'
+
+
+class SignedTokenTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('signed@example.com', PASSWORD, name='Signed')
+
+    def test_valid_token(self):
+        token = tokens.make_token(self.user, Token.TYPE_RESET_PASSWORD, 10)
+        self.assertTrue(tokens.is_signed_token(token))
+        self.assertEqual(tokens.check_token(token, Token.TYPE_RESET_PASSWORD), self.user)
+
+    def test_expired_token(self):
+        token = tokens.make_token(self.user, Token.TYPE_RESET_PASSWORD, 10)
+        with mock.patch('apps.users.tokens.time.time', return_value=time.time() + 11 * 60):
+            with self.assertRaisesMessage(ValidationError, 'Token expired'):
+                tokens.check_token(token, Token.TYPE_RESET_PASSWORD)
+
+    def test_wrong_type_or_tampered(self):
+        token = tokens.make_token(self.user, Token.TYPE_RESET_PASSWORD, 10)
+        for token_str, token_type in (
+            (token, Token.TYPE_VERIFY_EMAIL),
+            (token[:-1] + ('A' if token[-1] != 'A' else 'B'), Token.TYPE_RESET_PASSWORD),
+            ('not:a-token', Token.TYPE_RESET_PASSWORD),
+        ):
+            with self.subTest(token=token_str, token_type=token_type):
+                with self.assertRaises(NotFound):
+                    tokens.check_token(token_str, token_type)
+
+    def test_reset_token_is_single_use(self):
+        token = tokens.make_token(self.user, Token.TYPE_RESET_PASSWORD, 10)
+        services.reset_password(token, 'An0ther-Pass!7')
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('An0ther-Pass!7'))
+        # The password hash changed, so the fingerprint no longer matches
+        with self.assertRaises(NotFound):
+            tokens.check_token(token, Token.TYPE_RESET_PASSWORD)
+        with self.assertRaises(AuthenticationFailed):
+            services.reset_password(token, 'Th1rd-Pass!5')
+
+    def test_verify_token_is_single_use(self):
+        token = tokens.make_token(self.user, Token.TYPE_VERIFY_EMAIL, 10)
+        services.verify_email(token)
+        self.assertTrue(User.objects.get(pk=self.user.pk).is_email_verified)
+        with self.assertRaises(NotFound):
+            tokens.check_token(token, Token.TYPE_VERIFY_EMAIL)
+
+    def test_deleted_user(self):
+        user = User.objects.create_user('gone@example.com', PASSWORD, name='Gone')
+        token = tokens.make_token(user, Token.TYPE_VERIFY_EMAIL, 10)
+        user.delete()
+        with self.assertRaises(NotFound):
+            tokens.check_token(token, Token.TYPE_VERIFY_EMAIL)
+
+
+class PrincipalCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('principal@example.com', PASSWORD, name='Principal')
+
+    def test_hit_skips_the_db(self):
+        authentication.get_principal(self.user.pk)
+        with self.assertNumQueries(0):
+            principal = authentication.get_principal(self.user.pk)
+        self.assertEqual((principal.pk, principal.role), (self.user.pk, 'user'))
+
+    def test_save_invalidates_on_commit(self):
+        authentication.get_principal(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = 'admin'
+            self.user.save()
+            # Not before the write is committed
+            self.assertEqual(authentication.get_principal(self.user.pk).role, 'user')
+        self.assertEqual(authentication.get_principal(self.user.pk).role, 'admin')
+
+    def test_late_write_back_is_ignored(self):
+        # A reader that loaded the row before the write stores it afterwards
+        authentication.get_principal(self.user.pk)
+        key = authentication.principal_cache_key(self.user.pk)
+        stale = cache.get(key)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            authentication.invalidate_principals([self.user.pk])
+        cache.set(key, stale)
+        self.assertFalse(authentication.get_principal(self.user.pk).is_active)
+
+    def test_deleted_user(self):
+        user_id = self.user.pk
+        authentication.get_principal(user_id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertIsNone(authentication.get_principal(user_id))
+
+
+class CredentialsTests(TestCase):
+    """Login and refresh read the user from the DB, never from the user cache."""
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('login@example.com', PASSWORD, name='Login')
+
+    def test_password_change_applies_at_once(self):
+        services.login_user_with_email_and_password('login@example.com', PASSWORD)
+        # As from another process: no signal, no cache invalidation here
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('N3w-Pass!77')
+        User.objects.filter(pk=user.pk).update(password=user.password)
+
+        with self.assertRaises(AuthenticationFailed):
+            services.login_user_with_email_and_password('login@example.com', PASSWORD)
+        self.assertEqual(services.login_user_with_email_and_password('login@example.com', 'N3w-Pass!77'), self.user)
+
+    def test_refresh_of_deleted_user(self):
+        tokens = services.generate_auth_tokens(self.user)
+        User.objects.filter(pk=self.user.pk).delete()
+        with self.assertRaisesMessage(AuthenticationFailed, 'Please authenticate'):
+            services.refresh_auth(tokens['refresh']['token'])
+
+    def test_refresh_rotates(self):
+        tokens = services.generate_auth_tokens(self.user)
+        self.assertIn('access', services.refresh_auth(tokens['refresh']['token']))
+        with self.assertRaises(AuthenticationFailed):
+            services.refresh_auth(tokens['refresh']['token'])
+
+    def test_cached_row_has_no_password(self):
+        self.assertIn('password', get_user(self.user.pk).get_deferred_fields())
+        self.assertNotIn('password', get_user(self.user.pk).__dict__)
+
+
+@override_settings(
+    PASSWORD_HASHING_POOL='thread', PASSWORD_HASHING_WORKERS=1,
+    PASSWORD_HASHING_QUEUE_SIZE=0, PASSWORD_HASHING_RETRY_AFTER=7,
+)
+class HashingBusyTests(TestCase):
+    def setUp(self):
+        User.objects.create_user('busy@example.com', PASSWORD, name='Busy')
+        # A pool of its own, sized by the settings above
+        self.pool = hashing.HashingPool()
+        patcher = mock.patch.object(hashing, 'pool', self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login(self):
+        return self.client.post(
+            '/v1/auth/login', {'email': 'busy@example.com', 'password': PASSWORD}, content_type='application/json',
+        )
+
+    def test_full_pool_is_503_with_retry_after(self):
+        # Another request holds the only slot (one worker, no queue)
+        started, release = threading.Event(), threading.Event()
+
+        def hold_slot():
+            started.set()
+            release.wait(5)
+
+        holder = threading.Thread(target=self.pool.run, args=(hold_slot,))
+        holder.start()
+        try:
+            self.assertTrue(started.wait(5))
+            response = self.login()
+        finally:
+            release.set()
+            holder.join()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '7')
+        self.assertEqual(response.json()['code'], 503)
+        # The slot is free again
+        self.assertEqual(self.login().status_code, 200)
@@ -0,0 +1,65 @@
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend as LocmemBackend
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from apps.users import outbox
+from apps.users.models import EmailOutbox
+
+
+class RecordingBackend(LocmemBackend):
+    """locmem backend that fails for bad@ addresses and records the transaction depth of each send."""
+    depths = []
+
+    def send_messages(self, messages):
+        RecordingBackend.depths.append(len(connection.savepoint_ids))
+        if messages[0].to[0].startswith('bad@'):
+            raise ConnectionError('smtp down')
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='apps.users.tests.test_outbox.RecordingBackend', EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+)
+class DeliverBatchTests(TestCase):
+    def setUp(self):
+        RecordingBackend.depths = []
+        self.good = outbox.enqueue_email('good@example.com', 'Subject', 'Body')
+        self.bad = outbox.enqueue_email('bad@example.com', 'Subject', 'Body')
+
+    def refresh(self):
+        self.good.refresh_from_db()
+        self.bad.refresh_from_db()
+
+    def test_results_recorded_per_message(self):
+        self.assertEqual(outbox.deliver_batch(10), (1, 1))
+        self.refresh()
+        self.assertEqual((self.good.status, self.good.attempts), (EmailOutbox.STATUS_SENT, 1))
+        self.assertEqual((self.bad.status, self.bad.attempts), (EmailOutbox.STATUS_PENDING, 1))
+        self.assertEqual(self.bad.last_error, 'smtp down')
+        self.assertGreater(self.bad.next_attempt_at, timezone.now())
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_sends_outside_the_claim_transaction(self):
+        # TestCase runs inside a transaction: an atomic block around the
+        # sends would show up as one more savepoint
+        depth = len(connection.savepoint_ids)
+        outbox.deliver_batch(10)
+        self.assertEqual(RecordingBackend.depths, [depth, depth])
+
+    def test_gives_up_after_max_attempts(self):
+        outbox.deliver_batch(10)
+        EmailOutbox.objects.filter(pk=self.bad.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(outbox.deliver_batch(10), (0, 1))
+        self.refresh()
+        self.assertEqual((self.bad.status, self.bad.attempts), (EmailOutbox.STATUS_FAILED, 2))
+
+    def test_claimed_messages_are_leased(self):
+        claimed = outbox._claim(10, timezone.now())
+        self.assertEqual({message.pk for message in claimed}, {self.good.pk, self.bad.pk})
+        # A second worker finds nothing due until the lease runs out
+        self.assertEqual(outbox.deliver_batch(10), (0, 0))
+        EmailOutbox.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(outbox.deliver_batch(10), (1, 1))
+        self.good.refresh_from_db()
+        self.assertEqual(self.good.attempts, 2)
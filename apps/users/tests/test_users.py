@@ -0,0 +1,298 @@
+import inspect
+import uuid
+from unittest import mock
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from apps.common import hashing
+from apps.users import bulk, export, lookup, serializers, services
+from apps.users import cache as users_cache
+from apps.users.models import User
+
+PASSWORD = 'Str0ng-Pass!9'
+
+
+def item(email, **extra):
+    return {'name': 'Bulk User', 'email': email, 'password': PASSWORD, 'role': 'user', **extra}
+
+
+class BulkCreateUsersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user('taken@example.com', PASSWORD, name='Taken')
+
+    def test_results_in_input_order(self):
+        results = bulk.create_users([
+            item('one@example.com'),
+            item('taken@example.com'),           # already in the table
+            item('two@example.com', role='boss'),  # invalid item
+            item('one@EXAMPLE.com'),             # repeat within the batch (domain is normalized)
+            item('ONE@example.com'),             # the local part is case sensitive: a new email
+        ])
+        self.assertEqual([result['index'] for result in results], [0, 1, 2, 3, 4])
+        self.assertEqual(
+            [result['code'] for result in results],
+            [status.HTTP_201_CREATED, 400, 400, 400, status.HTTP_201_CREATED],
+        )
+        self.assertEqual(results[0]['user']['email'], 'one@example.com')
+        self.assertIn('email', results[1]['message'])
+        self.assertIn('role', results[2]['message'])
+        self.assertIn('email', results[3]['message'])
+        self.assertTrue(User.objects.get(email='one@example.com').check_password(PASSWORD))
+
+    def test_repeat_within_batch(self):
+        results = bulk.create_users([item('dup@example.com'), item('dup@example.com')])
+        self.assertEqual([result['code'] for result in results], [201, 400])
+        self.assertEqual(User.objects.filter(email='dup@example.com').count(), 1)
+
+    def test_conflict_inserted_after_the_check(self):
+        # Someone else inserts the email while the batch is being hashed
+        make_passwords = hashing.make_passwords
+        def race(passwords):
+            User.objects.create_user('race@example.com', PASSWORD, name='Racer')
+            return make_passwords(passwords)
+
+        with mock.patch('apps.users.bulk.hashing.make_passwords', side_effect=race):
+            results = bulk.create_users([item('race@example.com'), item('calm@example.com')])
+        self.assertEqual([result['code'] for result in results], [400, 201])
+        self.assertIn('already exists', results[0]['message'])
+        self.assertEqual(User.objects.get(email='race@example.com').name, 'Racer')
+
+    def test_nothing_accepted(self):
+        results = bulk.create_users([item('taken@example.com')])
+        self.assertEqual(bulk.bulk_response_body(results), (
+            {'results': results, 'succeeded': 0, 'failed': 1}, status.HTTP_207_MULTI_STATUS,
+        ))
+
+    def test_all_created(self):
+        _, status_code = bulk.bulk_response_body(bulk.create_users([item('fresh@example.com')]))
+        self.assertEqual(status_code, status.HTTP_201_CREATED)
+
+    def test_payload_shape(self):
+        for data, message in (
+            ({'email': 'x@example.com'}, 'Expected a list of users.'),
+            ([], 'The list of users is empty.'),
+        ):
+            with self.subTest(data=data):
+                with self.assertRaisesMessage(ValidationError, message):
+                    bulk.create_users(data)
+        with self.settings(USER_BULK_MAX_ITEMS=1):
+            with self.assertRaisesMessage(ValidationError, 'At most 1 users per request.'):
+                bulk.create_users([item('a@example.com'), item('b@example.com')])
+
+
+class UserCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        users_cache.user_cache.local.clear()
+        self.user = User.objects.create_user('cached@example.com', PASSWORD, name='Before')
+
+    def test_hit_skips_the_db(self):
+        users_cache.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(users_cache.get_user(self.user.pk).name, 'Before')
+
+    def test_save_invalidates_on_commit(self):
+        users_cache.get_user(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.name = 'After'
+            self.user.save()
+        self.assertEqual(users_cache.get_user(self.user.pk).name, 'After')
+
+    def test_miss_interleaved_with_an_update(self):
+        # The miss reads the row, an update commits (and invalidates), then
+        # the miss stores the row it read
+        load_row = users_cache._load_row
+
+        def load_then_update(**lookup):
+            row = load_row(**lookup)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.name = 'After'
+                self.user.save()
+            return row
+
+        with mock.patch.object(users_cache, '_load_row', load_then_update):
+            self.assertEqual(users_cache.get_user(self.user.pk).name, 'Before')
+        self.assertEqual(users_cache.get_user(self.user.pk).name, 'After')
+        # Nor from the shared tier, as another process would read it
+        users_cache.user_cache.local.clear()
+        self.assertEqual(users_cache.get_user(self.user.pk).name, 'After')
+
+
+class ExportStreamTests(TestCase):
+    def stream(self, factory):
+        request = Request(factory.get('/v1/users/export'))
+        return export.stream_for(request, User.objects.values('id'), export.ChunkEncoder('ndjson', ['id']))
+
+    def test_wsgi_request_streams_synchronously(self):
+        self.assertTrue(inspect.isgenerator(self.stream(RequestFactory())))
+
+    def test_asgi_request_streams_through_aiterator(self):
+        self.assertTrue(inspect.isasyncgen(self.stream(AsyncRequestFactory())))
+
+
+class SerializeUserValuesTests(TestCase):
+    """serialize_user_values(user_values(...)) renders what UserSerializer does."""
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user('a@example.com', PASSWORD, name='A', role='admin', is_email_verified=True)
+        User.objects.create_user('b@example.com', PASSWORD, name='')
+
+    def assert_same(self, fields=None):
+        # Ordered by created_at: a datetime column the rows carry but the output must not
+        queryset = User.objects.order_by('created_at', 'id')
+        expected = serializers.UserSerializer(queryset, many=True, fields=fields).data
+        actual = serializers.serialize_user_values(serializers.user_values(queryset, fields), fields)
+        self.assertEqual(actual, [dict(row) for row in expected])
+        for row in actual:
+            # Same key order (it is the JSON key order) and a hex id, as UUIDField(format='hex')
+            self.assertEqual(list(row), list(fields or serializers.UserSerializer.Meta.fields))
+            if 'id' in row:
+                self.assertIsInstance(row['id'], str)
+
+    def test_all_fields(self):
+        self.assert_same()
+
+    def test_sparse_fields(self):
+        for fields in (['id'], ['email', 'is_email_verified'], ['id', 'name', 'role']):
+            with self.subTest(fields=fields):
+                self.assert_same(fields)
+
+    def test_null_values(self):
+        user = User(email='null@example.com', name=None, role='user')
+        row = {name: getattr(user, name) for name in ('id', 'email', 'name', 'role', 'is_email_verified', 'updated_at')}
+        self.assertEqual(serializers.serialize_user_values([row]), [serializers.UserSerializer(user).data])
+        self.assertEqual(
+            serializers.serialize_user_values([row], ['name']), [serializers.UserSerializer(user, fields=['name']).data],
+        )
+
+
+class BulkWriteInvalidationTests(TestCase):
+    """PATCH / DELETE /users/bulk bypass model signals; cached reads must still see the writes."""
+    def setUp(self):
+        cache.clear()
+        users_cache.user_cache.local.clear()
+        self.admin = User.objects.create_user('admin@example.com', PASSWORD, name='Admin', role='admin')
+        self.user = User.objects.create_user('target@example.com', PASSWORD, name='Target')
+        token = services.generate_auth_tokens(self.admin)['access']['token']
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def get(self, url, **headers):
+        return self.client.get(url, headers={**self.headers, **headers})
+
+    def bulk(self, method, body):
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)(
+                '/v1/users/bulk', body, content_type='application/json', headers=self.headers,
+            )
+
+    def test_patch_invalidates_user_and_list(self):
+        detail = self.get(f'/v1/users/{self.user.pk}')
+        self.assertFalse(detail.json()['is_email_verified'])
+        listing = self.get('/v1/users')
+
+        for selection, value in (({'ids': [str(self.user.pk)]}, True), ({'filter': {'search': 'target@'}}, False)):
+            with self.subTest(selection=selection):
+                response = self.bulk('patch', {**selection, 'data': {'is_email_verified': value}})
+                self.assertEqual(response.json(), {'updated': 1})
+
+                detail = self.get(f'/v1/users/{self.user.pk}', if_none_match=detail['ETag'])
+                self.assertEqual(detail.status_code, 200)
+                self.assertEqual(detail.json()['is_email_verified'], value)
+
+                listing = self.get('/v1/users', if_none_match=listing['ETag'])
+                self.assertEqual(listing.status_code, 200)
+                row = next(row for row in listing.json()['results'] if row['id'] == self.user.pk.hex)
+                self.assertEqual(row['is_email_verified'], value)
+
+    def test_delete_invalidates_user_and_list(self):
+        self.assertEqual(self.get(f'/v1/users/{self.user.pk}').status_code, 200)
+        listing = self.get('/v1/users')
+        self.assertEqual(listing.json()['totalResults'], 2)
+
+        self.assertEqual(self.bulk('delete', {'ids': [str(self.user.pk)]}).json(), {'deleted': 1})
+
+        self.assertEqual(self.get(f'/v1/users/{self.user.pk}').status_code, 404)
+        listing = self.get('/v1/users', if_none_match=listing['ETag'])
+        self.assertEqual(listing.status_code, 200)
+        self.assertEqual([row['id'] for row in listing.json()['results']], [self.admin.pk.hex])
+        self.assertEqual(listing.json()['totalResults'], 1)
+
+
+class UserLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin@example.com', PASSWORD, name='Admin', role='admin')
+        cls.first = User.objects.create_user('first@example.com', PASSWORD, name='First')
+        cls.second = User.objects.create_user('second@example.com', PASSWORD, name='Second')
+
+    def ids(self, result):
+        return [row['id'] for row in result['results']]
+
+    def test_input_order(self):
+        missing = [uuid.uuid4(), uuid.uuid4()]
+        ids = [missing[0], self.second.pk, missing[1], self.first.pk, self.admin.pk]
+        result = lookup.lookup_users(self.admin, [str(pk) for pk in ids])
+        self.assertEqual(self.ids(result), [self.second.pk.hex, self.first.pk.hex, self.admin.pk.hex])
+        self.assertEqual(result['notFound'], [pk.hex for pk in missing])
+        self.assertEqual(result['forbidden'], [])
+
+    def test_forbidden_in_input_order_and_not_queried(self):
+        missing = uuid.uuid4()
+        ids = [self.second.pk, missing, self.first.pk, self.admin.pk]
+        with self.assertNumQueries(1):
+            result = lookup.lookup_users(self.first, [str(pk) for pk in ids])
+        self.assertEqual(self.ids(result), [self.first.pk.hex])
+        # A non-admin can't tell a missing id from someone else's
+        self.assertEqual(result['forbidden'], [self.second.pk.hex, missing.hex, self.admin.pk.hex])
+        self.assertEqual(result['notFound'], [])
+
+        with self.assertNumQueries(0):
+            # Nothing left to query (an empty IN is never sent)
+            result = lookup.lookup_users(self.first, [str(self.second.pk)])
+        self.assertEqual(result, {'results': [], 'notFound': [], 'forbidden': [self.second.pk.hex]})
+
+    def test_duplicates_once_at_first_position(self):
+        pk = self.first.pk
+        ids = [str(pk), str(self.second.pk), pk.hex, str(pk).upper(), f'{{{pk}}}', 'nope', 'nope']
+        result = lookup.lookup_users(self.admin, ids)
+        self.assertEqual(self.ids(result), [pk.hex, self.second.pk.hex])
+        self.assertEqual(result['notFound'], ['nope'])
+
+    def test_malformed_ids_are_not_found(self):
+        ids = ['not-a-uuid', str(self.first.pk), '', '1234', str(self.first.pk)[:-1]]
+        result = lookup.lookup_users(self.admin, ids)
+        self.assertEqual(self.ids(result), [self.first.pk.hex])
+        self.assertEqual(result['notFound'], ['not-a-uuid', '', '1234', str(self.first.pk)[:-1]])
+        # Malformed ids aren't a permission question: notFound for non-admins too
+        result = lookup.lookup_users(self.first, ['not-a-uuid', str(self.first.pk)])
+        self.assertEqual(result['notFound'], ['not-a-uuid'])
+        self.assertEqual(result['forbidden'], [])
+
+    @override_settings(USER_LOOKUP_MAX_IDS=2)
+    def test_id_count_limits(self):
+        for ids in ([], [str(uuid.uuid4()) for _ in range(3)]):
+            with self.subTest(count=len(ids)):
+                with self.assertRaises(ValidationError):
+                    lookup.lookup_users(self.admin, ids)
+        # Duplicates count: the limit is on the request, not the distinct ids
+        with self.assertRaises(ValidationError):
+            lookup.lookup_users(self.admin, [str(self.first.pk)] * 3)
+
+    def test_view(self):
+        token = services.generate_auth_tokens(self.first)['access']['token']
+        headers = {'Authorization': f'Bearer {token}'}
+        body = {'ids': [str(self.second.pk), 'bad', str(self.first.pk), self.first.pk.hex]}
+        response = self.client.post('/v1/users/lookup?fields=email', body, content_type='application/json', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'results': [{'email': 'first@example.com'}],
+            'notFound': ['bad'],
+            'forbidden': [self.second.pk.hex],
+        })
+
+        response = self.client.get(f'/v1/users?ids={self.first.pk},bad,{self.first.pk}', headers=headers)
+        # GET /users is admin only, ids or not
+        self.assertEqual(response.status_code, 403)
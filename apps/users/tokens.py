@@ -0,0 +1,57 @@
+"""
+Stateless Reset Password / Verify Email tokens (AUTH_EMAIL_TOKEN_BACKEND='signed').
+
+A token is a signed payload {user id, type, expiry, fingerprint}; nothing is
+written to or read from the Token table. The fingerprint is an HMAC over the
+user state that using the token changes, which makes the token single-use:
+- resetPassword: the password hash (changes when the password is reset)
+- verifyEmail:   the email and is_email_verified flag (changes when verified)
+"""
+import time
+from django.core import signing
+from django.utils.crypto import constant_time_compare, salted_hmac
+from rest_framework.exceptions import NotFound, ValidationError
+from apps.users.models import User, Token
+
+SALT = 'apps.users.tokens'
+
+def is_signed_token(token_str):
+    # token_urlsafe() (DB tokens) never contains the signer's ':' separator
+    return ':' in token_str
+
+def _fingerprint(user, token_type):
+    if token_type == Token.TYPE_RESET_PASSWORD:
+        state = user.password
+    else:
+        state = f"{user.email}|{user.is_email_verified}"
+    return salted_hmac(SALT, f"{user.pk.hex}|{token_type}|{state}").hexdigest()[:32]
+
+def make_token(user, token_type, expiration_minutes):
+    payload = {
+        'u': user.pk.hex,
+        't': token_type,
+        'e': int(time.time()) + expiration_minutes * 60,
+        'f': _fingerprint(user, token_type),
+    }
+    return signing.dumps(payload, salt=SALT)
+
+def check_token(token_str, token_type):
+    """
+    Validate a signed token and return its user.
+    Mirrors verify_token(): NotFound for unknown/used tokens, ValidationError when expired.
+    """
+    try:
+        payload = signing.loads(token_str, salt=SALT)
+    except signing.BadSignature:
+        raise NotFound('Token not found')
+
+    if payload.get('t') != token_type:
+        raise NotFound('Token not found')
+    if payload.get('e', 0) < time.time():
+        raise ValidationError('Token expired')
+
+    user = User.objects.filter(pk=payload.get('u')).first()
+    if user is None or not constant_time_compare(payload.get('f', ''), _fingerprint(user, token_type)):
+        # Already used (state changed) or user deleted
+        raise NotFound('Token not found')
+    return user
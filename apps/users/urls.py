@@ -18,5 +18,8 @@ urlpatterns = [
     # User Routes
     # ==========================================
     path('users', views.UserListCreateView.as_view(), name='user-list-create'),
+    path('users/export', views.UserExportView.as_view(), name='user-export'),
+    path('users/bulk', views.UserBulkView.as_view(), name='user-bulk'),
+    path('users/lookup', views.UserLookupView.as_view(), name='user-lookup'),
     path('users/<str:userId>', views.UserDetailView.as_view(), name='user-detail'),
 ]
\ No newline at end of file
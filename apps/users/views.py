@@ -1,16 +1,28 @@
-import uuid
-from django.db.models import Q
+from django.db import transaction
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
-from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework.settings import api_settings
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 
-from apps.users import serializers, services
+from apps.users import bulk, export, lookup, serializers, services
+from apps.users.cache import get_user
 from apps.users.models import User, Token
 from apps.users.permissions import IsAdmin, IsUserOrAdmin
+from apps.users.search import search_users
+from apps.common import conditional
 from apps.common.utils import pick
 
+FIELDS_PARAMETER = OpenApiParameter(
+    'fields', str, description=f"Comma-separated subset of: {', '.join(serializers.UserSerializer.Meta.fields)}"
+)
+IDS_PARAMETER = OpenApiParameter(
+    'ids', str, description='Comma-separated user ids: returns just these users, in this order (no paging)'
+)
+
 # ==============================================================================
 # AUTH CONTROLLERS
 # ==============================================================================
@@ -69,8 +81,10 @@ class ForgotPasswordView(APIView):
         # Regular boilerplate throws 404 if user not found inside generateResetPasswordToken
         try:
             user = User.objects.get(email=email)
-            token = services.generate_opaque_token(user, Token.TYPE_RESET_PASSWORD, services.settings.JWT_RESET_PASSWORD_EXPIRATION_MINUTES)
-            services.send_reset_password_email(email, token)
+            # Token row and outbox row commit (or roll back) together
+            with transaction.atomic():
+                token = services.generate_opaque_token(user, Token.TYPE_RESET_PASSWORD, services.settings.JWT_RESET_PASSWORD_EXPIRATION_MINUTES)
+                services.send_reset_password_email(email, token)
         except User.DoesNotExist:
             # Security: Don't reveal if user exists or not, but Regular throws 404, so we follow Regular
              return Response({'code': 404, 'message': 'No users found with this email'}, status=status.HTTP_404_NOT_FOUND)
@@ -95,8 +109,9 @@ class SendVerificationEmailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        token = services.generate_opaque_token(request.user, Token.TYPE_VERIFY_EMAIL, services.settings.JWT_VERIFY_EMAIL_EXPIRATION_MINUTES)
-        services.send_verification_email(request.user.email, token)
+        with transaction.atomic():
+            token = services.generate_opaque_token(request.user, Token.TYPE_VERIFY_EMAIL, services.settings.JWT_VERIFY_EMAIL_EXPIRATION_MINUTES)
+            services.send_verification_email(request.user.email, token)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 class VerifyEmailView(APIView):
@@ -114,7 +129,61 @@ class VerifyEmailView(APIView):
 # USER CONTROLLERS
 # ==============================================================================
 
-class UserListCreateView(generics.ListCreateAPIView):
+def user_etag(user, fields=None):
+    return conditional.compute_etag(user.pk, user.updated_at.isoformat(), fields)
+
+def user_page_etag(page, meta, fields=None):
+    """
+    Fingerprint of one list page: (id, updated_at) of its rows, the paging
+    metadata (totals, cursors) and ?fields. Any edit bumps updated_at, and
+    inserts/deletes elsewhere change the totals.
+    """
+    rows = (f"{row['id'].hex}:{row['updated_at'].isoformat()}" for row in page)
+    return conditional.compute_etag(fields, sorted(meta.items()), *rows)
+
+
+class UserFilterMixin:
+    """
+    ?role / ?search / ?scope / ?sortBy handling of GET /users, shared by the
+    sync and async (apps/users/async_views.py) list, export and bulk views.
+    """
+    def filter_queryset(self, queryset, params=None):
+        # Extract query parameters (or the `filter` of PATCH/DELETE /users/bulk)
+        params = self.request.query_params if params is None else params
+        search = params.get('search')
+        scope = params.get('scope', 'all')
+        role = params.get('role')
+        sort_by = params.get('sortBy', 'created_at:desc') # Default sort
+
+        # 1. Filter by Role
+        if role:
+            queryset = queryset.filter(role=role)
+
+        # 2. Search Logic (index-backed, see apps/users/search.py)
+        queryset = search_users(queryset, search, scope)
+
+        # 3. Sorting Logic (whitelisted: only index-backed fields)
+        if sort_by:
+            parts = sort_by.split(':')
+            field = parts[0]
+            direction = parts[1] if len(parts) > 1 else 'asc'
+
+            db_field = User.SORTABLE_FIELDS.get(field)
+            if db_field is None:
+                allowed = ', '.join(k for k in User.SORTABLE_FIELDS if '_' not in k)
+                raise ValidationError(f"sortBy: unsupported field '{field}'. Allowed: {allowed}")
+            if direction not in ('asc', 'desc'):
+                raise ValidationError("sortBy: direction must be 'asc' or 'desc'")
+
+            prefix = '-' if direction == 'desc' else ''
+            # 'id' as tiebreaker gives a stable total order (required by ?cursor= paging)
+            queryset = queryset.order_by(f"{prefix}{db_field}", f"{prefix}id")
+            
+        return queryset
+
+
+@extend_schema_view(get=extend_schema(parameters=[FIELDS_PARAMETER, IDS_PARAMETER]))
+class UserListCreateView(UserFilterMixin, generics.ListCreateAPIView):
     """
     Handles GET /users and POST /users
     """
@@ -130,6 +199,29 @@ class UserListCreateView(generics.ListCreateAPIView):
         # GET /users -> Admin only (getUsers)
         return [IsAuthenticated(), IsAdmin()]
 
+    def list(self, request, *args, **kwargs):
+        # Read-only fast path: .values() rows mapped straight to the UserSerializer output
+        fields = serializers.requested_user_fields(request)
+        if 'ids' in request.query_params:
+            # Batch lookup, see apps/users/lookup.py
+            ids = lookup.parse_ids(request.query_params['ids'])
+            return Response(lookup.lookup_users(request.user, ids, fields))
+
+        queryset = serializers.user_values(self.filter_queryset(self.get_queryset()), fields)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(serializers.serialize_user_values(queryset, fields))
+
+        # Conditional GET: the page is fingerprinted before it is serialized
+        response = self.get_paginated_response([])
+        meta = {key: value for key, value in response.data.items() if key != 'results'}
+        etag = user_page_etag(page, meta, fields)
+        unchanged = conditional.not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        response.data['results'] = serializers.serialize_user_values(page, fields)
+        return conditional.set_etag(response, etag)
+
     def create(self, request, *args, **kwargs):
         """
         Overridden to use CreateUserSerializer for input validation
@@ -146,67 +238,90 @@ class UserListCreateView(generics.ListCreateAPIView):
         headers = self.get_success_headers(user_data)
         return Response(user_data, status=status.HTTP_201_CREATED, headers=headers)
 
-    def filter_queryset(self, queryset):
-        # Extract query parameters
-        search = self.request.query_params.get('search')
-        scope = self.request.query_params.get('scope', 'all')
-        role = self.request.query_params.get('role')
-        sort_by = self.request.query_params.get('sortBy', 'created_at:desc') # Default sort
 
-        # 1. Filter by Role
-        if role:
-            queryset = queryset.filter(role=role)
+class UserExportView(UserFilterMixin, APIView):
+    """
+    Handles GET /users/export?format=ndjson|csv (admin only)
+    Same filters, sortBy and fields as GET /users, streamed from a single query.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
 
-        # 2. Search Logic
-        if search:
-            # Helper: Check if search term is a valid UUID
-            is_uuid = False
-            try:
-                uuid.UUID(search)
-                is_uuid = True
-            except ValueError:
-                pass
-
-            if scope == 'all':
-                # Search name, email, and ID if valid
-                q_obj = Q(name__icontains=search) | Q(email__icontains=search)
-                if is_uuid:
-                    q_obj |= Q(id=search)
-                queryset = queryset.filter(q_obj)
-            
-            elif scope == 'name':
-                queryset = queryset.filter(name__icontains=search)
-            
-            elif scope == 'email':
-                queryset = queryset.filter(email__icontains=search)
-            
-            elif scope == 'id':
-                if is_uuid:
-                    queryset = queryset.filter(id=search)
-                else:
-                    # Searching by ID with invalid UUID string -> No results
-                    queryset = queryset.none()
-
-        # 3. Sorting Logic
-        if sort_by:
-            parts = sort_by.split(':')
-            field = parts[0]
-            direction = parts[1] if len(parts) > 1 else 'asc'
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= names the export format, not a DRF renderer; errors stay JSON
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        return renderer, renderer.media_type
 
-            # Mapping for camelCase -> snake_case
-            mapping = {
-                'createdAt': 'created_at',
-                'updatedAt': 'updated_at',
-                'isEmailVerified': 'is_email_verified'
-            }
-            db_field = mapping.get(field, field)
+    @extend_schema(
+        parameters=[OpenApiParameter('format', str, enum=list(export.CONTENT_TYPES)), FIELDS_PARAMETER],
+        responses={(200, media_type.split(';')[0]): OpenApiTypes.STR for media_type in export.CONTENT_TYPES.values()},
+    )
+    def get(self, request):
+        export_format = export.get_export_format(request)
+        fields = serializers.requested_user_fields(request)
+        queryset = serializers.user_values(self.filter_queryset(User.objects.all()), fields)
+        encoder = export.ChunkEncoder(export_format, fields)
+        return export.export_response(export.stream_for(request, queryset, encoder), export_format)
 
-            prefix = '-' if direction == 'desc' else ''
-            queryset = queryset.order_by(f"{prefix}{db_field}")
-            
-        return queryset
+
+class UserLookupView(APIView):
+    """
+    Handles POST /users/lookup
+    Any authenticated user: admins resolve any ids, users only their own
+    (IsUserOrAdmin); see apps/users/lookup.py.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        request=serializers.UserLookupSerializer, parameters=[FIELDS_PARAMETER], responses={200: OpenApiTypes.OBJECT},
+    )
+    def post(self, request):
+        fields = serializers.requested_user_fields(request)
+        serializer = serializers.UserLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(lookup.lookup_users(request.user, serializer.validated_data['ids'], fields))
 
 
+class UserBulkMixin(UserFilterMixin):
+    def get_selected_users(self, selection):
+        """Users picked by a validated BulkSelectionSerializer: ids, or the GET /users filters."""
+        if 'ids' in selection:
+            return User.objects.filter(pk__in=selection['ids'])
+        return self.filter_queryset(User.objects.all(), selection['filter'])
+
+
+class UserBulkView(UserBulkMixin, APIView):
+    """
+    Handles POST, PATCH, DELETE /users/bulk (admin only)
+    POST: a list of CreateUserSerializer payloads; one result per item.
+    PATCH / DELETE: users by ids or filter, updated/deleted in chunks.
+    See apps/users/bulk.py.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    @extend_schema(
+        request=serializers.CreateUserSerializer(many=True),
+        responses={201: OpenApiTypes.OBJECT, 207: OpenApiTypes.OBJECT},
+    )
+    def post(self, request):
+        body, status_code = bulk.bulk_response_body(bulk.create_users(request.data))
+        return Response(body, status=status_code)
+
+    @extend_schema(request=serializers.BulkUpdateUserSerializer, responses={200: OpenApiTypes.OBJECT})
+    def patch(self, request):
+        serializer = serializers.BulkUpdateUserSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = self.get_selected_users(serializer.validated_data)
+        return Response({'updated': bulk.update_users(queryset, serializer.validated_data['data'])})
+
+    @extend_schema(request=serializers.BulkSelectionSerializer, responses={200: OpenApiTypes.OBJECT})
+    def delete(self, request):
+        serializer = serializers.BulkSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = self.get_selected_users(serializer.validated_data)
+        return Response({'deleted': bulk.delete_users(queryset)})
+
+
+@extend_schema_view(get=extend_schema(parameters=[FIELDS_PARAMETER]))
 class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Handles GET, PATCH, DELETE /users/:userId
@@ -229,6 +344,28 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
         
         return [IsAuthenticated(), IsUserOrAdmin()]
 
+    def retrieve(self, request, *args, **kwargs):
+        # Served from the user cache; ?fields= only trims the output
+        fields = serializers.requested_user_fields(request)
+        instance = self.get_cached_object()
+
+        etag = user_etag(instance, fields)
+        unchanged = conditional.not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        return conditional.set_etag(Response(serializers.UserSerializer(instance, fields=fields).data), etag)
+
+    def get_cached_object(self):
+        # get_object() for reads, same 404s; writes keep loading from the DB
+        try:
+            user = get_user(self.kwargs[self.lookup_url_kwarg])
+        except ValueError:
+            raise NotFound()
+        if user is None:
+            raise NotFound('No User matches the given query.')
+        self.check_object_permissions(self.request, user)
+        return user
+
     def update(self, request, *args, **kwargs):
         """
         Overridden to use UpdateUserSerializer for input validation
@@ -249,4 +386,4 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
         if getattr(instance, '_prefetched_objects_cache', None):
             instance._prefetched_objects_cache = {}
 
-        return Response(user_data)
\ No newline at end of file
+        return conditional.set_etag(Response(user_data), user_etag(instance))
\ No newline at end of file
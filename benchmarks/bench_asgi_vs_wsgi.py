@@ -0,0 +1,119 @@
+"""
+WSGI (gunicorn gthread workers) vs ASGI (gunicorn + uvicorn workers, async
+views) under the same load: starts each server on a scratch SQLite database, runs
+api_tests/L1.load_test.py against it and compares throughput / latency.
+
+    python benchmarks/bench_asgi_vs_wsgi.py
+    python benchmarks/bench_asgi_vs_wsgi.py --workers 1 --users 50 --iterations 4
+    python benchmarks/bench_asgi_vs_wsgi.py --email-delay-ms 500
+
+Both servers are started as entrypoint.sh starts them: a WSGI worker
+serves --threads requests at once (WEB_THREADS), an ASGI worker keeps
+every request in flight on its event loop. That matters for requests that
+mostly wait: --email-delay-ms adds the forgot-password step with emails
+sent inline to a fake SMTP server that takes that long. Password hashing is
+CPU bound, so on few cores the hashing endpoints gain little either way.
+The hashing queue is sized to the virtual users, so both modes queue
+hashes instead of answering 503 (PASSWORD_HASHING_QUEUE_SIZE).
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import ROOT_DIR, setup_django, print_table
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--workers', type=int, default=1)
+parser.add_argument('--threads', type=int, default=8, help='WSGI threads per worker (WEB_THREADS)')
+parser.add_argument('--users', type=int, default=20, help='concurrent virtual users')
+parser.add_argument('--iterations', type=int, default=3, help='scenario runs per virtual user')
+parser.add_argument('--port', type=int, default=5099)
+parser.add_argument('--modes', default='wsgi,asgi')
+parser.add_argument('--email-delay-ms', type=int, default=0, help='add forgot-password with a slow inline email send')
+args = parser.parse_args()
+
+DB_PATH = os.path.join(os.path.dirname(__file__), 'bench_server.sqlite3')
+for suffix in ('', '-wal', '-shm'):
+    if os.path.exists(DB_PATH + suffix):
+        os.remove(DB_PATH + suffix)
+# Busy timeout (OPTIONS): the WSGI threads' writes wait for each other instead of failing
+DATABASE_URL = f'sqlite:///{DB_PATH}?timeout=30'
+
+setup_django(DATABASE_URL)
+from django.db import connection
+from apps.users.models import User
+
+# Concurrent writers: WAL lets readers proceed while a write is in progress
+with connection.cursor() as cursor:
+    cursor.execute('PRAGMA journal_mode=WAL')
+User.objects.create_superuser('admin@example.com', 'password123', name='Admin')
+connection.close()
+
+SERVERS = {
+    'wsgi': ['gunicorn', 'config.wsgi:application', '--worker-class', 'gthread', '--threads', str(args.threads)],
+    'asgi': ['gunicorn', 'config.asgi:application', '--worker-class', 'uvicorn_worker.UvicornWorker'],
+}
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f'server did not start on port {port}')
+
+def run_mode(mode):
+    env = {
+        **os.environ,
+        'DATABASE_URL': DATABASE_URL,
+        'DEBUG': 'False',
+        'ASYNC_VIEWS': str(mode == 'asgi'),
+        'EMAIL_USE_OUTBOX': 'True',
+        'REQUEST_TIMING_ENABLED': 'False',
+        'METRICS_ENABLED': 'False',
+        'PASSWORD_HASHING_QUEUE_SIZE': str(args.users),
+    }
+    if args.email_delay_ms:
+        env.update({
+            'EMAIL_USE_OUTBOX': 'False',
+            'EMAIL_BACKEND': 'benchmarks.slow_email_backend.EmailBackend',
+            'BENCH_EMAIL_DELAY_MS': str(args.email_delay_ms),
+        })
+    command = SERVERS[mode] + ['--bind', f'127.0.0.1:{args.port}', '--workers', str(args.workers), '--log-level', 'warning']
+    server = subprocess.Popen(command, cwd=ROOT_DIR, env=env)
+    output_file = f'bench_{mode}.json'
+    try:
+        wait_for_port(args.port)
+        subprocess.run([
+            sys.executable, os.path.join(ROOT_DIR, 'api_tests', 'L1.load_test.py'),
+            '--base-url', f'http://127.0.0.1:{args.port}/v1',
+            '--users', str(args.users), '--iterations', str(args.iterations),
+            '--output-file', output_file,
+            *(['--forgot-password'] if args.email_delay_ms else []),
+        ], check=True)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    path = os.path.join(ROOT_DIR, 'api_tests', output_file)
+    with open(path) as f:
+        summary = json.load(f)
+    os.remove(path)
+    return summary
+
+results = {mode: run_mode(mode) for mode in args.modes.split(',')}
+
+print(f'\n--- WSGI vs ASGI ({args.workers} worker(s), {args.threads} WSGI threads, {args.users} virtual users) ---')
+endpoints = list(next(iter(results.values()))['endpoints']) + ['TOTAL']
+rows = []
+for endpoint in endpoints:
+    for mode, summary in results.items():
+        stats = summary['total'] if endpoint == 'TOTAL' else summary['endpoints'].get(endpoint)
+        if stats:
+            rows.append([endpoint, mode, stats['requests'], stats['throughput_rps'],
+                         stats['p50_ms'], stats['p95_ms'], stats['p99_ms']])
+print_table(['endpoint', 'mode', 'requests', 'rps', 'p50 ms', 'p95 ms', 'p99 ms'], rows)
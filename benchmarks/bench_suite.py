@@ -0,0 +1,242 @@
+"""
+In-process microbenchmarks for the hot paths (services, serializers,
+pagination, exception handler, and full handlers through the test client).
+
+    python benchmarks/bench_suite.py                      # run, compare to baseline.json
+    python benchmarks/bench_suite.py --update-baseline    # record a new baseline
+    python benchmarks/bench_suite.py --threshold 0.10 -k serializer
+    python benchmarks/bench_suite.py --instrumented --baseline baseline_instrumented.json
+
+Request timing and metrics are off unless --instrumented is given; run
+both ways to see what the instrumentation costs.
+
+Exits with status 1 when any benchmark is slower than its baseline by more
+than --threshold (default 25%). Baselines are machine specific: record them
+on the machine (or CI runner) that will compare against them.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import setup_django, print_table
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--baseline', default=os.path.join(os.path.dirname(__file__), 'baseline.json'))
+parser.add_argument('--update-baseline', action='store_true')
+parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown vs baseline (0.25 = 25%%)')
+parser.add_argument('--repeat', type=int, default=7, help='timed rounds per benchmark (median is reported)')
+parser.add_argument('-k', dest='filter', help='only run benchmarks whose name contains this')
+parser.add_argument('--json', dest='json_out', help='also write results to this file')
+parser.add_argument('--instrumented', action='store_true',
+                    help='keep request timing and metrics on (compare against a baseline recorded the same way)')
+args = parser.parse_args()
+
+# Measure the code paths, not the instrumentation: RequestTimingMiddleware and
+# MetricsMiddleware default to on under DEBUG and would time every request
+instrumented = str(args.instrumented)
+os.environ['REQUEST_TIMING_ENABLED'] = instrumented
+os.environ['METRICS_ENABLED'] = instrumented
+
+# In-memory DB: results don't depend on whatever a dev/benchmark DB contains
+setup_django('sqlite://:memory:')
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from apps.common.exceptions import api_exception_handler
+from apps.common.pagination import CustomPageNumberPagination
+from apps.common.renderers import FastJSONParser, FastJSONRenderer
+from apps.users import services
+from apps.users.models import User
+from apps.users.serializers import UserSerializer, serialize_user_values, user_values
+
+# --- REGISTRY ---
+
+BENCHMARKS = []
+
+def benchmark(name, loops):
+    """
+    Register fn(loops) -> seconds. The function times its own inner loop so
+    per-iteration setup (e.g. minting a fresh refresh token) stays untimed.
+    """
+    def decorator(fn):
+        BENCHMARKS.append((name, loops, fn))
+        return fn
+    return decorator
+
+def timed(fn, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return time.perf_counter() - start
+
+# --- FIXTURES ---
+
+PASSWORD = 'Pwd_bench_1234'
+admin = User.objects.create_superuser('bench_admin@example.com', PASSWORD, name='Bench Admin')
+login_user = User.objects.create_user('bench_login@example.com', PASSWORD, name='Bench Login')
+User.objects.bulk_create([
+    User(email=f'bench_{i}@example.com', name=f'Bench User {i}', password=admin.password,
+         role='user', is_email_verified=bool(i % 2))
+    for i in range(500)
+])
+users_100 = list(User.objects.order_by('-created_at')[:100])
+client = APIClient()
+client.force_authenticate(admin)
+factory = APIRequestFactory()
+
+# --- SERVICES ---
+
+@benchmark('services.generate_auth_tokens', loops=200)
+def bench_generate_auth_tokens(loops):
+    return timed(lambda: services.generate_auth_tokens(login_user), loops)
+
+@benchmark('services.refresh_auth', loops=100)
+def bench_refresh_auth(loops):
+    # Each refresh blacklists its token, so mint them up front (untimed)
+    tokens = iter([services.generate_auth_tokens(login_user)['refresh']['token'] for _ in range(loops)])
+    return timed(lambda: services.refresh_auth(next(tokens)), loops)
+
+@benchmark('services.login_user_with_email_and_password', loops=3)
+def bench_login(loops):
+    return timed(lambda: services.login_user_with_email_and_password(login_user.email, PASSWORD), loops)
+
+# --- SERIALIZERS ---
+
+@benchmark('serializer.UserSerializer(100 users)', loops=50)
+def bench_user_serializer(loops):
+    return timed(lambda: UserSerializer(users_100, many=True).data, loops)
+
+# Query + serialization of one 100-user list page: model instances vs .values() rows
+@benchmark('list.UserSerializer(100 users from DB)', loops=50)
+def bench_list_models(loops):
+    return timed(lambda: UserSerializer(User.objects.order_by('-created_at', '-id')[:100], many=True).data, loops)
+
+@benchmark('list.serialize_user_values(100 users from DB)', loops=50)
+def bench_list_values(loops):
+    return timed(lambda: serialize_user_values(user_values(User.objects.order_by('-created_at', '-id'))[:100]), loops)
+
+# --- RENDERERS / PARSERS (a 100-user list page, as returned by GET /v1/users?limit=100) ---
+
+list_page_100 = {'results': UserSerializer(users_100, many=True).data, 'page': 1, 'limit': 100, 'totalPages': 6, 'totalResults': 502}
+list_page_100_json = JSONRenderer().render(list_page_100)
+
+@benchmark('renderer.JSONRenderer(100 users)', loops=200)
+def bench_drf_renderer(loops):
+    return timed(lambda: JSONRenderer().render(list_page_100), loops)
+
+@benchmark('renderer.FastJSONRenderer(100 users)', loops=200)
+def bench_fast_renderer(loops):
+    return timed(lambda: FastJSONRenderer().render(list_page_100), loops)
+
+@benchmark('parser.JSONParser(100 users)', loops=200)
+def bench_drf_parser(loops):
+    return timed(lambda: JSONParser().parse(io.BytesIO(list_page_100_json)), loops)
+
+@benchmark('parser.FastJSONParser(100 users)', loops=200)
+def bench_fast_parser(loops):
+    return timed(lambda: FastJSONParser().parse(io.BytesIO(list_page_100_json)), loops)
+
+# --- EXCEPTION HANDLER ---
+
+@benchmark('exceptions.api_exception_handler', loops=2000)
+def bench_exception_handler(loops):
+    errors = [ValidationError({'email': ['Enter a valid email address.']}), NotFound('Not found')]
+    return timed(lambda: [api_exception_handler(e, {}) for e in errors], loops)
+
+# --- PAGINATION ---
+
+def _paginate(params):
+    request = Request(factory.get('/v1/users', params))
+    paginator = CustomPageNumberPagination()
+    page = paginator.paginate_queryset(User.objects.order_by('-created_at', '-id'), request)
+    return paginator.get_paginated_response([u.pk for u in page])
+
+@benchmark('pagination.CustomPageNumberPagination(page 3, limit 100)', loops=100)
+def bench_pagination(loops):
+    return timed(lambda: _paginate({'page': 3, 'limit': 100}), loops)
+
+@benchmark('pagination.keyset(limit 100)', loops=100)
+def bench_keyset_pagination(loops):
+    return timed(lambda: _paginate({'cursor': '', 'limit': 100}), loops)
+
+# --- HANDLERS (full request through the test client) ---
+
+@benchmark('handler GET /v1/users?limit=100', loops=30)
+def bench_list_handler(loops):
+    return timed(lambda: client.get('/v1/users?limit=100'), loops)
+
+@benchmark('handler GET /v1/users?limit=100 (If-None-Match, 304)', loops=30)
+def bench_list_handler_not_modified(loops):
+    etag = client.get('/v1/users?limit=100')['ETag']
+    return timed(lambda: client.get('/v1/users?limit=100', HTTP_IF_NONE_MATCH=etag), loops)
+
+@benchmark('handler GET /v1/users/<id>', loops=200)
+def bench_detail_handler(loops):
+    url = f'/v1/users/{login_user.pk.hex}'
+    return timed(lambda: client.get(url), loops)
+
+@benchmark('handler POST /v1/auth/refresh-tokens', loops=50)
+def bench_refresh_handler(loops):
+    tokens = iter([services.generate_auth_tokens(login_user)['refresh']['token'] for _ in range(loops)])
+    anonymous = APIClient()
+    return timed(lambda: anonymous.post('/v1/auth/refresh-tokens', {'refresh_token': next(tokens)}, format='json'), loops)
+
+# --- RUNNER ---
+
+def run_benchmark(loops, fn):
+    fn(max(1, loops // 10))  # warmup
+    per_call_us = [fn(loops) / loops * 1e6 for _ in range(args.repeat)]
+    return {
+        'median_us': round(statistics.median(per_call_us), 3),
+        'min_us': round(min(per_call_us), 3),
+        'loops': loops,
+    }
+
+print(f'--- BENCHMARK SUITE ({len(BENCHMARKS)} benchmarks, repeat={args.repeat}) ---')
+results = {}
+for name, loops, fn in BENCHMARKS:
+    if args.filter and args.filter not in name:
+        continue
+    results[name] = run_benchmark(loops, fn)
+    print(f'  {name}: {results[name]["median_us"]:.1f} us')
+
+baseline = {}
+if os.path.exists(args.baseline):
+    with open(args.baseline) as f:
+        baseline = json.load(f).get('results', {})
+
+rows = []
+regressions = []
+for name, result in results.items():
+    base = baseline.get(name)
+    if base:
+        change = result['median_us'] / base['median_us'] - 1
+        status = 'REGRESSED' if change > args.threshold else 'ok'
+        if status == 'REGRESSED':
+            regressions.append(name)
+        rows.append([name, base['median_us'], result['median_us'], f'{change:+.1%}', status])
+    else:
+        rows.append([name, '-', result['median_us'], '-', 'new'])
+
+print()
+print_table(['benchmark', 'baseline us', 'current us', 'change', 'status'], rows)
+
+if args.json_out:
+    with open(args.json_out, 'w') as f:
+        json.dump({'results': results}, f, indent=4)
+
+if args.update_baseline:
+    merged = {**baseline, **results}
+    with open(args.baseline, 'w') as f:
+        json.dump({'python': sys.version.split()[0], 'results': merged}, f, indent=4, sort_keys=True)
+    print(f'\nBaseline written to {args.baseline}')
+elif regressions:
+    print(f'\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {", ".join(regressions)}')
+    sys.exit(1)
@@ -0,0 +1,72 @@
+"""
+Compare the index-backed user search (apps/users/search.py) with the
+previous icontains path at a realistic table size.
+
+    python benchmarks/bench_user_search.py                 # 1M users, scratch SQLite
+    python benchmarks/bench_user_search.py --users 100000
+    BENCH_DATABASE_URL=postgres://... python benchmarks/bench_user_search.py
+
+The first run seeds the table (a few minutes at 1M rows); later runs reuse it.
+"""
+import argparse
+import json
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import setup_django, seed_users, time_call, summarize, print_table
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--users', type=int, default=1_000_000)
+parser.add_argument('--repeat', type=int, default=5)
+parser.add_argument('--limit', type=int, default=10, help='page size, as in GET /v1/users?limit=')
+parser.add_argument('--json', dest='json_out', help='also write results to this file')
+args = parser.parse_args()
+
+setup_django()
+
+from django.db import connection
+from apps.users.models import User
+from apps.users.search import search_users, legacy_search_users
+
+print(f'--- USER SEARCH BENCHMARK ({connection.vendor}, {args.users} users) ---')
+seed_users(args.users)
+
+# (search term, scope): rare and common substrings, each scope
+CASES = [
+    ('tester12345', 'all'),
+    ('ester9999', 'name'),
+    ('bench_777777@', 'email'),
+    ('grace', 'name'),
+    ('carolmail', 'email'),
+    ('zzz-no-match', 'all'),
+]
+
+rows = []
+results = []
+for term, scope in CASES:
+    base = User.objects.order_by('-created_at', '-id')
+
+    def run(fn):
+        qs = fn(base, term, scope)
+        # What the list endpoint runs: one page + the total count
+        list(qs[:args.limit])
+        return qs.count()
+
+    legacy_count = run(legacy_search_users)
+    indexed_count = run(search_users)
+    if legacy_count != indexed_count:
+        print(f'!! result mismatch for {term!r}/{scope}: {legacy_count} vs {indexed_count}')
+
+    legacy = summarize(time_call(lambda: run(legacy_search_users), repeat=args.repeat))
+    indexed = summarize(time_call(lambda: run(search_users), repeat=args.repeat))
+    speedup = legacy['median_ms'] / indexed['median_ms'] if indexed['median_ms'] else float('inf')
+    rows.append([f'{term!r}', scope, indexed_count, legacy['median_ms'], indexed['median_ms'], f'{speedup:.1f}x'])
+    results.append({'term': term, 'scope': scope, 'matches': indexed_count, 'legacy': legacy, 'indexed': indexed})
+
+print()
+print_table(['search', 'scope', 'matches', 'icontains ms', 'indexed ms', 'speedup'], rows)
+
+if args.json_out:
+    with open(args.json_out, 'w') as f:
+        json.dump({'vendor': connection.vendor, 'users': args.users, 'results': results}, f, indent=4)
+    print(f'\nResults saved to {args.json_out}')
@@ -0,0 +1,100 @@
+"""
+Insert throughput of random (uuid4) vs time-ordered (uuid7) primary keys.
+
+Each generator fills its own scratch table (UUID primary key + a payload
+column) in committed batches, so the cost of maintaining the primary-key
+B-tree dominates as the table grows.
+
+    python benchmarks/bench_uuid_insert.py --rows 1000000
+    BENCH_DATABASE_URL=postgres://... python benchmarks/bench_uuid_insert.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from utils import setup_django, print_table
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--rows', type=int, default=500_000)
+parser.add_argument('--batch-size', type=int, default=5000)
+parser.add_argument('--json', dest='json_out', help='also write results to this file')
+args = parser.parse_args()
+
+setup_django()
+
+from django.db import connection, transaction
+from apps.common.utils import uuid7
+
+GENERATORS = {
+    'uuid4': uuid.uuid4,
+    'uuid7': uuid7,
+}
+
+def index_size_bytes(table):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_relation_size(%s)', [f'{table}_pkey'])
+            return cursor.fetchone()[0]
+        if connection.vendor == 'sqlite':
+            # Rowid table + separate unique index for the TEXT primary key
+            cursor.execute(
+                "SELECT SUM(pgsize) FROM dbstat WHERE name = "
+                "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s LIMIT 1)",
+                [table],
+            )
+            return cursor.fetchone()[0]
+    return None
+
+def run(name, generator):
+    table = f'bench_pk_{name}'
+    id_type = 'uuid' if connection.vendor == 'postgresql' else 'char(32)'
+    to_db = (lambda u: u) if connection.vendor == 'postgresql' else (lambda u: u.hex)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {table}')
+        cursor.execute(f'CREATE TABLE {table} (id {id_type} PRIMARY KEY, name varchar(255) NOT NULL)')
+
+    batch_rates = []
+    start = time.perf_counter()
+    for offset in range(0, args.rows, args.batch_size):
+        size = min(args.batch_size, args.rows - offset)
+        params = [(to_db(generator()), f'User {offset + i}') for i in range(size)]
+        batch_start = time.perf_counter()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(f'INSERT INTO {table} (id, name) VALUES (%s, %s)', params)
+        batch_rates.append(size / (time.perf_counter() - batch_start))
+        print(f'\r  {name}: {offset + size}/{args.rows} rows', end='', flush=True)
+    elapsed = time.perf_counter() - start
+    print()
+
+    size = index_size_bytes(table)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {table}')
+
+    tail = batch_rates[-max(1, len(batch_rates) // 10):]
+    return {
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(args.rows / elapsed),
+        'last_10pct_rows_per_second': round(sum(tail) / len(tail)),
+        'pk_index_bytes': size,
+    }
+
+print(f'--- UUID PRIMARY KEY INSERT BENCHMARK ({connection.vendor}, {args.rows} rows) ---')
+results = {name: run(name, generator) for name, generator in GENERATORS.items()}
+
+print()
+print_table(
+    ['generator', 'seconds', 'rows/s', 'rows/s (last 10%)', 'pk index MB'],
+    [
+        [name, r['seconds'], r['rows_per_second'], r['last_10pct_rows_per_second'],
+         f"{r['pk_index_bytes'] / 1e6:.1f}" if r['pk_index_bytes'] else 'n/a']
+        for name, r in results.items()
+    ],
+)
+
+if args.json_out:
+    with open(args.json_out, 'w') as f:
+        json.dump({'vendor': connection.vendor, 'rows': args.rows, 'results': results}, f, indent=4)
+    print(f'\nResults saved to {args.json_out}')
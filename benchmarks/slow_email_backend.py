@@ -0,0 +1,13 @@
+import os
+import time
+from django.core.mail.backends.base import BaseEmailBackend
+
+
+class EmailBackend(BaseEmailBackend):
+    """
+    Discards messages after sleeping BENCH_EMAIL_DELAY_MS per message:
+    stands in for a slow SMTP server in bench_asgi_vs_wsgi.py.
+    """
+    def send_messages(self, email_messages):
+        time.sleep(int(os.environ.get('BENCH_EMAIL_DELAY_MS', '500')) / 1000 * len(email_messages))
+        return len(email_messages)
@@ -0,0 +1,87 @@
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Well-formed pbkdf2 hash (matches no password), so seeding never pays for hashing
+SEED_PASSWORD_HASH = 'pbkdf2_sha256$720000$benchsalt$Qy0mT0n0ycl0Ld7WbX2wF8mJvqzYk3ZG3bD8r6m1v6c='
+
+# --- HELPER: Django bootstrap ---
+
+def setup_django(database_url=None):
+    """
+    Boot Django for a standalone benchmark script.
+    database_url defaults to a scratch SQLite file next to this script so a
+    benchmark never touches the development database.
+    """
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    os.environ['DATABASE_URL'] = database_url or os.environ.get(
+        'BENCH_DATABASE_URL',
+        'sqlite:///' + os.path.join(os.path.dirname(__file__), 'bench.sqlite3'),
+    )
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+# --- HELPER: Data seeding ---
+
+def seed_users(total, batch_size=10000, prefix='bench', progress=True):
+    """
+    Insert `total` users with bulk_create (no per-row hashing / validation).
+    Only tops up to `total` so repeated runs reuse the same data set.
+    """
+    from apps.users.models import User
+
+    existing = User.objects.filter(email__startswith=f'{prefix}_').count()
+    first_names = ['alice', 'bob', 'carol', 'dave', 'erin', 'frank', 'grace', 'heidi', 'ivan', 'judy']
+    start = time.perf_counter()
+    for offset in range(existing, total, batch_size):
+        upper = min(offset + batch_size, total)
+        User.objects.bulk_create([
+            User(
+                email=f'{prefix}_{i}@{first_names[i % 7]}mail.com',
+                name=f'{first_names[i % 10].title()} Tester{i}',
+                password=SEED_PASSWORD_HASH,
+                role='admin' if i % 50 == 0 else 'user',
+                is_email_verified=bool(i % 3),
+            )
+            for i in range(offset, upper)
+        ], batch_size=batch_size)
+        if progress:
+            print(f'\r  seeded {upper}/{total} users', end='', flush=True)
+    if progress and existing < total:
+        print(f' ({time.perf_counter() - start:.1f}s)')
+    return total
+
+# --- HELPER: Timing ---
+
+def time_call(fn, repeat=5, warmup=1):
+    """Run fn() warmup + repeat times; return per-run timings in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def summarize(timings):
+    return {
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print('  '.join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in rows:
+        print('  '.join(str(c).ljust(w) for c, w in zip(row, widths)))
@@ -42,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.common.middleware.MetricsMiddleware', # Keep first: times the whole stack
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware', # CORS
@@ -52,8 +53,25 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # Custom Exception Middleware can be added here if needed, 
     # but DRF handles API exceptions via REST_FRAMEWORK settings.
+    'apps.common.middleware.RequestTimingMiddleware', # Keep last: times the view
 ]
 
+# Per-request timing (SQL, view, serializer, password hashing) as a
+# Server-Timing header and a JSON log line. Sample rate: 0.0 - 1.0
+REQUEST_TIMING_ENABLED = env.bool('REQUEST_TIMING_ENABLED', default=DEBUG)
+REQUEST_TIMING_SAMPLE_RATE = env.float('REQUEST_TIMING_SAMPLE_RATE', default=1.0)
+REQUEST_TIMING_HEADER = env.bool('REQUEST_TIMING_HEADER', default=True)
+REQUEST_TIMING_LOG = env.bool('REQUEST_TIMING_LOG', default=True)
+
+# Prometheus metrics at /metrics. With several worker processes set
+# METRICS_MULTIPROC_DIR to a directory they share (cleared on startup by
+# entrypoint.sh); empty keeps per-process in-memory metrics.
+METRICS_ENABLED = env.bool('METRICS_ENABLED', default=True)
+METRICS_MULTIPROC_DIR = env('METRICS_MULTIPROC_DIR', default='')
+# Bearer token required to scrape /metrics. With DEBUG off the endpoint is
+# only mounted when it is set (metrics are still collected either way).
+METRICS_AUTH_TOKEN = env('METRICS_AUTH_TOKEN', default='')
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -74,6 +92,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Serve /v1 with the async views (apps/users/async_views.py). Meant for the
+# ASGI server mode of entrypoint.sh (SERVER_MODE=asgi), which turns it on.
+ASYNC_VIEWS = env.bool('ASYNC_VIEWS', default=False)
+
 
 # ==============================================================================
 # DATABASE
@@ -84,9 +106,62 @@ DATABASES = {
 }
 
 
+# ==============================================================================
+# CACHE
+# ==============================================================================
+# Shared tier of apps.common.cache.TwoTierCache and Django's default cache
+# (principal cache, pagination counts). locmem is per process, so only fit
+# for a single process (runserver, tests): invalidation on save/delete would
+# reach one worker only. In production use a backend every worker shares,
+# e.g. filecache:///var/tmp/api-cache, dbcache://api_cache
+# (python manage.py createcachetable) or rediscache://host:6379/1.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://')
+}
+# Worker processes per server (gunicorn reads it too). With DEBUG off, more
+# than one and a locmem cache fail the checks (apps/common/checks.py).
+WEB_CONCURRENCY = env.int('WEB_CONCURRENCY', default=1)
+# Request threads per worker process (gunicorn gthread workers, see entrypoint.sh)
+WEB_THREADS = env.int('WEB_THREADS', default=1)
+# In-process tier: entries per cache namespace, and how long they may be served
+# without checking the shared tier (bounds cross-process staleness)
+CACHE_LOCAL_MAX_ENTRIES = env.int('CACHE_LOCAL_MAX_ENTRIES', default=1024)
+CACHE_LOCAL_TTL = env.int('CACHE_LOCAL_TTL', default=5) # seconds
+# User rows for GET /users/<id> (apps/users/cache.py)
+USER_CACHE_TTL = env.int('USER_CACHE_TTL', default=300) # seconds
+
+
+# Primary keys of UUIDModel: 4 = random (default), 7 = time-ordered (better
+# B-tree insert locality; ids sort roughly by creation time)
+UUID_PRIMARY_KEY_VERSION = env.int('UUID_PRIMARY_KEY_VERSION', default=4)
+
+
 # ==============================================================================
 # PASSWORD VALIDATION
 # ==============================================================================
+# Same pbkdf2_sha256 hashes as Django's default, plus hashing time reported to
+# RequestTimingMiddleware. The other defaults stay for verifying old hashes.
+PASSWORD_HASHERS = [
+    'apps.common.hashers.TimedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# PBKDF2 work factor for new hashes, 0 = Django's default. Pick it with
+# `python manage.py calibrate_hasher --target-ms 50` on production hardware.
+PASSWORD_HASHER_ITERATIONS = env.int('PASSWORD_HASHER_ITERATIONS', default=0)
+
+# Bounded password hashing pool (apps/common/hashing.py), one per worker process.
+# When WORKERS + QUEUE_SIZE hashes are already in flight in a process, requests
+# get 503 + Retry-After instead of queueing. That needs more concurrent requests
+# per process than WORKERS + QUEUE_SIZE: keep the sum below WEB_THREADS.
+PASSWORD_HASHING_POOL = env('PASSWORD_HASHING_POOL', default='thread') # thread | process | inline
+PASSWORD_HASHING_WORKERS = env.int('PASSWORD_HASHING_WORKERS', default=0) # 0 = CPU count / WEB_CONCURRENCY
+PASSWORD_HASHING_QUEUE_SIZE = env.int('PASSWORD_HASHING_QUEUE_SIZE', default=4)
+PASSWORD_HASHING_RETRY_AFTER = env.int('PASSWORD_HASHING_RETRY_AFTER', default=1) # seconds
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -131,7 +206,18 @@ AUTH_USER_MODEL = 'users.User'
 # ==============================================================================
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWT auth with request.user served from the principal cache (no DB hit)
+        'apps.users.authentication.CachedJWTAuthentication',
+    ),
+    # orjson-backed JSON when installed, same output as DRF's JSONRenderer
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.common.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'apps.common.pagination.CustomPageNumberPagination',
@@ -139,6 +225,23 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'apps.common.exceptions.api_exception_handler', # Custom Error Handler
 }
 
+# How list endpoints compute totalResults: exact | cached | estimated
+# (?count=false always skips counting)
+PAGINATION_COUNT_STRATEGY = env('PAGINATION_COUNT_STRATEGY', default='exact')
+PAGINATION_COUNT_CACHE_TTL = env.int('PAGINATION_COUNT_CACHE_TTL', default=60) # seconds
+# Below this many rows, 'estimated' falls back to a real count
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = env.int('PAGINATION_COUNT_ESTIMATE_THRESHOLD', default=100000)
+
+# GET /v1/users/export: rows fetched (and streamed) per round trip
+USER_EXPORT_CHUNK_SIZE = env.int('USER_EXPORT_CHUNK_SIZE', default=2000)
+
+# POST /v1/users/bulk: items accepted per request, rows per INSERT statement
+USER_BULK_MAX_ITEMS = env.int('USER_BULK_MAX_ITEMS', default=1000)
+USER_BULK_BATCH_SIZE = env.int('USER_BULK_BATCH_SIZE', default=500)
+
+# GET /v1/users?ids= and POST /v1/users/lookup: ids resolved per request
+USER_LOOKUP_MAX_IDS = env.int('USER_LOOKUP_MAX_IDS', default=100)
+
 # ==============================================================================
 # JWT CONFIGURATION (Simple JWT)
 # ==============================================================================
@@ -155,9 +258,38 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'sub', # Matches standard JWT 'sub' claim used in Regular
 }
 
+# Seconds a cached principal (id, role, is_active...) may serve requests
+# before being re-read; entries are also invalidated on every save/delete.
+AUTH_PRINCIPAL_CACHE_TTL = env.int('AUTH_PRINCIPAL_CACHE_TTL', default=60)
+
 # Custom constants for other token types (Reset Password, Verify Email)
 JWT_RESET_PASSWORD_EXPIRATION_MINUTES = env.int('JWT_RESET_PASSWORD_EXPIRATION_MINUTES', default=10)
 JWT_VERIFY_EMAIL_EXPIRATION_MINUTES = env.int('JWT_VERIFY_EMAIL_EXPIRATION_MINUTES', default=10)
+# Expired token purge (manage.py purge_expired_tokens, from cron or one
+# `--loop` process; the interval is the --loop default)
+TOKEN_PURGE_BATCH_SIZE = env.int('TOKEN_PURGE_BATCH_SIZE', default=1000)
+TOKEN_PURGE_INTERVAL_SECONDS = env.int('TOKEN_PURGE_INTERVAL_SECONDS', default=3600)
+# 'db': random tokens stored in the Token table | 'signed': stateless HMAC tokens (no table writes)
+AUTH_EMAIL_TOKEN_BACKEND = env('AUTH_EMAIL_TOKEN_BACKEND', default='db')
+
+
+# ==============================================================================
+# LOGGING
+# ==============================================================================
+# Application loggers ('apps.*': email, outbox, purge, request timing) to stdout
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'apps': {
+            'handlers': ['console'],
+            'level': env('LOG_LEVEL', default='INFO'),
+        },
+    },
+}
 
 
 # ==============================================================================
@@ -184,13 +316,22 @@ SPECTACULAR_SETTINGS = {
 # ==============================================================================
 if DEBUG:
     # Console backend for development (prints email to terminal)
-    EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+    EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 else:
-    EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
     
 EMAIL_HOST = env('SMTP_HOST', default='smtp.example.com')
 EMAIL_PORT = env.int('SMTP_PORT', default=587)
 EMAIL_HOST_USER = env('SMTP_USERNAME', default='')
 EMAIL_HOST_PASSWORD = env('SMTP_PASSWORD', default='')
 EMAIL_USE_TLS = True
-DEFAULT_FROM_EMAIL = env('EMAIL_FROM', default='support@yourapp.com')
\ No newline at end of file
+DEFAULT_FROM_EMAIL = env('EMAIL_FROM', default='support@yourapp.com')
+
+# Transactional outbox: requests only queue emails; a worker delivers them
+# (python manage.py process_email_outbox --loop). Sent inline when False.
+EMAIL_USE_OUTBOX = env.bool('EMAIL_USE_OUTBOX', default=not DEBUG)
+EMAIL_OUTBOX_BATCH_SIZE = env.int('EMAIL_OUTBOX_BATCH_SIZE', default=100)
+EMAIL_OUTBOX_MAX_ATTEMPTS = env.int('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5)
+EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS = env.int('EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS', default=30)
+# How long a claimed batch is reserved for its worker before others may retry it
+EMAIL_OUTBOX_LEASE_SECONDS = env.int('EMAIL_OUTBOX_LEASE_SECONDS', default=300)
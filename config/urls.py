@@ -1,14 +1,22 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from apps.common.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     
     # INCLUDE THE USER APP URLS HERE
-    path('v1/', include('apps.users.urls')),
+    # (async views under ASGI with ASYNC_VIEWS=True; same routes and payloads)
+    path('v1/', include('apps.users.async_urls' if settings.ASYNC_VIEWS else 'apps.users.urls')),
 
-    # API Documentation
-    path('v1/docs/schema/', SpectacularAPIView.as_view(), name='schema'),
+    # API Documentation (always generated from the DRF views: same contract)
+    path('v1/docs/schema/', SpectacularAPIView.as_view(urlconf=[path('v1/', include('apps.users.urls'))]), name='schema'),
     path('v1/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-]
\ No newline at end of file
+]
+
+if settings.METRICS_ENABLED and (settings.METRICS_AUTH_TOKEN or settings.DEBUG):
+    # Prometheus scrape target (aggregated across gunicorn workers); never
+    # public in production: without a token it is only served with DEBUG on
+    urlpatterns.append(path('metrics', metrics_view, name='metrics'))
@@ -21,6 +21,25 @@ wait_for_db() {
 
 wait_for_db
 
+# Production runs several worker processes, which must share one cache
+# (migrate runs the checks and refuses a locmem cache with several workers).
+# Each process serves WEB_THREADS requests at once; more than the hashing
+# pool admits (PASSWORD_HASHING_WORKERS + PASSWORD_HASHING_QUEUE_SIZE), so
+# a login burst gets 503 + Retry-After instead of queueing.
+if [ "$DEBUG" != "True" ]; then
+    export WEB_CONCURRENCY=${WEB_CONCURRENCY:-4}
+    export WEB_THREADS=${WEB_THREADS:-8}
+    export CACHE_URL=${CACHE_URL:-filecache:///tmp/api-cache}
+fi
+
+# Email outbox worker: its own container from the same image (see README),
+# so it is supervised and restarted independently of the web server.
+# Migrations and static files are left to the web container.
+if [ "$EMAIL_OUTBOX_WORKER" = "True" ]; then
+    echo "Starting email outbox worker..."
+    exec python manage.py process_email_outbox --loop
+fi
+
 # Run migrations
 echo "Applying database migrations..."
 python manage.py migrate --noinput
@@ -37,6 +56,19 @@ if [ "$DEBUG" = "True" ]; then
     echo "Starting Development Server on port $SERVER_PORT..."
     exec python manage.py runserver 0.0.0.0:$SERVER_PORT
 else
+    # Shared metrics store: every worker writes its own file, /metrics sums them.
+    # Cleared here so counters of a previous run don't leak into this one.
+    export METRICS_MULTIPROC_DIR=${METRICS_MULTIPROC_DIR:-/tmp/api-metrics}
+    rm -rf "$METRICS_MULTIPROC_DIR"
+    mkdir -p "$METRICS_MULTIPROC_DIR"
+
+    if [ "$SERVER_MODE" = "asgi" ]; then
+        # Async views on an event loop: one worker holds many slow requests
+        export ASYNC_VIEWS=${ASYNC_VIEWS:-True}
+        echo "Starting Production Server (Gunicorn + Uvicorn, ASGI) on port $SERVER_PORT..."
+        exec gunicorn config.asgi:application --bind 0.0.0.0:$SERVER_PORT --workers $WEB_CONCURRENCY --worker-class uvicorn_worker.UvicornWorker --log-level info
+    fi
+
     echo "Starting Production Server (Gunicorn) on port $SERVER_PORT..."
-    exec gunicorn config.wsgi:application --bind 0.0.0.0:$SERVER_PORT --workers 4 --log-level info
+    exec gunicorn config.wsgi:application --bind 0.0.0.0:$SERVER_PORT --workers $WEB_CONCURRENCY --worker-class gthread --threads $WEB_THREADS --log-level info
 fi
\ No newline at end of file